@@ -8,8 +8,6 @@ import asyncio
 import time
 import tempfile
 from pathlib import Path
-from datetime import datetime
-from zoneinfo import ZoneInfo
 from typing import List, Dict, Any, Tuple
 
 # ---------------------------
@@ -18,7 +16,15 @@ from typing import List, Dict, Any, Tuple
 from z_token_manager import get_access_token
 from z_holiday_checker import is_business_day
 from z_config import today as config_today
+from z_dates import to_yyyymmdd, to_date, kst_today
 from z_telegram_sender import send_telegram_message
+from z_notice_collector import fetch_targets, walk_feed_pages, load_collectors, entry_key, FeedWatcher
+from z_notice_collector import dispatch_entries as dispatch_to_collectors
+from z_kind import fetch_documents
+from z_kind_search import search_entries, collector_terms
+from z_notice_db import query_day
+from z_notice_store import notice_ymd
+from z_lifecycle import advance_after_run
 
 # ---------------------------
 # 경로/환경
@@ -59,36 +65,6 @@ SECTION_PRIORITY: Dict[str, List[str]] = {
 # ---------------------------
 STRICT_CONFIG_DATE = False  # True면 config 날짜를 무조건 사용
 
-def to_yyyymmdd(val: Any) -> str:
-    if val is None:
-        return ""
-    s = str(val).strip()
-    if not s:
-        return ""
-    digits = re.sub(r"\D", "", s)
-    if len(digits) >= 8:
-        ymd = digits[:8]
-        try:
-            datetime.strptime(ymd, "%Y%m%d")
-            return ymd
-        except Exception:
-            pass
-    for fmt in ("%Y-%m-%d", "%Y/%m/%d", "%Y.%m.%d"):
-        try:
-            return datetime.strptime(s[:10], fmt).strftime("%Y%m%d")
-        except Exception:
-            pass
-    try:
-        dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
-        return dt.strftime("%Y%m%d")
-    except Exception:
-        return ""
-
-def kst_today() -> str:
-    if ZoneInfo:
-        return datetime.now(ZoneInfo("Asia/Seoul")).strftime("%Y%m%d")
-    return datetime.now().strftime("%Y%m%d")
-
 def resolve_base_date(config_today: str) -> str:
     cfg = to_yyyymmdd(config_today)
     now_kst = kst_today()
@@ -101,9 +77,7 @@ def resolve_base_date(config_today: str) -> str:
         print("⚠️ z_config.today 비어있음 → KST 오늘로 대체:", now_kst)
         return now_kst
     try:
-        d_cfg = datetime.strptime(cfg, "%Y%m%d")
-        d_now = datetime.strptime(now_kst, "%Y%m%d")
-        if abs((d_now - d_cfg).days) > 1:
+        if abs((to_date(now_kst) - to_date(cfg)).days) > 1:
             print(f"⚠️ 설정일자({cfg})가 현재(KST {now_kst})와 차이 큼 → 오늘로 대체")
             return now_kst
     except Exception:
@@ -111,15 +85,20 @@ def resolve_base_date(config_today: str) -> str:
         return now_kst
     return cfg
 
+def cli_args() -> List[str]:
+    # '--'로 시작하는 옵션은 제외한 위치 인자
+    return [a for a in sys.argv[1:] if not a.startswith("--")]
+
 def cli_override_date() -> str:
     # 사용법: python a_all_notices.py 20250925
-    if len(sys.argv) >= 2:
-        ymd = to_yyyymmdd(sys.argv[1])
+    args = cli_args()
+    if args:
+        ymd = to_yyyymmdd(args[0])
         if ymd:
             print("🔧 CLI 기준일 오버라이드:", ymd)
             return ymd
         else:
-            print("⚠️ CLI 날짜 형식 인식 실패, 무시:", sys.argv[1])
+            print("⚠️ CLI 날짜 형식 인식 실패, 무시:", args[0])
     return ""
 
 # ---------------------------
@@ -192,6 +171,10 @@ DATE_KEYS = [
 ]
 
 def is_same_day(item: Dict[str, Any], base_yyyymmdd: str) -> bool:
+    # 정규화된 레코드(ymd + schema_version)는 바로 비교, 아래 추정은 레거시 레코드만
+    ymd = notice_ymd(item)
+    if ymd is not None:
+        return ymd == base_yyyymmdd
     for key in DATE_KEYS:
         if key in item:
             ymd = to_yyyymmdd(item.get(key))
@@ -232,8 +215,11 @@ def build_all_notice_message(base_yyyymmdd: str) -> str:
     parts = [f"<b>📢 공시 목록 (키워드별 정렬) - {base_yyyymmdd}</b>", ""]
     any_block = False
     for filename, section_title in SOURCES:
-        data = load_json(BASE_DIR / filename)
-        data = filter_today(data, base_yyyymmdd)
+        # 공시 DB가 있으면 (유형, 날짜) 인덱스 조회, 없으면 JSON 전체 스캔
+        data = query_day(section_title, base_yyyymmdd)
+        if data is None:
+            data = load_json(BASE_DIR / filename)
+            data = filter_today(data, base_yyyymmdd)
         block = build_section_block(section_title, data)
         if block:
             parts.append(block)
@@ -284,6 +270,142 @@ async def run_generators_sequential() -> None:
         if rc != 0:
             print(f"⚠️ 경고: {s} 실패(코드 {rc}) — 계속 진행")
 
+async def run_generators_dispatch() -> List[Any]:
+    """
+    디스패처 모드: RSS를 한 번만 받아서 다섯 수집기에 같은 엔트리를 넘김.
+    (인터프리터 5회 기동 + 동일 피드 5회 다운로드 → 1회)
+    받은 엔트리를 반환 (전송 후 문서 정보 보강용)
+    """
+    watcher = FeedWatcher()
+    try:
+        # 직전 실행에서 처리한 GUID(워터마크)까지 페이지를 넘겨가며 수집
+        entries, pages, complete = await asyncio.to_thread(walk_feed_pages, watcher.seen_keys())
+    except Exception as ex:
+        print(f"⚠️ 경고: RSS 수집 실패: {ex}")
+        return []
+    print(f"📡 RSS 1회 수집: {len(entries)}건 ({pages}페이지)")
+    _, failed = await dispatch_entries(entries)
+    if complete:
+        # 수집기가 실패한 엔트리는 처리 완료로 표시하지 않음 → 다음 실행에서 다시
+        watcher.mark_seen(unfailed(entries, failed))
+    return entries
+
+async def run_search_dispatch(base_date: str) -> List[Any]:
+    """
+    공시 검색 모드(--search): RSS 대신 KIND 상세검색으로 기준일 하루치를
+    수집기 SEARCH_TERMS별 1회씩 조회해 같은 분류/저장 경로로 넘김.
+    """
+    terms = collector_terms(mod for _, mod in load_generators())
+    try:
+        entries = await asyncio.to_thread(search_entries, base_date, terms)
+    except Exception as ex:
+        print(f"⚠️ 경고: 공시 검색 실패: {ex}")
+        return []
+    print(f"🔎 공시 검색 {len(terms)}회: {len(entries)}건")
+    await dispatch_entries(entries)
+    return entries
+
+def load_generators() -> List[Tuple[str, Any]]:
+    return load_collectors(GENERATORS)
+
+async def dispatch_entries(entries: List[Any]) -> Tuple[int, List[Any]]:
+    """받아 둔 엔트리를 다섯 수집기에 넘김 (z_notice_collector.dispatch_entries). 반환: (저장 건수, 실패 엔트리)"""
+    return await dispatch_to_collectors(entries, load_generators())
+
+def unfailed(entries: List[Any], failed: List[Any]) -> List[Any]:
+    """워터마크에 올릴 엔트리 (수집기가 실패한 엔트리 제외)"""
+    keys = {entry_key(e) for e in failed}
+    return [e for e in entries if entry_key(e) not in keys]
+
+async def enrich_title_only(entries: List[Any]) -> int:
+    """
+    TITLE_ONLY 수집기가 제목만으로 저장한 공시에 doc_no/frame_url 보강 (전송 이후 실행).
+    문서는 z_doc_cache에 남으므로 같은 공시를 다시 받지 않음. 보강 건수 반환.
+    """
+    modules = [(s, mod) for s, mod in load_generators() if getattr(mod, "TITLE_ONLY", False)]
+    selected = [(s, mod, fetch_targets(mod.select(entries))) for s, mod in modules]
+    links = [(e.link, e.title) for _, _, targets in selected for e in targets]
+    if not links:
+        return 0
+
+    documents = await fetch_documents(links)
+    total = 0
+    for s, mod, targets in selected:
+        docs = {e.link: documents.get(e.link) for e in targets}
+        try:
+            total += mod.enrich_notices(docs)
+        except Exception as ex:
+            print(f"⚠️ 경고: {s} 보강 실패: {ex}")
+    print(f"🧩 문서 정보 보강: {total}건")
+    return total
+
+# ---------------------------
+# 감시 모드 (데몬): python a_all_notices.py --watch [--interval=5]
+# ---------------------------
+WATCH_INTERVAL = 5.0  # 초
+ENRICH_TITLE_ONLY = "--no-enrich" not in sys.argv  # 제목만 저장한 공시의 문서 정보 보강 여부
+
+def cli_interval() -> float:
+    for a in sys.argv[1:]:
+        if a.startswith("--interval="):
+            try:
+                return max(1.0, float(a.split("=", 1)[1]))
+            except ValueError:
+                print("⚠️ --interval 형식 인식 실패, 기본값 사용:", a)
+    return WATCH_INTERVAL
+
+async def watch(interval: float) -> None:
+    """
+    RSS를 interval초마다 조건부 GET으로 확인.
+    변화 없으면 아무것도 안 하고, 새 GUID가 있을 때만 분류/저장/전송.
+    """
+    watcher = FeedWatcher()
+    background = set()  # 보강 태스크 (참조 유지용)
+    token = None
+    checked_date, open_day = "", False
+    print(f"👀 감시 모드 시작 (간격 {interval:g}s)")
+
+    while True:
+        base_date = resolve_base_date(config_today)
+
+        # 날짜가 바뀔 때만 휴장일 확인
+        if base_date != checked_date:
+            try:
+                token = get_access_token()
+                open_day = is_business_day(token, base_date)
+                checked_date = base_date
+            except Exception as ex:
+                print(f"⚠️ 휴장일 확인 실패: {ex}")
+            if not open_day:
+                print(f"🛑 휴장일({base_date}) — 대기")
+
+        if open_day:
+            try:
+                new_entries = await asyncio.to_thread(watcher.poll)
+            except Exception as ex:
+                print(f"⚠️ RSS 확인 실패: {ex}")
+                new_entries = []
+
+            if new_entries:
+                print(f"🆕 새 엔트리 {len(new_entries)}건 ({watcher.last_pages}페이지)")
+                saved, failed = await dispatch_entries(new_entries)
+                if watcher.last_complete:
+                    watcher.mark_seen(unfailed(new_entries, failed))
+                if saved:
+                    await asyncio.to_thread(advance_after_run)
+                    message = build_all_notice_message(base_date)
+                    try:
+                        await send_telegram_message(message)
+                        print("✅ 텔레그램 전송 완료")
+                    except Exception as ex:
+                        print(f"⚠️ 텔레그램 전송 실패: {ex}")
+                if ENRICH_TITLE_ONLY:
+                    task = asyncio.create_task(enrich_title_only(new_entries))
+                    background.add(task)
+                    task.add_done_callback(background.discard)
+
+        await asyncio.sleep(interval)
+
 # 필요하면 병렬 실행으로 바꿀 수도 있음
 # async def run_generators_parallel():
 #     tasks = [run_generator(s, timeout=90) for s in GENERATORS]
@@ -296,6 +418,10 @@ async def run_generators_sequential() -> None:
 # 메인
 # ---------------------------
 async def main():
+    if "--watch" in sys.argv:
+        await watch(cli_interval())
+        return
+
     # 기준일 계산 (config → 보정 → CLI 오버라이드)
     base_date = resolve_base_date(config_today)
     override = cli_override_date()
@@ -312,8 +438,16 @@ async def main():
 
     start_ts = time.time()
 
-    # 1) 수집기 실행 (순차)
-    await run_generators_sequential()
+    # 1) 수집기 실행 (기본: 단일 프로세스 디스패처 / --search: KIND 공시 검색 / --subprocess: 스크립트별 순차 실행)
+    entries = []
+    if "--subprocess" in sys.argv:
+        await run_generators_sequential()
+    elif "--search" in sys.argv:
+        entries = await run_search_dispatch(base_date)
+    else:
+        entries = await run_generators_dispatch()
+    # 종목별 지정 단계는 수집이 모두 끝난 뒤 한 번만 갱신
+    await asyncio.to_thread(advance_after_run)
 
     # 2) 집계/전송
     message = build_all_notice_message(base_date)
@@ -321,5 +455,12 @@ async def main():
     await send_telegram_message(message)
     print("✅ 텔레그램 전송 완료")
 
+    # 3) 전송 후: 제목만으로 저장한 공시 문서 정보 보강 (--no-enrich면 생략)
+    if entries and ENRICH_TITLE_ONLY:
+        try:
+            await enrich_title_only(entries)
+        except Exception as ex:
+            print(f"⚠️ 문서 정보 보강 실패: {ex}")
+
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
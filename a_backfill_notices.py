@@ -0,0 +1,135 @@
+# a_backfill_notices.py
+# 과거 공시 백필: 기간 안의 KRX 거래일(z_trading_calendar)마다 KIND 공시 검색(z_kind_search)으로 받아
+# 기존 수집기와 같은 분류(투자경고 지정예고는 classify_notice 본문 규칙 포함)로 공시 저장소에 적재.
+# - 날짜 여러 개를 동시에 (--concurrency=N), KIND 호스트 동시 요청은 그만큼 나눠서 제한
+# - 본문 디코딩/추출/분류는 프로세스 풀(코어 수만큼)에서 → 네트워크 단계와 분리
+# - 실패 없이 끝난 날짜만 체크포인트(a_backfill_state.json)에 기록 → 중단 후 다시 실행하면 이어서
+# - 보관기간(10일) 밖의 날짜는 JSON이 아니라 공시 DB(z_notice_db, DB_RETENTION_DAYS)에만 들어감
+#
+# 사용: python a_backfill_notices.py 20250701 20250930 [--concurrency=3] [--reset]
+import sys
+import json
+import time
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import List, Set
+
+from z_kind import PER_HOST_CONCURRENCY, PARSE_WORKERS
+from z_kind_search import COLLECTORS, ingest_day
+from z_notice_collector import load_collectors
+from z_notice_db import DB_RETENTION_DAYS
+from z_lifecycle import advance_after_run
+import z_trading_calendar
+
+BASE_DIR = Path(__file__).resolve().parent
+STATE_FILE = BASE_DIR / "a_backfill_state.json"
+DAY_CONCURRENCY = 3
+
+# ---------------------------
+# 날짜
+# ---------------------------
+def business_days(start: str, end: str) -> List[str]:
+    """
+    start~end(YYYYMMDD) KRX 거래일 목록 (휴장일은 검색하지 않음).
+    달력을 못 쓰면(토큰 없음 등) 평일 목록 — 공휴일은 검색 결과가 비어 그냥 지나감
+    """
+    try:
+        cal = z_trading_calendar.calendar()
+        cal.ensure_range(start, end)
+        return [d for d in weekdays(start, end) if cal.is_business_day(d)]
+    except Exception as ex:
+        print(f"⚠️ 영업일 달력 사용 불가 → 평일 기준: {ex}")
+        return weekdays(start, end)
+
+def weekdays(start: str, end: str) -> List[str]:
+    """start~end(YYYYMMDD) 평일 목록"""
+    d = datetime.strptime(start, "%Y%m%d")
+    last = datetime.strptime(end, "%Y%m%d")
+    days = []
+    while d <= last:
+        if d.weekday() < 5:
+            days.append(d.strftime("%Y%m%d"))
+        d += timedelta(days=1)
+    return days
+
+# ---------------------------
+# 체크포인트
+# ---------------------------
+def load_done(reset: bool = False) -> Set[str]:
+    if reset or not STATE_FILE.exists():
+        return set()
+    try:
+        with STATE_FILE.open("r", encoding="utf-8") as f:
+            return set(json.load(f).get("done", []))
+    except Exception as ex:
+        print(f"⚠️ 체크포인트 로드 실패(처음부터): {ex}")
+        return set()
+
+def save_done(done: Set[str]) -> None:
+    tmp = STATE_FILE.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump({"done": sorted(done)}, f, ensure_ascii=False)
+    os.replace(tmp, STATE_FILE)
+
+# ---------------------------
+# 실행
+# ---------------------------
+async def backfill(start: str, end: str, concurrency: int = DAY_CONCURRENCY, reset: bool = False) -> int:
+    oldest = (datetime.now() - timedelta(days=DB_RETENTION_DAYS)).strftime("%Y%m%d")
+    if start < oldest:
+        print(f"⚠️ 공시 DB 보관기간({DB_RETENTION_DAYS}일) 밖({start} < {oldest})은 적재 직후 정리됨")
+    days = business_days(start, end)
+    done = load_done(reset)
+    todo = [d for d in days if d not in done]
+    print(f"🗂️ 백필 {start}~{end}: 거래일 {len(days)}일 / 완료 {len(days) - len(todo)}일 / 남음 {len(todo)}일")
+    if not todo:
+        return 0
+
+    modules = load_collectors(COLLECTORS)
+    sem = asyncio.Semaphore(max(1, concurrency))
+    per_host = max(1, PER_HOST_CONCURRENCY // max(1, concurrency))
+    total = 0
+
+    async def run_day(ymd: str) -> None:
+        nonlocal total
+        async with sem:
+            try:
+                saved, failed = await ingest_day(ymd, modules, per_host=per_host, cpu_pool=cpu_pool)
+            except Exception as ex:
+                print(f"⚠️ {ymd} 실패(다음 실행 때 재시도): {ex}")
+                return
+        total += saved
+        if failed:
+            # 수집기 예외/문서 요청 실패가 있던 날은 체크포인트에 안 넣음 → 다음 실행 때 그날 다시
+            print(f"⚠️ {ymd} 저장 {saved}건 / 실패 {len(failed)}건(다음 실행 때 재시도)")
+            return
+        done.add(ymd)
+        save_done(done)
+        print(f"✔ {ymd} 저장 {saved}건 ({len(done & set(days))}/{len(days)})")
+
+    # 본문 디코딩/추출/분류는 모든 날짜가 하나의 프로세스 풀을 같이 씀 (네트워크와 분리)
+    with ProcessPoolExecutor(max_workers=PARSE_WORKERS) as cpu_pool:
+        await asyncio.gather(*(run_day(d) for d in todo))
+    if total:
+        advance_after_run()
+    return total
+
+def main() -> None:
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if len(args) < 2:
+        print("사용법: python a_backfill_notices.py 시작YYYYMMDD 끝YYYYMMDD [--concurrency=3] [--reset]")
+        sys.exit(1)
+    concurrency = DAY_CONCURRENCY
+    for a in sys.argv[1:]:
+        if a.startswith("--concurrency="):
+            concurrency = int(a.split("=", 1)[1])
+
+    t0 = time.time()
+    total = asyncio.run(backfill(args[0], args[1], concurrency, reset="--reset" in sys.argv))
+    print(f"✅ 백필 완료: 저장 {total}건 ({time.time() - t0:.1f}s)")
+
+if __name__ == "__main__":
+    main()
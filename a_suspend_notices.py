@@ -1,189 +1,76 @@
-import feedparser
-import requests
-import re
-import json
-import os
-from urllib.parse import urljoin
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
+import z_notice_store as store
+from z_notice_collector import fetch_feed_entries, select_entries, collect_entries
+from z_notice_matcher import first_hit
 
 DATA_FILE = "a_suspend_notices.json"  # 저장 파일 이름
 MAX_DAYS = 10
+NOTICE_TYPE = "거래정지"  # 공시 DB(z_notice_db) 유형
+TITLE_ONLY = True  # 분류가 제목만으로 결정 → 본문/프레임 없이 바로 저장 (문서 정보는 나중에 보강)
 
 # ---------------------------
 # JSON 저장/불러오기
 # ---------------------------
 def load_notices():
-    if os.path.exists(DATA_FILE):
-        try:
-            with open(DATA_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return []
-    return []
+    return store.load_notices(DATA_FILE)
 
-def save_notices(all_data):
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(all_data, f, ensure_ascii=False, indent=2)
+def add_notices(notices) -> int:
+    """이번 실행분을 한 번에 병합해 한 번만 저장"""
+    return store.ingest_notices(DATA_FILE, notices, max_days=MAX_DAYS, notice_type=NOTICE_TYPE)
 
 def add_notice(notice):
-    all_data = load_notices()
+    add_notices([notice])
 
-    cutoff_date = datetime.now() - timedelta(days=MAX_DAYS)  # 오늘 기준 10일 전까지만 보관
+def stored_index():
+    """이미 저장된 공시 (link / (title, date)) — 요청 전 중복 거르기용"""
+    return store.stored_index(DATA_FILE)
 
-    filtered = []
-    seen = set()  # (title, date) 중복 체크
-    for n in all_data:
-        try:
-            n_date = datetime.strptime(n["date"], "%Y-%m-%d")
-            if n_date >= cutoff_date:
-                key = (n["title"], n["date"])
-                if key not in seen:
-                    filtered.append(n)
-                    seen.add(key)
-        except Exception:
-            filtered.append(n)
-
-    key_new = (notice["title"], notice["date"])
-    if key_new not in seen:
-        filtered.append(notice)
-
-    save_notices(filtered)
+def enrich_notices(documents) -> int:
+    """제목만으로 저장한 공시에 나중에 받은 doc_no/frame_url 채우기"""
+    return store.enrich_notices(DATA_FILE, documents, notice_type=NOTICE_TYPE)
 
 # ---------------------------
-# 본문 + 종목명/코드 추출
+# 필터 키워드 / 분류 매핑
 # ---------------------------
-def extract_text_from_rss(rss_url: str) -> dict:
-    headers = {"User-Agent": "Mozilla/5.0"}
-    with requests.Session() as s:
-        # 1) 뷰어 페이지
-        r = s.get(rss_url, headers=headers, timeout=10)
-        r.raise_for_status()
-
-        # 종목명/코드 추출
-        soup0 = BeautifulSoup(r.text, "html.parser")
-        h1 = soup0.find("h1", class_="ttl type-99 fleft")
-        stock_name, stock_code = "", ""
-        if h1:
-            m = re.match(r"(.+)\s+\((\d+)\)", h1.get_text(strip=True))
-            if m:
-                stock_name, stock_code = m.group(1), m.group(2)
-
-        # 2) docNo 추출
-        m = re.search(r"value=['\"](\d{14})\|[YN]['\"]", r.text)
-        if not m:
-            raise ValueError("docNo를 찾지 못했어요.")
-        doc_no = m.group(1)
-
-        # 3) 내부 API
-        api_url = "https://kind.krx.co.kr/common/disclsviewer.do"
-        r2 = s.get(api_url, headers=headers,
-                   params={"method": "searchContents", "docNo": doc_no},
-                   timeout=10)
-        r2.raise_for_status()
-
-        # 4) 프레임소스 경로
-        m2 = re.search(r'(/external/[^"\']+\.htm)', r2.text)
-        if not m2:
-            raise ValueError("docLocPath를 찾지 못했어요.")
-        frame_url = urljoin(api_url, m2.group(1))
-
-        # 5) 프레임소스 HTML
-        r3 = s.get(frame_url, headers=headers, timeout=10)
-        r3.raise_for_status()
-        if not r3.encoding or r3.encoding.lower() in ("iso-8859-1", "us-ascii"):
-            r3.encoding = r3.apparent_encoding or "utf-8"
-
-        soup = BeautifulSoup(r3.text, "html.parser")
-        for tag in soup(["script", "style"]):
-            tag.decompose()
-        text = soup.get_text("\n", strip=True)
-        text = re.sub(r"\n{3,}", "\n\n", text)
-
-        return {
-            "frame_url": frame_url,
-            "text": text,
-            "stock_name": stock_name,
-            "stock_code": stock_code,
-        }
-
-# ---------------------------
-# 시장 구분 + 접두사 제거
-# ---------------------------
-_market_pat = re.compile(r"^\s*\[(유|코)\]")
-
-def parse_market_class(title: str):
-    m = _market_pat.match(title)
-    if not m:
-        return None
-    return "코스피" if m.group(1) == "유" else "코스닥"
-
-def clean_title(title: str) -> str:
-    return re.sub(r"^\s*\[(유|코)\]\s*", "", title).strip()
+KEYWORDS = [
+    "매매거래정지 예고",
+    "매매거래 정지 및 재개(투자경고종목 지정중)",
+    "매매거래 정지 및 재개(투자위험종목 최초지정)",
+    "매매거래 정지 및 재개(투자위험종목 지정중)",
+]
+
+# KIND 공시 검색(z_kind_search) 검색어 — 결과는 KEYWORDS로 다시 거름
+SEARCH_TERMS = ["매매거래"]
+
+# 제목 문구 → 분류 (위에서부터 먼저 걸리는 것)
+TITLE_CATEGORIES = {
+    "매매거래정지 예고": ["정지예고"],
+    "매매거래 정지 및 재개(투자경고종목 지정중)": ["투경정지"],
+    "매매거래 정지 및 재개(투자위험종목 최초지정)": ["투위최초정지"],
+    "매매거래 정지 및 재개(투자위험종목 지정중)": ["투위중정지"],
+}
+
+def categorize(title: str, result: dict) -> list:
+    hit = first_hit(title, TITLE_CATEGORIES)
+    return list(TITLE_CATEGORIES[hit]) if hit else []
+
+def select(entries) -> list:
+    """이 수집기가 다루는 엔트리만 선택"""
+    return select_entries(entries, KEYWORDS)
+
+def process_entries(entries, documents=None) -> int:
+    """이미 받아 둔 RSS 엔트리로 수집 (a_all_notices 디스패처에서 호출)"""
+    return collect_entries(
+        entries,
+        keywords=KEYWORDS,
+        categorize=categorize,
+        add_notices=add_notices,
+        documents=documents,
+        stored_index=stored_index,
+        need_text=not TITLE_ONLY,
+    )
 
 # ---------------------------
 # 메인 실행
 # ---------------------------
 if __name__ == "__main__":
-    RSS_URL = (
-        "http://kind.krx.co.kr:80/disclosure/rsstodaydistribute.do?"
-        "method=searchRssTodayDistribute&repIsuSrtCd=&mktTpCd=0&"
-        "searchCorpName=&currentPageSize=50"
-    )
-    feed = feedparser.parse(RSS_URL)
-
-    # 필터 키워드
-    keywords = [
-        "매매거래정지 예고",
-        "매매거래 정지 및 재개(투자경고종목 지정중)",
-        "매매거래 정지 및 재개(투자위험종목 최초지정)",
-        "매매거래 정지 및 재개(투자위험종목 지정중)",
-    ]
-    filtered = [e for e in feed.entries if any(k in e.title for k in keywords)]
-
-    for e in filtered:
-        market_class = parse_market_class(e.title)
-        if not market_class:
-            print(f"⏭️ 접두사 없음(저장 스킵): {e.title}")
-            continue
-
-        print(f"\n▶ {e.title} ({market_class})")
-
-        try:
-            result = extract_text_from_rss(e.link)
-            stock_name = result["stock_name"]
-            stock_code = result["stock_code"]
-            frame_url = result["frame_url"]
-
-            # 분류
-            if "매매거래정지 예고" in e.title:
-                categories = ["정지예고"]
-            elif "매매거래 정지 및 재개(투자경고종목 지정중)" in e.title:
-                categories = ["투경정지"]
-            elif "매매거래 정지 및 재개(투자위험종목 최초지정)" in e.title:
-                categories = ["투위최초정지"]
-            elif "매매거래 정지 및 재개(투자위험종목 지정중)" in e.title:
-                categories = ["투위중정지"]
-            else:
-                categories = []
-
-            print("프레임소스:", frame_url)
-            print("분류:", ", ".join(categories))
-
-        except Exception as ex:
-            print("본문 추출 실패:", ex)
-            stock_name, stock_code, frame_url, categories = "", "", "", []
-
-        notice_data = {
-            "title": clean_title(e.title),  # 접두사 제거
-            "class": market_class,
-            "stock_name": stock_name,
-            "stock_code": stock_code,
-            "link": e.link,
-            "frame_url": frame_url,
-            "categories": categories,
-            "date": datetime.now().strftime("%Y-%m-%d"),
-        }
-
-        add_notice(notice_data)
-        print("저장 완료 ✅")
+    process_entries(fetch_feed_entries())
@@ -1,63 +1,35 @@
 # b_all_cal.py
-import json
-import sys
-import subprocess
 import inspect
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime
-from zoneinfo import ZoneInfo
 from typing import Any, Dict, List
 
 from z_config import today as config_today
+from z_dates import to_yyyymmdd, today_or
 from z_telegram_sender import send_telegram_message  # 동기/비동기 모두 대응
 
 # ✅ 영업일(=토/일/공휴일 모두 포함) 필터용
-from z_token_manager import get_access_token
 from z_holiday_checker import is_business_day
+from z_run_context import RunContext
+
+# 가격 계산 단계 (각 스크립트 run(ctx, ...) — 한 프로세스에서 토큰/세션/일봉/JSON 공유)
+import b_waring_price_cal
+import b_waring_upadte
+import b_overheating_price_cal
+import b_overheating_update
 
 BASE_DIR = Path(__file__).resolve().parent
 
-# 투자경고 파이프라인
-PRICE_CAL_PY    = BASE_DIR / "b_waring_price_cal.py"
-PRICE_JSON      = BASE_DIR / "b_waring_price_cal.json"
-UPDATE_EXTRAS   = BASE_DIR / "b_waring_upadte.py"   # 파일명 유지
+# 투자경고 파이프라인 결과
+PRICE_JSON      = b_waring_price_cal.OUTPUT_JSON
 
-# 단기과열 파이프라인
-OH_CAL_PY       = BASE_DIR / "b_overheating_price_cal.py"
-OH_JSON         = BASE_DIR / "b_overheating_price_cal.json"
-OH_UPDATE_PY    = BASE_DIR / "b_overheating_update.py"
+# 단기과열 파이프라인 결과
+OH_JSON         = b_overheating_price_cal.OUTPUT_JSON
 
 # ---------------- utils ----------------
-def to_yyyymmdd(val: Any) -> str:
-    if val is None:
-        return ""
-    s = str(val).strip()
-    digits = "".join(ch for ch in s if ch.isdigit())
-    if len(digits) >= 8:
-        ymd = digits[:8]
-        try:
-            datetime.strptime(ymd, "%Y%m%d")
-            return ymd
-        except Exception:
-            pass
-    try:
-        return datetime.fromisoformat(s.replace("Z", "+00:00")).strftime("%Y%m%d")
-    except Exception:
-        return ""
-
 def today_yyyymmdd() -> str:
-    ymd = to_yyyymmdd(config_today)
-    if ymd:
-        return ymd
-    return datetime.now(ZoneInfo("Asia/Seoul")).strftime("%Y%m%d")
-
-def load_json(path: Path) -> List[Dict[str, Any]]:
-    if not path.exists() or path.stat().st_size == 0:
-        return []
-    with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-        return data if isinstance(data, list) else []
+    return today_or(config_today)
 
 def normalize_categories_value(v) -> List[str]:
     if isinstance(v, list):
@@ -86,11 +58,13 @@ def _mul_round(val: Any, mult: float) -> int:
     except Exception:
         return 0
 
-def run_script(pyfile: Path, *args: str) -> None:
-    """지정 파이썬 스크립트를 현재 파이썬으로 실행"""
-    cmd = [sys.executable, str(pyfile)]
-    cmd.extend(args)
-    subprocess.run(cmd, check=False)
+def run_pipeline(name: str, *stages) -> None:
+    """단계들을 순서대로 실행. 한 단계가 실패해도 다음 단계/메시지 전송은 계속 (기존 서브프로세스 check=False와 같음)"""
+    for i, stage in enumerate(stages, start=1):
+        try:
+            stage()
+        except Exception as e:
+            print(f"⚠️ {name} 파이프라인 {i}단계 실패: {e} — 계속 진행")
 
 def send_to_telegram(msg: str) -> None:
     """z_telegram_sender.send_telegram_message 동기/비동기 모두 지원"""
@@ -173,33 +147,29 @@ def main():
     ymd = today_yyyymmdd()
 
     # ✅ 토/일/공휴일 모두 동일하게 휴장일 처리 → 작업/전송 전부 생략
-    token = get_access_token()
-    if not is_business_day(token, ymd):
+    ctx = RunContext()
+    if not is_business_day(ctx.token, ymd):
         print(f"🛑 휴장일({ymd}) — 작업 및 전송 생략")
         return
 
     # 0) (선택) a_waring_notices.json / a_overheating_notices.json 은 사전 갱신되어 있다고 가정
 
-    # 1) 투자경고: 오늘자 업서트 + 과거 보조필드 갱신
-    run_script(PRICE_CAL_PY, ymd)
-    if UPDATE_EXTRAS.exists():
-        run_script(UPDATE_EXTRAS)
-    else:
-        print(f"ℹ️ {UPDATE_EXTRAS.name} 파일이 없어 투자경고 업데이트 단계는 건너뜀.")
-
-    # 2) 단기과열: 오늘자 업서트 + 전 레코드 D-1_price 갱신
-    if OH_CAL_PY.exists():
-        run_script(OH_CAL_PY, ymd)
-    else:
-        print(f"ℹ️ {OH_CAL_PY.name} 파일이 없어 단기과열 가격계산 단계는 건너뜀.")
-    if OH_UPDATE_PY.exists():
-        run_script(OH_UPDATE_PY)
-    else:
-        print(f"ℹ️ {OH_UPDATE_PY.name} 파일이 없어 단기과열 업데이트 단계는 건너뜀.")
-
-    # 3) 결과 JSON 로드
-    warn_data = load_json(PRICE_JSON)
-    oh_data   = load_json(OH_JSON)
+    # 1) 투자경고(오늘자 업서트 → 과거 보조필드 갱신) / 2) 단기과열(오늘자 업서트 → 전 레코드 D-1_price 갱신)
+    #    두 파이프라인은 서로 다른 JSON만 쓰므로 동시에 실행 (KIS 초당 한도는 z_daily_bars 토큰 버킷이 공유)
+    try:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            pool.submit(run_pipeline, "투자경고",
+                        lambda: b_waring_price_cal.run(ctx, ymd),
+                        lambda: b_waring_upadte.run(ctx, ymd))
+            pool.submit(run_pipeline, "단기과열",
+                        lambda: b_overheating_price_cal.run(ctx, ymd),
+                        lambda: b_overheating_update.run(ctx))
+
+        # 3) 결과 JSON (방금 저장한 값은 컨텍스트 메모리에서)
+        warn_data = ctx.load_json(PRICE_JSON)
+        oh_data   = ctx.load_json(OH_JSON)
+    finally:
+        ctx.close()
 
     # 4) 오늘자 필터
     todays_warn = [
@@ -1,16 +1,16 @@
 # b_overheating_price_cal.py
 import json
 import sys
-import requests
 from pathlib import Path
-from datetime import datetime, timedelta, date
-from zoneinfo import ZoneInfo
 from typing import Any, List, Dict, Tuple
 
 from z_config import today as config_today  # KST 권장
-from z_token_manager import get_access_token
-from z_config import APP_KEY, APP_SECRET
-from z_holiday_checker import is_business_day  # 영업일 판별
+from z_dates import to_yyyymmdd, shift_ymd, kst_today, today_or
+from z_daily_bars import get_daily_prices
+import z_trading_calendar  # 영업일 판별 (로컬 달력)
+from z_notice_db import query_day
+from z_notice_store import notice_ymd
+from z_run_context import RunContext
 
 BASE_DIR = Path(__file__).resolve().parent
 INPUT_JSON  = BASE_DIR / "a_overheating_notices.json"       # 입력 공시
@@ -23,28 +23,8 @@ DATE_KEYS = [
     "time","timestamp","created_at","yyyymmdd"
 ]
 
-def to_yyyymmdd(val: Any) -> str:
-    if val is None:
-        return ""
-    s = str(val).strip()
-    digits = "".join(ch for ch in s if ch.isdigit())
-    if len(digits) >= 8:
-        ymd = digits[:8]
-        try:
-            datetime.strptime(ymd, "%Y%m%d")
-            return ymd
-        except Exception:
-            pass
-    try:
-        return datetime.fromisoformat(s.replace("Z","+00:00")).strftime("%Y%m%d")
-    except Exception:
-        return ""
-
 def base_yyyymmdd() -> str:
-    ymd = to_yyyymmdd(config_today)
-    if ymd:
-        return ymd
-    return datetime.now(ZoneInfo("Asia/Seoul")).strftime("%Y%m%d")
+    return today_or(config_today)
 
 def load_json(path: Path) -> List[Dict[str, Any]]:
     if not path.exists() or path.stat().st_size == 0:
@@ -56,11 +36,11 @@ def load_json(path: Path) -> List[Dict[str, Any]]:
     except Exception:
         return []
 
-def save_json(path: Path, rows: List[Dict[str, Any]]) -> None:
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(rows, f, ensure_ascii=False, indent=2)
-
 def is_today_item(item: Dict[str, Any], ymd: str) -> bool:
+    # 정규화된 레코드는 ymd 비교만, DATE_KEYS 추정은 레거시 레코드용
+    stored = notice_ymd(item)
+    if stored is not None:
+        return stored == ymd
     for k in DATE_KEYS:
         if k in item:
             v = to_yyyymmdd(item.get(k))
@@ -83,8 +63,11 @@ def cats_key(v) -> str:
 
 def collect_targets(ymd: str) -> List[Dict[str, Any]]:
     """당일 공시만 모아 중복 종목은 제거(같은 종목이 여러 건 있으면 모두 처리하되, 업서트 키는 categories까지 포함)"""
-    data = load_json(INPUT_JSON)
-    today_items = [e for e in data if is_today_item(e, ymd)]
+    # 공시 DB가 있으면 인덱스 조회, 없으면 JSON 스캔
+    today_items = query_day("단기과열", ymd)
+    if today_items is None:
+        data = load_json(INPUT_JSON)
+        today_items = [e for e in data if is_today_item(e, ymd)]
     out: List[Dict[str, Any]] = []
     for e in today_items:
         code = str(e.get("stock_code") or "").strip()
@@ -100,55 +83,9 @@ def collect_targets(ymd: str) -> List[Dict[str, Any]]:
 # ---------------------------
 # KIS 일별시세 조회
 # ---------------------------
-KIS_BASE = "https://openapi.koreainvestment.com:9443"
-KIS_DAILY_API = "/uapi/domestic-stock/v1/quotations/inquire-daily-price"
-KIS_TR_ID = "FHKST01010400"
-
 def kis_get_daily_prices(token: str, stock_code: str, count: int = 40, base_ymd: str | None = None) -> List[Dict[str, Any]]:
-    if base_ymd:
-        try:
-            d0 = datetime.strptime(base_ymd, "%Y%m%d")
-        except Exception:
-            d0 = datetime.today()
-    else:
-        d0 = datetime.today()
-    start_date = (d0 - timedelta(days=count * 2)).strftime("%Y%m%d")
-    end_date   = datetime.today().strftime("%Y%m%d")
-
-    url = KIS_BASE + KIS_DAILY_API
-    headers = {
-        "Content-Type": "application/json; charset=utf-8",
-        "accept": "application/json",
-        "authorization": f"Bearer {token}",
-        "appkey": APP_KEY,
-        "appsecret": APP_SECRET,
-        "tr_id": KIS_TR_ID,
-        "custtype": "P",
-    }
-    params = {
-        "FID_COND_MRKT_DIV_CODE": "J",
-        "FID_INPUT_ISCD": stock_code,
-        "FID_INPUT_DATE_1": start_date,
-        "FID_INPUT_DATE_2": end_date,
-        "FID_PERIOD_DIV_CODE": "D",
-        "FID_ORG_ADJ_PRC": "0",
-    }
-
-    try:
-        r = requests.get(url, headers=headers, params=params, timeout=10)
-        r.raise_for_status()
-        data = r.json()
-        rows = data.get("output", [])
-        if isinstance(rows, dict):
-            rows = [rows]
-        if not isinstance(rows, list):
-            rows = []
-        rows = [x for x in rows if x.get("stck_bsop_date")]
-        rows.sort(key=lambda x: x["stck_bsop_date"], reverse=True)  # 최신→과거
-        return rows[:count]
-    except Exception as e:
-        print(f"⚠️ KIS 일별시세 조회 실패: {stock_code} / {e}")
-        return []
+    # 일봉 캐시(z_daily_bars) 경유
+    return get_daily_prices(token, stock_code, count=count, base_ymd=base_ymd)
 
 def _to_int(v) -> int:
     try:
@@ -169,32 +106,19 @@ def find_close_for_date(rows: List[Dict[str, Any]], ymd: str) -> Tuple[str, int]
 # ---------------------------
 # 영업일 보관 범위 계산
 # ---------------------------
-def _to_date(ymd: str) -> date:
-    return datetime.strptime(ymd, "%Y%m%d").date()
-
 def nearest_business_day_on_or_before(ymd: str) -> str:
-    d = _to_date(ymd)
-    while not is_business_day(d):
-        d -= timedelta(days=1)
-    return d.strftime("%Y%m%d")
+    return z_trading_calendar.prev_business_day(ymd)
 
 def business_day_cutoff(base_ymd: str, n_days: int = 10) -> Tuple[str, str]:
     anchor_ymd = nearest_business_day_on_or_before(base_ymd)
-    d = _to_date(anchor_ymd)
-    kept = 1
-    while kept < n_days:
-        d -= timedelta(days=1)
-        if is_business_day(d):
-            kept += 1
-    cutoff_ymd = d.strftime("%Y%m%d")
+    cutoff_ymd = z_trading_calendar.business_days_back(anchor_ymd, n_days - 1)
     return cutoff_ymd, anchor_ymd
 
 def retain_last_n_days(rows: List[Dict[str, Any]], base_ymd: str, n_days: int = 10) -> List[Dict[str, Any]]:
     try:
         cutoff, anchor = business_day_cutoff(base_ymd, n_days=n_days)
     except Exception:
-        d0 = datetime.now(ZoneInfo("Asia/Seoul"))
-        cutoff = (d0 - timedelta(days=n_days - 1)).strftime("%Y%m%d")
+        cutoff = shift_ymd(kst_today(), -(n_days - 1))
         anchor = base_ymd
 
     kept = []
@@ -248,13 +172,8 @@ def upsert_results(output_path: Path, base_ymd: str, new_rows: List[Dict[str, An
 # ---------------------------
 # 메인
 # ---------------------------
-def main():
-    ymd = base_yyyymmdd()
-    if len(sys.argv) >= 2:
-        arg = to_yyyymmdd(sys.argv[1])
-        if arg:
-            ymd = arg
-
+def run(ctx: RunContext, ymd: str) -> List[Dict[str, Any]]:
+    """기준일 단기과열 기준가 계산 → 결과 JSON 업서트. 저장한 전체 레코드 반환 (b_all_cal은 컨텍스트 공유로 호출)"""
     print(f"🗓 기준일: {ymd}")
     targets = collect_targets(ymd)
     print(f"📌 단기과열 대상 {len(targets)}개")
@@ -263,9 +182,12 @@ def main():
         cats_text = ", ".join(cats) if isinstance(cats, list) else (cats or "")
         print(f"- {t['stock_name']}({t['stock_code']}) - {cats_text}")
 
-    token = get_access_token()
+    z_trading_calendar.calendar().use_token(ctx.token)  # 토큰 로드/검증 (일봉·영업일 달력 조회가 같이 씀)
     print("🔑 토큰 OK, KIS 일별시세 확인/계산 시작")
 
+    # 대상 종목 시세를 먼저 동시 조회 (초당 요청 한도는 z_daily_bars가 관리)
+    prices = ctx.daily_prices((t["stock_code"] for t in targets), count=40, base_ymd=ymd)
+
     out_rows: List[Dict[str, Any]] = []
 
     for t in targets:
@@ -273,7 +195,7 @@ def main():
         name = t["stock_name"]
         cats = t.get("categories", [])
 
-        rows = kis_get_daily_prices(token, code, count=40, base_ymd=ymd)
+        rows = prices.get(code) or []
         if not rows:
             print(f"  · {name}({code}) — 시세 데이터 없음")
             continue
@@ -309,8 +231,17 @@ def main():
         out_rows.append(record)
 
     merged = upsert_results(OUTPUT_JSON, ymd, out_rows, keep_days=10)
-    save_json(OUTPUT_JSON, merged)
+    ctx.save_json(OUTPUT_JSON, merged)
     print(f"💾 저장: {OUTPUT_JSON} ({len(merged)}건, 오늘 {len(out_rows)}건 업서트)")
+    return merged
+
+def main():
+    ymd = base_yyyymmdd()
+    if len(sys.argv) >= 2:
+        arg = to_yyyymmdd(sys.argv[1])
+        if arg:
+            ymd = arg
+    run(RunContext(), ymd)
 
 if __name__ == "__main__":
     main()
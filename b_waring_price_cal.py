@@ -1,15 +1,16 @@
 # b_waring_price_cal.py
 import json, sys
-import requests
 from pathlib import Path
-from datetime import datetime, timedelta, date
-from zoneinfo import ZoneInfo
 from typing import Any, List, Dict, Tuple
 
 from z_config import today as config_today  # KST 기준이면 더 좋음
-from z_token_manager import get_access_token
-from z_config import APP_KEY, APP_SECRET
-from z_holiday_checker import is_business_day  # ⬅️ 영업일 판별
+from z_dates import to_yyyymmdd, shift_ymd, kst_today, today_or
+from z_daily_bars import get_daily_prices
+import z_trading_calendar  # ⬅️ 영업일 판별 (로컬 달력)
+from z_notice_db import query_day
+from z_notice_store import notice_ymd
+import z_price_engine as price_engine
+from z_run_context import RunContext
 
 BASE_DIR = Path(__file__).resolve().parent
 INPUT_JSON = BASE_DIR / "a_waring_notices.json"           # 입력 공시
@@ -22,28 +23,8 @@ DATE_KEYS = [
     "time","timestamp","created_at","yyyymmdd"
 ]
 
-def to_yyyymmdd(val: Any) -> str:
-    if val is None:
-        return ""
-    s = str(val).strip()
-    digits = "".join(ch for ch in s if ch.isdigit())
-    if len(digits) >= 8:
-        ymd = digits[:8]
-        try:
-            datetime.strptime(ymd, "%Y%m%d")
-            return ymd
-        except Exception:
-            pass
-    try:
-        return datetime.fromisoformat(s.replace("Z","+00:00")).strftime("%Y%m%d")
-    except Exception:
-        return ""
-
 def base_yyyymmdd() -> str:
-    ymd = to_yyyymmdd(config_today)
-    if ymd:
-        return ymd
-    return datetime.now(ZoneInfo("Asia/Seoul")).strftime("%Y%m%d")
+    return today_or(config_today)
 
 def load_json(path: Path) -> List[Dict[str, Any]]:
     if not path.exists() or path.stat().st_size == 0:
@@ -55,11 +36,11 @@ def load_json(path: Path) -> List[Dict[str, Any]]:
     except Exception:
         return []
 
-def save_json(path: Path, rows: List[Dict[str, Any]]) -> None:
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(rows, f, ensure_ascii=False, indent=2)
-
 def is_today_item(item: Dict[str, Any], ymd: str) -> bool:
+    # 정규화된 레코드는 ymd 비교만, DATE_KEYS 추정은 레거시 레코드용
+    stored = notice_ymd(item)
+    if stored is not None:
+        return stored == ymd
     for k in DATE_KEYS:
         if k in item:
             v = to_yyyymmdd(item.get(k))
@@ -68,8 +49,11 @@ def is_today_item(item: Dict[str, Any], ymd: str) -> bool:
     return False
 
 def collect_warning_targets(ymd: str) -> List[Dict[str, Any]]:
-    data = load_json(INPUT_JSON)
-    today_items = [e for e in data if is_today_item(e, ymd)]
+    # 공시 DB가 있으면 인덱스 조회, 없으면 JSON 스캔
+    today_items = query_day("투자경고", ymd)
+    if today_items is None:
+        data = load_json(INPUT_JSON)
+        today_items = [e for e in data if is_today_item(e, ymd)]
     seen = set()
     out: List[Dict[str, Any]] = []
     for e in today_items:
@@ -87,60 +71,12 @@ def collect_warning_targets(ymd: str) -> List[Dict[str, Any]]:
 # ---------------------------
 # KIS 일별시세 조회 (최근 N거래일)
 # ---------------------------
-KIS_BASE = "https://openapi.koreainvestment.com:9443"
-KIS_DAILY_API = "/uapi/domestic-stock/v1/quotations/inquire-daily-price"
-KIS_TR_ID = "FHKST01010400"  # 일별시세
-
 def kis_get_daily_prices(token: str, stock_code: str, count: int = 20, base_ymd: str | None = None):
     """
     한국투자증권 일별시세 조회 (최신→과거 정렬, 최대 count개 반환)
-    - 날짜 구간(FID_INPUT_DATE_1/2) 지정
-    - 응답 'output' 리스트 사용
+    - 일봉 캐시(z_daily_bars) 경유: 이미 받은 확정 일봉은 다시 조회하지 않음
     """
-    if base_ymd:
-        try:
-            d0 = datetime.strptime(base_ymd, "%Y%m%d")
-        except Exception:
-            d0 = datetime.today()
-    else:
-        d0 = datetime.today()
-    start_date = (d0 - timedelta(days=count * 2)).strftime("%Y%m%d")
-    end_date   = datetime.today().strftime("%Y%m%d")
-
-    url = KIS_BASE + KIS_DAILY_API
-    headers = {
-        "Content-Type": "application/json; charset=utf-8",
-        "accept": "application/json",
-        "authorization": f"Bearer {token}",
-        "appkey": APP_KEY,
-        "appsecret": APP_SECRET,
-        "tr_id": KIS_TR_ID,
-        "custtype": "P",
-    }
-    params = {
-        "FID_COND_MRKT_DIV_CODE": "J",
-        "FID_INPUT_ISCD": stock_code,
-        "FID_INPUT_DATE_1": start_date,
-        "FID_INPUT_DATE_2": end_date,
-        "FID_PERIOD_DIV_CODE": "D",
-        "FID_ORG_ADJ_PRC": "0",
-    }
-
-    try:
-        r = requests.get(url, headers=headers, params=params, timeout=10)
-        r.raise_for_status()
-        data = r.json()
-        rows = data.get("output", [])
-        if isinstance(rows, dict):
-            rows = [rows]
-        if not isinstance(rows, list):
-            rows = []
-        rows = [x for x in rows if x.get("stck_bsop_date")]
-        rows.sort(key=lambda x: x["stck_bsop_date"], reverse=True)
-        return rows[:count]
-    except Exception as e:
-        print(f"⚠️ KIS 일별시세 조회 실패: {stock_code} / {e}")
-        return []
+    return get_daily_prices(token, stock_code, count=count, base_ymd=base_ymd)
 
 # ---------------------------
 # 투자경고 기준가 계산 (내일 기준 offset 보정)
@@ -153,6 +89,15 @@ CAT_RULES = {
     # "초장기불건전예고": 15일 최고만 사용
 }
 
+# 분류별 보조 필드: (키, 당일 기준 영업일 offset) 종가 — 모두 high_price(최근 14영업일 신고가)도 같이 저장
+EXTRA_OFFSETS = {
+    "초단기예고":       [("D-3_price", 2)],
+    "단기예고":         [("D-5_price", 4)],
+    "단기불건전예고":   [("D-5_45_price", 4)],   # 원가격
+    "장기예고":         [("D-15_price", 14)],
+    "초장기불건전예고": [],
+}
+
 # 계산에서 제외할 분류(부분 포함 매칭)
 # ※ "지정해제 및 재지정 예고"는 스킵 대상 아님 (별도 처리)
 SKIP_KEYWORDS = ["재지정", "지정"]  # 형이 원한 그대로 유지
@@ -276,6 +221,30 @@ def calc_warning_price(rows: List[Dict[str, Any]], base_ymd: str, category_label
     else:
         return high15, high_date, high_close
 
+def warning_fields(rows: List[Dict[str, Any]], base_ymd: str, category_label: str) -> Dict[str, Any]:
+    """종목 하나의 지정가/기준일/최근 종가/보조 필드 (z_price_engine.warning_fields_batch와 같은 결과)"""
+    designated, base_date, base_close = calc_warning_price(rows, base_ymd, category_label)
+    latest_date, latest_close = _price_at_offset_today(rows, 0)
+    extra: Dict[str, Any] = {}
+    if category_label in EXTRA_OFFSETS:
+        for key, offset in EXTRA_OFFSETS[category_label]:
+            extra[key] = _price_at_offset_today(rows, offset)[1]
+        extra["high_price"] = _high_with_date(rows, n=14)[0]
+    return {
+        "designated": designated,
+        "base_date": base_date,
+        "base_close": base_close,
+        "latest_date": latest_date,
+        "latest_close": latest_close,
+        "extra": extra,
+    }
+
+def warning_fields_many(rows_list: List[List[Dict[str, Any]]], base_ymd: str, labels: List[str]) -> List[Dict[str, Any]]:
+    """대상 전체를 한 번에: numpy 있으면 배열 엔진(한 번 변환 + 벡터 연산), 없으면 종목별 계산"""
+    if price_engine.AVAILABLE and rows_list:
+        return price_engine.warning_fields_batch(rows_list, labels, CAT_RULES, EXTRA_OFFSETS)
+    return [warning_fields(rows, base_ymd, label) for rows, label in zip(rows_list, labels)]
+
 # ---------------------------
 # 카테고리 정렬 우선순위 (작을수록 먼저)
 # ---------------------------
@@ -318,15 +287,9 @@ def _category_rank_for_record(rec: Dict[str, Any]) -> int:
 # ---------------------------
 # 영업일 보관 범위 계산
 # ---------------------------
-def _to_date(ymd: str) -> date:
-    return datetime.strptime(ymd, "%Y%m%d").date()
-
 def nearest_business_day_on_or_before(ymd: str) -> str:
     """ymd(YYYYMMDD)와 같거나 그 이전 중 가장 가까운 '영업일'을 반환"""
-    d = _to_date(ymd)
-    while not is_business_day(d):
-        d -= timedelta(days=1)
-    return d.strftime("%Y%m%d")
+    return z_trading_calendar.prev_business_day(ymd)
 
 def business_day_cutoff(base_ymd: str, n_days: int = 10) -> Tuple[str, str]:
     """
@@ -336,15 +299,7 @@ def business_day_cutoff(base_ymd: str, n_days: int = 10) -> Tuple[str, str]:
       - cutoff_ymd: anchor에서 (n-1) 영업일 뒤로 간 날짜
     """
     anchor_ymd = nearest_business_day_on_or_before(base_ymd)
-    d = _to_date(anchor_ymd)
-    kept = 1  # anchor 포함
-
-    while kept < n_days:
-        d -= timedelta(days=1)
-        if is_business_day(d):
-            kept += 1
-
-    cutoff_ymd = d.strftime("%Y%m%d")
+    cutoff_ymd = z_trading_calendar.business_days_back(anchor_ymd, n_days - 1)  # anchor 포함
     return cutoff_ymd, anchor_ymd
 
 # ---------------------------
@@ -360,8 +315,7 @@ def retain_last_n_days(rows: List[Dict[str, Any]], base_ymd: str, n_days: int =
         cutoff, anchor = business_day_cutoff(base_ymd, n_days=n_days)
     except Exception:
         # 문제 시 달력일수 fallback (기존 동작)
-        d0 = datetime.now(ZoneInfo("Asia/Seoul"))
-        cutoff = (d0 - timedelta(days=n_days - 1)).strftime("%Y%m%d")
+        cutoff = shift_ymd(kst_today(), -(n_days - 1))
         anchor = base_ymd
 
     kept = []
@@ -443,13 +397,8 @@ def find_close_for_date(rows: List[Dict[str, Any]], ymd: str) -> Tuple[str, int]
 # ---------------------------
 # 메인
 # ---------------------------
-def main():
-    ymd = base_yyyymmdd()
-    if len(sys.argv) >= 2:
-        arg = to_yyyymmdd(sys.argv[1])
-        if arg:
-            ymd = arg
-
+def run(ctx: RunContext, ymd: str) -> List[Dict[str, Any]]:
+    """기준일 투자경고 지정가 계산 → 결과 JSON 업서트. 저장한 전체 레코드 반환 (b_all_cal은 컨텍스트 공유로 호출)"""
     print(f"🗓 기준일: {ymd}")
     targets = collect_warning_targets(ymd)
     print(f"📌 투자경고 대상 {len(targets)}개")
@@ -458,12 +407,33 @@ def main():
         cats_text = ", ".join(cats) if isinstance(cats, list) else (cats or "")
         print(f"- {t['stock_name']}({t['stock_code']}) - {cats_text}")
 
-    token = get_access_token()
+    z_trading_calendar.calendar().use_token(ctx.token)  # 토큰 로드/검증 (일봉·영업일 달력 조회가 같이 씀)
     print("🔑 토큰 OK, KIS 일별시세 확인/계산 시작")
 
+    # 시세가 필요한 종목만 먼저 동시 조회 (초당 요청 한도는 z_daily_bars가 관리)
+    need = [
+        t["stock_code"] for t in targets
+        if has_release_category(t.get("categories", []))
+        or (not is_skip_category(t.get("categories", [])) and pick_category_label(t.get("categories", [])))
+    ]
+    prices = ctx.daily_prices(need, count=40, base_ymd=ymd)
+
+    # 지정가/보조 필드는 대상 전체를 한 번에 계산
+    labels: Dict[int, str] = {}
+    for i, t in enumerate(targets):
+        cats = t.get("categories", [])
+        if has_release_category(cats) or is_skip_category(cats):
+            continue
+        label = pick_category_label(cats)
+        if label and prices.get(t["stock_code"]):
+            labels[i] = label
+    fields = dict(zip(labels, warning_fields_many(
+        [prices[targets[i]["stock_code"]] for i in labels], ymd, list(labels.values())
+    )))
+
     out_rows: List[Dict[str, Any]] = []
 
-    for t in targets:
+    for i, t in enumerate(targets):
         code = t["stock_code"]
         name = t["stock_name"]
         cats = t.get("categories", [])
@@ -471,7 +441,7 @@ def main():
 
         # 1) '지정해제 및 재지정 예고' 별도 처리 (release_price 저장)
         if has_release_category(cats):
-            rows = kis_get_daily_prices(token, code, count=40, base_ymd=ymd)
+            rows = prices.get(code) or []
             if not rows:
                 print(f"  · {name}({code}) — 지정해제/재지정: 시세 데이터 없음")
             else:
@@ -498,50 +468,21 @@ def main():
             print(f"  · {name}({code}) — 계산 생략 (해당 규칙 없음 / 분류: {cats_text})")
             continue
 
-        rows = kis_get_daily_prices(token, code, count=40, base_ymd=ymd)
+        rows = prices.get(code) or []
         if not rows:
             print(f"  · {name}({code}) — 시세 데이터 없음")
             continue
 
-        designated, base_date, base_close = calc_warning_price(rows, ymd, cat_label)
+        f = fields[i]
+        designated = f["designated"]
         if designated <= 0:
             print(f"  · {name}({code}) — 계산 실패")
             continue
 
-        latest = rows[0]
-        latest_d = latest.get("stck_bsop_date")
-        latest_cl = _to_int(latest.get("stck_clpr"))
-
-        # ➕ 추가: 보조 필드 계산 (당일 기준)
-        extra_fields: Dict[str, Any] = {}
-        if cat_label == "초단기예고":
-            _, d3p = _price_at_offset_today(rows, 2)   # 당일 기준 2영업일 전
-            hi14, _, _ = _high_with_date(rows, n=14)   # 최근 14영업일 신고가
-            extra_fields["D-3_price"] = d3p
-            extra_fields["high_price"] = hi14
-        elif cat_label == "단기예고":
-            _, d5p = _price_at_offset_today(rows, 4)   # 당일 기준 4영업일 전
-            hi14, _, _ = _high_with_date(rows, n=14)
-            extra_fields["D-5_price"] = d5p
-            extra_fields["high_price"] = hi14
-        elif cat_label == "단기불건전예고":
-            _, d5_45p = _price_at_offset_today(rows, 4)  # 당일 기준 4영업일 전 (원가격)
-            hi14, _, _ = _high_with_date(rows, n=14)
-            extra_fields["D-5_45_price"] = d5_45p
-            extra_fields["high_price"] = hi14
-        elif cat_label == "장기예고":
-            _, d15p = _price_at_offset_today(rows, 14) # 당일 기준 14영업일 전
-            hi14, _, _ = _high_with_date(rows, n=14)
-            extra_fields["D-15_price"] = d15p
-            extra_fields["high_price"] = hi14
-        elif cat_label == "초장기불건전예고":
-            # ✅ 요청: 초장기불건전예고에도 14영업일 신고가 저장
-            hi14, _, _ = _high_with_date(rows, n=14)
-            extra_fields["high_price"] = hi14
-
         extra = " + 소수계좌" if cat_label in ("단기불건전예고", "초장기불건전예고") else ""
         print(f"  · {name}({code}) [{cat_label}] → 지정가 {_fmt_won(designated)}{extra} "
-              f"(최근일 {latest_d}, 종가 {_fmt_won(latest_cl)}, 기준일 {base_date}, 종가 {_fmt_won(base_close)})")
+              f"(최근일 {f['latest_date']}, 종가 {_fmt_won(f['latest_close'])}, "
+              f"기준일 {f['base_date']}, 종가 {_fmt_won(f['base_close'])})")
 
         # JSON 저장용 레코드
         record = {
@@ -551,13 +492,22 @@ def main():
             "date": ymd,                    # 기준일(당일 공시 기준일)
             "first_price": designated,      # 계산된 지정가
         }
-        record.update(extra_fields)          # ➕ 보조 필드 포함
+        record.update(f["extra"])            # ➕ 보조 필드 포함
         out_rows.append(record)
 
     # 업서트 + 최근 10영업일 유지 + 날짜별 카테고리 정렬
     merged = upsert_results(OUTPUT_JSON, ymd, out_rows, keep_days=10)
-    save_json(OUTPUT_JSON, merged)
+    ctx.save_json(OUTPUT_JSON, merged)
     print(f"💾 저장: {OUTPUT_JSON} ({len(merged)}건, 오늘 {len(out_rows)}건 업서트)")
+    return merged
+
+def main():
+    ymd = base_yyyymmdd()
+    if len(sys.argv) >= 2:
+        arg = to_yyyymmdd(sys.argv[1])
+        if arg:
+            ymd = arg
+    run(RunContext(), ymd)
 
 if __name__ == "__main__":
     main()
@@ -1,57 +1,19 @@
 # b_waring_update.py
-import json
-import time
 from pathlib import Path
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
-import requests
-
-from z_config import today as config_today, APP_KEY, APP_SECRET
-from z_token_manager import get_access_token
+from z_config import today as config_today
+from z_dates import to_yyyymmdd, today_or
+from z_daily_bars import get_daily_prices
+import z_price_engine as price_engine
+from z_run_context import RunContext
 
 BASE_DIR = Path(__file__).resolve().parent
 INPUT_OUTPUT_JSON = BASE_DIR / "b_waring_price_cal.json"
 
-KIS_BASE = "https://openapi.koreainvestment.com:9443"
-KIS_DAILY_API = "/uapi/domestic-stock/v1/quotations/inquire-daily-price"
-KIS_TR_ID = "FHKST01010400"  # 일별시세
-
 # -------- util --------
-def to_yyyymmdd(val: Any) -> str:
-    if val is None:
-        return ""
-    s = str(val).strip()
-    digits = "".join(ch for ch in s if ch.isdigit())
-    if len(digits) >= 8:
-        ymd = digits[:8]
-        try:
-            datetime.strptime(ymd, "%Y%m%d")
-            return ymd
-        except Exception:
-            pass
-    try:
-        return datetime.fromisoformat(s.replace("Z","+00:00")).strftime("%Y%m%d")
-    except Exception:
-        return ""
-
 def today_yyyymmdd() -> str:
-    ymd = to_yyyymmdd(config_today)
-    if ymd:
-        return ymd
-    return datetime.now(ZoneInfo("Asia/Seoul")).strftime("%Y%m%d")
-
-def load_json(path: Path) -> List[Dict[str, Any]]:
-    if not path.exists() or path.stat().st_size == 0:
-        return []
-    with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-        return data if isinstance(data, list) else []
-
-def save_json(path: Path, rows: List[Dict[str, Any]]) -> None:
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(rows, f, ensure_ascii=False, indent=2)
+    return today_or(config_today)
 
 def normalize_categories_value(v) -> List[str]:
     if isinstance(v, list):
@@ -88,51 +50,9 @@ def _to_int(v) -> int:
     except Exception:
         return 0
 
-# -------- KIS prices (cached) --------
-_price_cache: Dict[str, List[Dict[str, Any]]] = {}
-
+# -------- KIS prices (z_daily_bars 일봉 캐시) --------
 def kis_get_daily_prices(token: str, stock_code: str, count: int = 60) -> List[Dict[str, Any]]:
-    if stock_code in _price_cache:
-        return _price_cache[stock_code]
-
-    d0 = datetime.today()
-    start_date = (d0 - timedelta(days=count * 2)).strftime("%Y%m%d")
-    end_date = d0.strftime("%Y%m%d")
-
-    url = KIS_BASE + KIS_DAILY_API
-    headers = {
-        "Content-Type": "application/json; charset=utf-8",
-        "accept": "application/json",
-        "authorization": f"Bearer {token}",
-        "appkey": APP_KEY,
-        "appsecret": APP_SECRET,
-        "tr_id": KIS_TR_ID,
-        "custtype": "P",
-    }
-    params = {
-        "FID_COND_MRKT_DIV_CODE": "J",
-        "FID_INPUT_ISCD": stock_code,
-        "FID_INPUT_DATE_1": start_date,
-        "FID_INPUT_DATE_2": end_date,
-        "FID_PERIOD_DIV_CODE": "D",
-        "FID_ORG_ADJ_PRC": "0",
-    }
-    try:
-        r = requests.get(url, headers=headers, params=params, timeout=10)
-        r.raise_for_status()
-        rows = r.json().get("output", [])
-        if isinstance(rows, dict):
-            rows = [rows]
-        if not isinstance(rows, list):
-            rows = []
-        rows = [x for x in rows if x.get("stck_bsop_date")]
-        rows.sort(key=lambda x: x["stck_bsop_date"], reverse=True)  # 최신→과거
-    except Exception as e:
-        print(f"⚠️ KIS 일별시세 조회 실패: {stock_code} / {e}")
-        rows = []
-
-    _price_cache[stock_code] = rows
-    return rows
+    return get_daily_prices(token, stock_code, count=count)
 
 def price_at_offset_today(rows: List[Dict[str, Any]], offset: int) -> int:
     if 0 <= offset < len(rows):
@@ -147,15 +67,22 @@ def high_n_today(rows: List[Dict[str, Any]], n: int = 14) -> int:
             hi = cl
     return hi
 
-# -------- main --------
-def main():
-    tdy = today_yyyymmdd()
-    token = get_access_token()
+OFFSETS = (1, 2, 4, 14)  # 전일 / D-3 / D-5 / D-15 (당일 기준 영업일 offset)
 
-    data = load_json(INPUT_OUTPUT_JSON)
+def offset_closes_many(rows_list: List[List[Dict[str, Any]]]) -> List[Tuple[Dict[int, int], int]]:
+    """종목별 ({offset: 종가}, 14영업일 최고) — numpy 있으면 배열 엔진으로 한 번에"""
+    if price_engine.AVAILABLE and rows_list:
+        return price_engine.offset_closes_batch(rows_list, OFFSETS, high_days=14)
+    return [({off: price_at_offset_today(rows, off) for off in OFFSETS}, high_n_today(rows, 14)) for rows in rows_list]
+
+# -------- main --------
+def run(ctx: RunContext, tdy: str | None = None) -> List[Dict[str, Any]]:
+    """오늘(tdy) 이전 레코드의 보조 필드 갱신 → 저장. 갱신한 전체 레코드 반환"""
+    tdy = tdy or today_yyyymmdd()
+    data = ctx.load_json(INPUT_OUTPUT_JSON)
     if not data:
         print(f"⚠️ 파일 없음 혹은 비어있음: {INPUT_OUTPUT_JSON.name}")
-        return
+        return data
 
     targets = []
     for i, rec in enumerate(data):
@@ -166,10 +93,17 @@ def main():
 
     if not targets:
         print(f"ℹ️ 오늘({tdy}) 제외한 업데이트 대상 없음.")
-        return
+        return data
 
     print(f"🛠 업데이트 대상: {len(targets)}건 (date != {tdy})")
 
+    # 대상 종목 시세를 먼저 한꺼번에 동시 조회 (초당 요청 한도는 z_daily_bars가 관리)
+    codes = list(dict.fromkeys(str(rec.get("stock_code", "")).strip() for _, rec in targets))
+    codes = [c for c in codes if c]
+    prices = ctx.daily_prices(codes, count=60)
+    have = [c for c in codes if prices.get(c)]
+    table = dict(zip(have, offset_closes_many([prices[c] for c in have])))
+
     updated_names = []
     updated = 0
     skipped = 0
@@ -182,16 +116,16 @@ def main():
             skipped += 1
             continue
 
-        rows = kis_get_daily_prices(token, code, count=60)
-        if not rows:
+        if code not in table:
             skipped += 1
             continue
+        closes, hi14 = table[code]
 
         # -----------------------------
         # ① 지정해제 및 재지정 예고
         # -----------------------------
         if has_release_category(cats):
-            d2_price = price_at_offset_today(rows, 1)  # 하루 전 종가
+            d2_price = closes[1]  # 하루 전 종가
             if d2_price > 0:
                 rec["D-2_price"] = d2_price
                 updated_names.append(name)
@@ -199,7 +133,6 @@ def main():
             else:
                 skipped += 1
             data[i] = rec
-            time.sleep(0.12)
             continue
 
         # -----------------------------
@@ -212,15 +145,15 @@ def main():
 
         patch: Dict[str, int] = {}
         if "D-3_price" in need_keys:
-            patch["D-3_price"] = price_at_offset_today(rows, 2)
+            patch["D-3_price"] = closes[2]
         if "D-5_price" in need_keys:
-            patch["D-5_price"] = price_at_offset_today(rows, 4)
+            patch["D-5_price"] = closes[4]
         if "D-5_45_price" in need_keys:
-            patch["D-5_45_price"] = price_at_offset_today(rows, 4)
+            patch["D-5_45_price"] = closes[4]
         if "D-15_price" in need_keys:
-            patch["D-15_price"] = price_at_offset_today(rows, 14)
+            patch["D-15_price"] = closes[14]
         if "high_price" in need_keys:
-            patch["high_price"] = high_n_today(rows, 14)
+            patch["high_price"] = hi14
 
         any_updated = False
         for k, v in patch.items():
@@ -235,11 +168,14 @@ def main():
             skipped += 1
 
         data[i] = rec
-        time.sleep(0.12)
 
-    save_json(INPUT_OUTPUT_JSON, data)
+    ctx.save_json(INPUT_OUTPUT_JSON, data)
     names_str = ", ".join(updated_names) if updated_names else "-"
     print(f"✅ 완료: {INPUT_OUTPUT_JSON.name} | 업데이트 {updated}건, 스킵 {skipped}건 (업데이트: {names_str})")
+    return data
+
+def main():
+    run(RunContext())
 
 if __name__ == "__main__":
     main()
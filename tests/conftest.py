@@ -0,0 +1,5 @@
+# 저장소 루트의 z_*.py 모듈을 그대로 import
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
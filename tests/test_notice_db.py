@@ -0,0 +1,54 @@
+# z_notice_db: 유형별 공시 저장/보강
+import sqlite3
+
+import z_notice_db
+
+
+def _notice(title: str, **kw) -> dict:
+    return {"title": title, "date": "2026-10-16", "categories": [], **kw}
+
+
+def test_same_doc_no_under_two_types(tmp_path):
+    db = tmp_path / "a_notices.sqlite3"
+    doc = "20261016000123"
+    z_notice_db.ingest("투자위험", [_notice("매매거래 정지 및 재개(투자위험종목 지정중)", doc_no=doc)], path=db)
+    z_notice_db.ingest("거래정지", [_notice("매매거래 정지 및 재개(투자위험종목 지정중)", doc_no=doc)], path=db)
+
+    for notice_type in ("투자위험", "거래정지"):
+        rows = z_notice_db.query_day(notice_type, "20261016", path=db)
+        assert [r["doc_no"] for r in rows] == [doc]
+
+
+def test_enrich_fills_doc_no_per_type(tmp_path):
+    db = tmp_path / "a_notices.sqlite3"
+    doc, link = "20261016000123", "https://kind.krx.co.kr/x"
+    z_notice_db.ingest("투자위험", [_notice("A", doc_no=doc, link=link)], path=db)
+    z_notice_db.ingest("거래정지", [_notice("A", link=link)], path=db)
+
+    assert z_notice_db.enrich("거래정지", [{"link": link, "doc_no": doc, "stock_code": "000001"}], path=db) == 1
+    row = z_notice_db.query_day("거래정지", "20261016", path=db)[0]
+    assert (row["doc_no"], row["stock_code"]) == (doc, "000001")
+
+
+def test_migrates_global_doc_no_key(tmp_path):
+    db = tmp_path / "a_notices.sqlite3"
+    old = sqlite3.connect(str(db))
+    old.executescript(
+        z_notice_db._SCHEMA.replace("doc_no       TEXT,", "doc_no       TEXT UNIQUE,").replace(
+            "    UNIQUE (notice_type, doc_no),\n", ""
+        )
+    )
+    old.execute(
+        "INSERT INTO notices (id, doc_no, notice_type, ymd, date, title) VALUES (7, 'D1', '투자위험', '20261016', '2026-10-16', 'A')"
+    )
+    old.execute("INSERT INTO notice_categories VALUES (7, '투위지정')")
+    old.commit()
+    old.close()
+
+    z_notice_db.ingest("거래정지", [_notice("A", doc_no="D1")], path=db)
+    conn = z_notice_db.connect(db)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM notices WHERE doc_no = 'D1'").fetchone()[0] == 2
+        assert conn.execute("SELECT category FROM notice_categories WHERE notice_id = 7").fetchone()[0] == "투위지정"
+    finally:
+        conn.close()
@@ -0,0 +1,38 @@
+# z_notice_store: JSON + 공시 DB 보강
+import sys
+import types
+
+import pytest
+
+# z_lifecycle은 KIS 달력(requests/z_config)을 끌어오므로 보강 경로에 필요한 것만 대체
+sys.modules.setdefault("z_lifecycle", types.SimpleNamespace(replay_stocks=lambda codes: 0))
+
+import z_notice_db
+import z_notice_store
+
+
+def test_title_only_notice_searchable_after_enrich(tmp_path, monkeypatch):
+    db = tmp_path / "a_notices.sqlite3"
+    path = tmp_path / "a_caution_notices.json"
+    link = "https://kind.krx.co.kr/x"
+    for name in ("ingest", "enrich"):
+        orig = getattr(z_notice_db, name)
+        monkeypatch.setattr(z_notice_db, name, lambda *a, _f=orig, **kw: _f(*a, path=db, **kw))
+
+    # TITLE_ONLY 수집기: 본문 없이 제목만으로 저장
+    title_only = {"title": "투자주의종목 지정(소수계좌 매수관여 과다)", "date": "2026-10-16", "link": link, "categories": []}
+    z_notice_store.ingest_notices(path, [title_only], max_days=100000, notice_type="투자주의")
+    if not z_notice_db._fts_available:
+        pytest.skip("SQLite FTS5(trigram) 없음")
+    assert z_notice_db.search_texts("소수계좌 매수관여", path=db) == []
+
+    docs = {link: {"doc_no": "20261016000123", "frame_url": "f", "stock_name": "가나", "stock_code": "000001",
+                   "text": "소수계좌 매수관여 과다 종목으로 지정"}}
+    assert z_notice_store.enrich_notices(path, docs, notice_type="투자주의") == 1
+    hits = z_notice_db.search_texts("소수계좌 매수관여", path=db)
+    assert [h["stock_code"] for h in hits] == ["000001"]
+    assert "text" not in z_notice_store.load_notices(path)[0]
+
+    # 다시 보강해도 본문 색인은 한 번만
+    z_notice_store.enrich_notices(path, docs, notice_type="투자주의")
+    assert len(z_notice_db.search_texts("소수계좌 매수관여", path=db)) == 1
@@ -0,0 +1,306 @@
+# z_daily_bars.py
+# KIS 일별시세(일봉) 로컬 캐시 — b_* 가격 스크립트 공용
+# - (종목코드, 거래일) 키로 SQLite에 저장, 장 마감 후 받은 일봉은 다시 안 받음
+# - 이미 받은 종목은 마지막 확정 일봉 다음 날부터만 추가 조회 (하루 1회 작은 조회)
+# - 같은 종목 동시 요청은 하나로 합침 (먼저 들어온 요청이 받는 동안 나머지는 기다렸다가 캐시에서 읽음)
+# - 반환 모양은 KIS 'output' 행 그대로 (stck_bsop_date, stck_clpr ... / 최신→과거)
+# - 여러 종목은 get_daily_prices_many로 동시 조회: 초당 요청 수(KIS_RPS) 토큰 버킷 + 유량제한 응답 시 백오프
+import os
+import json
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import requests
+
+import z_trading_calendar
+from z_config import APP_KEY, APP_SECRET
+from z_dates import KST, kst_today, shift_ymd, to_date, to_yyyymmdd
+
+BASE_DIR = Path(__file__).resolve().parent
+CACHE_FILE = BASE_DIR / "kis_daily_bars.sqlite3"
+
+KIS_BASE = "https://openapi.koreainvestment.com:9443"
+KIS_DAILY_API = "/uapi/domestic-stock/v1/quotations/inquire-daily-price"
+KIS_TR_ID = "FHKST01010400"  # 일별시세
+
+MARKET_OPEN_HHMM = "0900"    # 이 시각(KST) 이후면 당일 일봉이 있어야 함
+MARKET_FINAL_HHMM = "1540"   # 이 시각(KST) 이후 받은 당일 일봉은 확정으로 봄
+INTRADAY_TTL = 300           # 장중에는 이 시간(초) 안에 다시 조회하지 않음
+TOPUP_MAX_DAYS = 20          # 마지막 확정 일봉이 이보다 오래됐으면 추가 조회 대신 전체 조회 (응답 30행 제한)
+
+# KIS 앱키당 초당 요청 한도 (실전 20건 / 모의 2건) — .env의 KIS_RPS로 조정
+KIS_RPS = float(os.getenv("KIS_RPS", "15"))
+KIS_FETCH_WORKERS = 8
+KIS_MAX_RETRIES = 4
+KIS_BACKOFF_BASE = 0.5                   # 유량제한 응답 시 0.5 → 1 → 2 → 4초 (+지터)
+KIS_RATE_LIMIT_MSG_CODES = {"EGW00201"}  # 초당 거래건수 초과
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    stock_code  TEXT NOT NULL,
+    ymd         TEXT NOT NULL,
+    open        INTEGER NOT NULL,
+    high        INTEGER NOT NULL,
+    low         INTEGER NOT NULL,
+    close       INTEGER NOT NULL,
+    volume      INTEGER NOT NULL,
+    final       INTEGER NOT NULL,
+    row         TEXT NOT NULL,
+    PRIMARY KEY (stock_code, ymd)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    stock_code  TEXT PRIMARY KEY,
+    from_ymd    TEXT NOT NULL,
+    checked_at  REAL NOT NULL
+);
+"""
+
+def _to_int(v) -> int:
+    try:
+        return int(str(v).replace(",", "").strip())
+    except Exception:
+        return 0
+
+def connect(path: Path = CACHE_FILE) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(path), timeout=30)
+    conn.executescript(_SCHEMA)
+    return conn
+
+# ---------------------------
+# 요청 속도 제한
+# ---------------------------
+class TokenBucket:
+    """초당 rate건, 최대 burst건까지 연속 허용 (스레드 공용). penalize()로 전체 일시 정지
+    burst 기본 1 = 고르게 간격을 둠 → 어느 1초 구간에서도 rate건을 넘지 않음"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = max(0.1, rate)
+        self.burst = max(1.0, burst if burst is not None else 1.0)
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def penalize(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+_bucket = TokenBucket(KIS_RPS)
+
+def _is_rate_limited(r: requests.Response) -> bool:
+    if r.status_code == 429:
+        return True
+    try:
+        return str(r.json().get("msg_cd", "")) in KIS_RATE_LIMIT_MSG_CODES
+    except Exception:
+        return False
+
+# ---------------------------
+# KIS 조회
+# ---------------------------
+def fetch_daily_rows(
+    token: str,
+    stock_code: str,
+    start_ymd: str,
+    end_ymd: str,
+    session: Optional[requests.Session] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """KIS 일별시세 1회 조회 (최신→과거). 토큰 버킷 경유, 유량제한이면 백오프 후 재시도. 실패하면 None
+    session을 주면 그 연결을 재사용 (없으면 requests.get)"""
+    headers = {
+        "Content-Type": "application/json; charset=utf-8",
+        "accept": "application/json",
+        "authorization": f"Bearer {token}",
+        "appkey": APP_KEY,
+        "appsecret": APP_SECRET,
+        "tr_id": KIS_TR_ID,
+        "custtype": "P",
+    }
+    params = {
+        "FID_COND_MRKT_DIV_CODE": "J",
+        "FID_INPUT_ISCD": stock_code,
+        "FID_INPUT_DATE_1": start_ymd,
+        "FID_INPUT_DATE_2": end_ymd,
+        "FID_PERIOD_DIV_CODE": "D",
+        "FID_ORG_ADJ_PRC": "0",
+    }
+    try:
+        for attempt in range(KIS_MAX_RETRIES + 1):
+            _bucket.acquire()
+            r = (session or requests).get(KIS_BASE + KIS_DAILY_API, headers=headers, params=params, timeout=10)
+            if not _is_rate_limited(r) or attempt == KIS_MAX_RETRIES:
+                break
+            delay = KIS_BACKOFF_BASE * (2 ** attempt) * (1 + random.random() * 0.25)
+            print(f"⏳ KIS 유량제한: {stock_code} {delay:.1f}s 후 재시도 ({attempt + 1}/{KIS_MAX_RETRIES})")
+            _bucket.penalize(delay)
+        r.raise_for_status()
+        data = r.json()
+        # 업무 오류(토큰 만료/무효 등)도 HTTP 200 + rt_cd != "0" 으로 옴 → 실패로 처리
+        if "rt_cd" in data and str(data["rt_cd"]) != "0":
+            print(f"⚠️ KIS 일별시세 조회 실패: {stock_code} / [{data.get('msg_cd', '')}] {data.get('msg1', '')}")
+            return None
+        rows = data.get("output", [])
+        if isinstance(rows, dict):
+            rows = [rows]
+        if not isinstance(rows, list):
+            rows = []
+        rows = [x for x in rows if x.get("stck_bsop_date")]
+        rows.sort(key=lambda x: x["stck_bsop_date"], reverse=True)
+        return rows
+    except Exception as e:
+        print(f"⚠️ KIS 일별시세 조회 실패: {stock_code} / {e}")
+        return None
+
+# ---------------------------
+# 캐시
+# ---------------------------
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+def _code_lock(stock_code: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(stock_code, threading.Lock())
+
+def _is_fresh(checked_at: float, today: str) -> bool:
+    checked = datetime.fromtimestamp(checked_at, KST)
+    if checked.strftime("%Y%m%d") != today:
+        return False
+    return checked.strftime("%H%M") >= MARKET_FINAL_HHMM or time.time() - checked_at < INTRADAY_TTL
+
+def _expects_bars(from_ymd: str, today: str, token: Optional[str] = None) -> bool:
+    """
+    from_ymd~오늘 구간에 일봉이 있어야 하는지: 어제까지의 거래일, 또는 장 시작 후의 오늘(거래일).
+    거래일은 KRX 달력(z_trading_calendar) 기준 — 평일 휴장일에는 일봉을 기다리지 않음.
+    달력을 못 쓰면 평일 기준
+    """
+    opened = datetime.now(KST).strftime("%H%M") >= MARKET_OPEN_HHMM
+    try:
+        cal = z_trading_calendar.calendar()
+        cal.use_token(token)
+        if from_ymd < today and cal.count_business_days(from_ymd, shift_ymd(today, -1)) > 0:
+            return True
+        return from_ymd <= today and opened and cal.is_business_day(today)
+    except Exception as e:
+        print(f"⚠️ 영업일 달력 사용 불가 → 평일 기준으로 판단: {e}")
+    d = from_ymd
+    while d < today:
+        if to_date(d).weekday() < 5:
+            return True
+        d = shift_ymd(d, 1)
+    now = datetime.now(KST)
+    return d == today and now.weekday() < 5 and now.strftime("%H%M") >= MARKET_OPEN_HHMM
+
+def _store(conn: sqlite3.Connection, stock_code: str, rows: List[Dict[str, Any]], from_ymd: str) -> None:
+    now = datetime.now(KST)
+    today, after_close = now.strftime("%Y%m%d"), now.strftime("%H%M") >= MARKET_FINAL_HHMM
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    stock_code,
+                    str(r["stck_bsop_date"]),
+                    _to_int(r.get("stck_oprc")),
+                    _to_int(r.get("stck_hgpr")),
+                    _to_int(r.get("stck_lwpr")),
+                    _to_int(r.get("stck_clpr")),
+                    _to_int(r.get("acml_vol")),
+                    int(str(r["stck_bsop_date"]) < today or after_close),
+                    json.dumps(r, ensure_ascii=False),
+                )
+                for r in rows
+            ],
+        )
+        conn.execute("INSERT OR REPLACE INTO coverage VALUES (?, ?, ?)", (stock_code, from_ymd, time.time()))
+
+def _refresh(
+    conn: sqlite3.Connection,
+    token: str,
+    stock_code: str,
+    start_ymd: str,
+    today: str,
+    session: Optional[requests.Session] = None,
+) -> None:
+    cov = conn.execute("SELECT from_ymd, checked_at FROM coverage WHERE stock_code = ?", (stock_code,)).fetchone()
+    if cov and cov[0] <= start_ymd and _is_fresh(cov[1], today):
+        return
+
+    fetch_from, from_ymd = start_ymd, start_ymd
+    if cov and cov[0] <= start_ymd:
+        last_final = conn.execute(
+            "SELECT MAX(ymd) FROM bars WHERE stock_code = ? AND final = 1", (stock_code,)
+        ).fetchone()[0]
+        if last_final and last_final >= shift_ymd(today, -TOPUP_MAX_DAYS):
+            fetch_from, from_ymd = shift_ymd(last_final, 1), cov[0]
+
+    # 조회가 성공했을 때만 저장/커버리지 갱신 (실패나 있어야 할 일봉이 빈 응답이면 다음 호출에서 다시 조회)
+    rows = fetch_daily_rows(token, stock_code, fetch_from, today, session=session)
+    if rows is None:
+        return
+    if not rows and _expects_bars(fetch_from, today, token):
+        print(f"⚠️ KIS 일별시세 빈 응답: {stock_code} ({fetch_from}~{today}) — 캐시 갱신 안 함")
+        return
+    _store(conn, stock_code, rows, from_ymd)
+
+def get_daily_prices(
+    token: str,
+    stock_code: str,
+    count: int = 40,
+    base_ymd: Optional[str] = None,
+    path: Path = CACHE_FILE,
+    session: Optional[requests.Session] = None,
+) -> List[Dict[str, Any]]:
+    """
+    최근 일봉 최대 count개 (최신→과거, KIS 행 그대로).
+    조회 구간은 기존 스크립트와 같이 (base_ymd 또는 오늘) - count*2일 ~ 오늘.
+    조회 실패 시 캐시에 있는 만큼만 반환.
+    """
+    today = kst_today()
+    start_ymd = shift_ymd(to_yyyymmdd(base_ymd) or today, -count * 2)
+    with _code_lock(stock_code):
+        conn = connect(path)
+        try:
+            _refresh(conn, token, stock_code, start_ymd, today, session=session)
+            rows = conn.execute(
+                "SELECT row FROM bars WHERE stock_code = ? AND ymd <= ? ORDER BY ymd DESC LIMIT ?",
+                (stock_code, today, count),
+            ).fetchall()
+        finally:
+            conn.close()
+    return [json.loads(r[0]) for r in rows]
+
+def get_daily_prices_many(
+    token: str,
+    stock_codes: Iterable[str],
+    count: int = 40,
+    base_ymd: Optional[str] = None,
+    workers: int = KIS_FETCH_WORKERS,
+    session: Optional[requests.Session] = None,
+) -> List[List[Dict[str, Any]]]:
+    """여러 종목 동시 조회 (입력 순서대로 반환). 전체 속도는 KIS_RPS 토큰 버킷이 제한"""
+    codes = list(stock_codes)
+    if not codes:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(codes)))) as pool:
+        return list(pool.map(lambda c: get_daily_prices(token, c, count=count, base_ymd=base_ymd, session=session), codes))
@@ -0,0 +1,140 @@
+# z_dates.py
+# 날짜 정규화 공용 모듈 (a_all_notices / b_* 스크립트에 복붙돼 있던 to_yyyymmdd, KST 오늘 대체)
+# - to_yyyymmdd: 숫자 자리 슬라이스로 바로 검증 (strptime 없음) + LRU 메모이즈
+# - kst_today: KST 오늘을 자정까지 캐시 (감시 모드처럼 오래 도는 프로세스도 날짜 바뀌면 갱신)
+#
+# 마이크로 벤치마크: python z_dates.py [레코드수]
+import re
+import sys
+import time
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Any, Optional
+from zoneinfo import ZoneInfo
+
+KST = ZoneInfo("Asia/Seoul")
+
+_nondigit = re.compile(r"[^0-9]")
+_days_in_month = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# ---------------------------
+# YYYYMMDD 정규화
+# ---------------------------
+def _valid_ymd(d: str) -> bool:
+    y, m, dd = int(d[:4]), int(d[4:6]), int(d[6:8])
+    if y < 1 or not 1 <= m <= 12 or dd < 1:
+        return False
+    if m == 2 and (y % 4 == 0 and (y % 100 != 0 or y % 400 == 0)):
+        return dd <= 29
+    return dd <= _days_in_month[m - 1]
+
+@lru_cache(maxsize=8192)
+def _ymd_from_str(s: str) -> str:
+    # 1) 흔한 모양은 슬라이스로: 'YYYYMMDD', 'YYYY-MM-DD...' (구분자 - / .)
+    if len(s) == 8 and s.isdigit():
+        digits = s
+    elif len(s) >= 10 and s[4] in "-/." and s[7] == s[4] and (s[:4] + s[5:7] + s[8:10]).isdigit():
+        digits = s[:4] + s[5:7] + s[8:10]
+    else:
+        digits = _nondigit.sub("", s)
+    if len(digits) >= 8 and _valid_ymd(digits[:8]):
+        return digits[:8]
+
+    # 2) 자릿수가 모자란 표기 ('2025-9-25' 등)
+    for fmt in ("%Y-%m-%d", "%Y/%m/%d", "%Y.%m.%d"):
+        try:
+            return datetime.strptime(s[:10], fmt).strftime("%Y%m%d")
+        except ValueError:
+            pass
+    try:
+        return datetime.fromisoformat(s.replace("Z", "+00:00")).strftime("%Y%m%d")
+    except ValueError:
+        return ""
+
+def to_yyyymmdd(val: Any) -> str:
+    """날짜 비슷한 값 → 'YYYYMMDD' (인식 못 하면 '')"""
+    if val is None:
+        return ""
+    if isinstance(val, (datetime, date)):
+        return val.strftime("%Y%m%d")
+    s = str(val).strip()
+    if not s:
+        return ""
+    return _ymd_from_str(s)
+
+@lru_cache(maxsize=4096)
+def to_date(ymd: str) -> date:
+    """'YYYYMMDD' → date (검증된 값 전제, 잘못되면 ValueError)"""
+    if len(ymd) != 8 or not ymd.isdigit() or not _valid_ymd(ymd):
+        raise ValueError(f"YYYYMMDD 형식 아님: {ymd!r}")
+    return date(int(ymd[:4]), int(ymd[4:6]), int(ymd[6:8]))
+
+def shift_ymd(ymd: str, days: int) -> str:
+    return (to_date(ymd) + timedelta(days=days)).strftime("%Y%m%d")
+
+# ---------------------------
+# KST 오늘
+# ---------------------------
+_today = ("", 0.0)  # (YYYYMMDD, 다음 KST 자정 epoch)
+
+def kst_today() -> str:
+    """KST 오늘 YYYYMMDD (자정 전까지는 다시 계산하지 않음)"""
+    global _today
+    if time.time() < _today[1]:
+        return _today[0]
+    now = datetime.now(KST)
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    _today = (now.strftime("%Y%m%d"), midnight.timestamp())
+    return _today[0]
+
+def today_or(config_value: Optional[Any]) -> str:
+    """z_config.today 값이 날짜로 읽히면 그 값, 아니면 KST 오늘"""
+    return to_yyyymmdd(config_value) or kst_today()
+
+# ---------------------------
+# 벤치마크
+# ---------------------------
+def _legacy_to_yyyymmdd(val: Any) -> str:
+    # b_* 스크립트에 있던 기존 구현 (비교용)
+    if val is None:
+        return ""
+    s = str(val).strip()
+    digits = "".join(ch for ch in s if ch.isdigit())
+    if len(digits) >= 8:
+        ymd = digits[:8]
+        try:
+            datetime.strptime(ymd, "%Y%m%d")
+            return ymd
+        except Exception:
+            pass
+    try:
+        return datetime.fromisoformat(s.replace("Z", "+00:00")).strftime("%Y%m%d")
+    except Exception:
+        return ""
+
+def _bench(n: int = 2000) -> None:
+    import random
+    import timeit
+
+    base = date(2026, 1, 2)
+    rows = [
+        {"date": (base - timedelta(days=random.randrange(15))).strftime("%Y-%m-%d"),
+         "stock_code": f"{random.randrange(999999):06d}"}
+        for _ in range(n)
+    ]
+    assert all(_legacy_to_yyyymmdd(r["date"]) == to_yyyymmdd(r["date"]) for r in rows)
+
+    def sort_legacy():
+        return sorted(rows, key=lambda x: (_legacy_to_yyyymmdd(x.get("date")), x["stock_code"]))
+
+    def sort_new():
+        return sorted(rows, key=lambda x: (to_yyyymmdd(x.get("date")), x["stock_code"]))
+
+    print(f"🧪 레코드 {n}건 정렬 키 (1회당 ms)")
+    for name, fn in (("기존 to_yyyymmdd (strptime)", sort_legacy), ("z_dates.to_yyyymmdd", sort_new)):
+        sec = min(timeit.repeat(fn, number=20, repeat=3)) / 20
+        print(f"  {name:<32} {sec * 1000:8.3f}")
+    print(f"✅ 결과 일치: {sort_legacy() == sort_new()}")
+
+if __name__ == "__main__":
+    _bench(int(sys.argv[1]) if len(sys.argv) >= 2 else 2000)
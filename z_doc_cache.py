@@ -0,0 +1,116 @@
+# z_doc_cache.py
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+BASE_DIR = Path(__file__).resolve().parent
+CACHE_FILE = BASE_DIR / "kind_doc_cache.sqlite3"
+TTL_DAYS = 14  # 이 기간이 지난 문서는 삭제
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    doc_no      TEXT PRIMARY KEY,
+    frame_url   TEXT NOT NULL,
+    stock_name  TEXT NOT NULL,
+    stock_code  TEXT NOT NULL,
+    text_z      BLOB NOT NULL,
+    fetched_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_docs_frame_url ON docs(frame_url);
+CREATE INDEX IF NOT EXISTS idx_docs_fetched_at ON docs(fetched_at);
+CREATE TABLE IF NOT EXISTS links (
+    link    TEXT PRIMARY KEY,
+    doc_no  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_links_doc_no ON links(doc_no);
+"""
+
+class DocCache:
+    """
+    KIND 공시 문서 로컬 캐시 (docNo 키, 본문은 zlib 압축).
+    RSS link → docNo 별칭도 저장해서, 아는 문서는 뷰어 요청 없이 바로 반환.
+    """
+
+    def __init__(self, path: Path = CACHE_FILE, ttl_days: float = TTL_DAYS):
+        self.path = Path(path)
+        self.ttl = ttl_days * 86400
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _row_to_result(self, row) -> Optional[Dict[str, Any]]:
+        if not row:
+            return None
+        doc_no, frame_url, stock_name, stock_code, text_z, fetched_at = row
+        if fetched_at < time.time() - self.ttl:
+            return None
+        return {
+            "doc_no": doc_no,
+            "frame_url": frame_url,
+            "text": zlib.decompress(text_z).decode("utf-8"),
+            "stock_name": stock_name,
+            "stock_code": stock_code,
+        }
+
+    def get_by_doc_no(self, doc_no: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute(
+            "SELECT doc_no, frame_url, stock_name, stock_code, text_z, fetched_at "
+            "FROM docs WHERE doc_no = ?", (doc_no,)
+        ).fetchone()
+        return self._row_to_result(row)
+
+    def get_by_link(self, link: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute(
+            "SELECT d.doc_no, d.frame_url, d.stock_name, d.stock_code, d.text_z, d.fetched_at "
+            "FROM links l JOIN docs d ON d.doc_no = l.doc_no WHERE l.link = ?", (link,)
+        ).fetchone()
+        return self._row_to_result(row)
+
+    def get_by_frame_url(self, frame_url: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute(
+            "SELECT doc_no, frame_url, stock_name, stock_code, text_z, fetched_at "
+            "FROM docs WHERE frame_url = ?", (frame_url,)
+        ).fetchone()
+        return self._row_to_result(row)
+
+    def put(self, link: str, result: Dict[str, Any]) -> None:
+        doc_no = result.get("doc_no") or ""
+        if not doc_no:
+            return
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO docs VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    doc_no,
+                    result.get("frame_url") or "",
+                    result.get("stock_name") or "",
+                    result.get("stock_code") or "",
+                    zlib.compress((result.get("text") or "").encode("utf-8"), 6),
+                    time.time(),
+                ),
+            )
+            if link:
+                self.add_link(link, doc_no, commit=False)
+
+    def add_link(self, link: str, doc_no: str, commit: bool = True) -> None:
+        self.conn.execute("INSERT OR REPLACE INTO links VALUES (?, ?)", (link, doc_no))
+        if commit:
+            self.conn.commit()
+
+    def evict_expired(self) -> int:
+        """TTL 지난 문서 + 고아 link 삭제. 삭제한 문서 수 반환"""
+        cutoff = time.time() - self.ttl
+        with self.conn:
+            n = self.conn.execute("DELETE FROM docs WHERE fetched_at < ?", (cutoff,)).rowcount
+            self.conn.execute("DELETE FROM links WHERE doc_no NOT IN (SELECT doc_no FROM docs)")
+        return n
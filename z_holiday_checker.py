@@ -1,54 +1,19 @@
-import requests
-from z_config import APP_KEY, APP_SECRET
+from z_dates import to_date, to_yyyymmdd
+from z_trading_calendar import calendar
 
+# 영업일 판별은 z_trading_calendar 로컬 달력에서 (달마다 한 번만 KIS chk-holiday 조회)
 def is_business_day(token, base_date):
-    url = "https://openapi.koreainvestment.com:9443/uapi/domestic-stock/v1/quotations/chk-holiday"
-    headers = {
-        "Content-Type": "application/json; charset=utf-8",
-        "Authorization": f"Bearer {token}",
-        "appkey": APP_KEY,
-        "appsecret": APP_SECRET,
-        "tr_id": "CTCA0903R",
-        "custtype": "P"
-    }
-    params = {
-        "BASS_DT": base_date,
-        "CTX_AREA_NK": "",
-        "CTX_AREA_FK": ""
-    }
-
     try:
-        res = requests.get(url, headers=headers, params=params)
-        res.raise_for_status()
-        data = res.json()
-        output = data.get('output', [])
-
-        if not output:
-            print("❌ 휴장일/요일 조회 실패: 응답이 비어있음")
-            return False
-
-        today_data = next((item for item in output if item.get('bass_dt') == base_date), None)
-        if not today_data:
-            print("❌ 오늘 날짜 데이터 없음")
-            return False
-
-        wday_cd = today_data.get('wday_dvsn_cd', '')
-        bzdy_yn = today_data.get('bzdy_yn', '')
+        cal = calendar()
+        cal.use_token(token)
+        is_open = cal.is_business_day(base_date)
 
-        weekday_map = {
-            "01": "일요일",
-            "02": "월요일",
-            "03": "화요일",
-            "04": "수요일",
-            "05": "목요일",
-            "06": "금요일",
-            "07": "토요일"
-        }
-        today_weekday = weekday_map.get(wday_cd, "알 수 없음")
+        weekday_map = ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"]
+        today_weekday = weekday_map[to_date(to_yyyymmdd(base_date)).weekday()]
         print(f"📅 오늘은 {today_weekday}입니다.")
-        print(f"🏦 휴장일 여부: {'영업일' if bzdy_yn == 'Y' else '휴장일'}")
+        print(f"🏦 휴장일 여부: {'영업일' if is_open else '휴장일'}")
 
-        return bzdy_yn == 'Y'
+        return is_open
     except Exception as e:
         print(f"❌ 휴장일/요일 조회 실패: {e}")
         return False
@@ -0,0 +1,137 @@
+# z_html_fast.py
+# KIND 뷰어/프레임 페이지 경량 추출 (BeautifulSoup DOM 생성 없이)
+# - 뷰어: h1.ttl 텍스트만 정규식으로 바로 추출
+# - 프레임: lxml이 설치돼 있으면 lxml(C), 없으면 표준 html.parser 스트리밍으로 본문 텍스트 추출
+# 실패하면 None/예외 → 호출 측(z_kind)에서 BeautifulSoup으로 폴백
+#
+# 마이크로 벤치마크: python z_html_fast.py 저장한_뷰어.html 저장한_프레임.htm [반복횟수]
+import re
+import sys
+import html as _html
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple
+
+try:
+    import lxml.html as _lxml_html  # 선택 의존성 (C 파서)
+except ImportError:
+    _lxml_html = None
+
+# ---------------------------
+# 뷰어 h1 → (종목명, 코드)
+# ---------------------------
+_h1_pat = re.compile(r"<h1\b([^>]*)>(.*?)</h1\s*>", re.S | re.I)
+_class_pat = re.compile(r"""class\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.I)
+_tag_pat = re.compile(r"<[^>]+>")
+_name_code_pat = re.compile(r"(.+?)\s+\(([0-9A-Za-z]+)\)")
+
+def _h1_text(inner: str) -> str:
+    # BeautifulSoup get_text(strip=True)와 같게: 문자열 조각별 strip 후 이어붙임
+    return "".join(_html.unescape(p).strip() for p in _tag_pat.split(inner))
+
+def viewer_name_code(page: str) -> Optional[Tuple[str, str]]:
+    """
+    h1.ttl.type-99.fleft (없으면 h1.ttl)에서 '종목명 (코드)' 파싱.
+    h1 자체를 못 찾으면 None (→ BeautifulSoup 폴백)
+    """
+    first_ttl = None
+    for m in _h1_pat.finditer(page):
+        cm = _class_pat.search(m.group(1))
+        classes = set((cm.group(1) or cm.group(2) or cm.group(3) or "").split()) if cm else set()
+        if "ttl" not in classes:
+            continue
+        if {"type-99", "fleft"} <= classes:
+            first_ttl = m
+            break
+        if first_ttl is None:
+            first_ttl = m
+    if first_ttl is None:
+        return None
+
+    nm = _name_code_pat.match(_h1_text(first_ttl.group(2)))
+    if not nm:
+        return "", ""
+    return (nm.group(1) or "").strip(), (nm.group(2) or "").strip()
+
+# ---------------------------
+# 프레임 본문 텍스트
+# ---------------------------
+class _TextCollector(HTMLParser):
+    """script/style 안은 건너뛰고 텍스트 노드만 모음"""
+
+    _SKIP = {"script", "style"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIP:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIP and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        s = data.strip()
+        if s:
+            self.parts.append(s)
+
+def _frame_parts_stdlib(page: str) -> List[str]:
+    p = _TextCollector()
+    p.feed(page)
+    p.close()
+    return p.parts
+
+def _frame_parts_lxml(page: str) -> List[str]:
+    root = _lxml_html.fromstring(page)
+    for el in root.xpath("//script|//style"):
+        el.drop_tree()
+    return [s.strip() for s in root.itertext() if s.strip()]
+
+def frame_text(page: str) -> str:
+    """BeautifulSoup get_text('\\n', strip=True) + 빈 줄 정리와 같은 결과"""
+    parts = _frame_parts_lxml(page) if _lxml_html is not None else _frame_parts_stdlib(page)
+    text = "\n".join(parts)
+    return re.sub(r"\n{3,}", "\n\n", text)
+
+# ---------------------------
+# 벤치마크
+# ---------------------------
+def _bench(viewer_path: str, frame_path: str, number: int = 50) -> None:
+    import timeit
+    from bs4 import BeautifulSoup
+    import z_kind
+
+    with open(viewer_path, "r", encoding="utf-8", errors="replace") as f:
+        viewer = f.read()
+    with open(frame_path, "r", encoding="utf-8", errors="replace") as f:
+        frame = f.read()
+
+    def bs_viewer():
+        return z_kind.extract_name_code_from_h1(BeautifulSoup(viewer, "html.parser"))
+
+    cases = [
+        ("viewer h1  / BeautifulSoup", bs_viewer),
+        ("viewer h1  / fast", lambda: viewer_name_code(viewer)),
+        ("frame text / BeautifulSoup", lambda: z_kind.frame_text_bs(frame)),
+        ("frame text / fast" + (" (lxml)" if _lxml_html is not None else " (html.parser)"),
+         lambda: frame_text(frame)),
+    ]
+    print(f"🧪 반복 {number}회 (1회당 ms)")
+    for name, fn in cases:
+        sec = min(timeit.repeat(fn, number=number, repeat=3)) / number
+        print(f"  {name:<40} {sec * 1000:8.3f}")
+
+    same_h1 = bs_viewer() == (viewer_name_code(viewer) or ("", ""))
+    same_text = z_kind.frame_text_bs(frame) == frame_text(frame)
+    print(f"✅ 결과 일치: h1={same_h1}, text={same_text}")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("사용법: python z_html_fast.py 뷰어.html 프레임.htm [반복횟수]")
+        sys.exit(1)
+    _bench(sys.argv[1], sys.argv[2], int(sys.argv[3]) if len(sys.argv) >= 4 else 50)
@@ -0,0 +1,380 @@
+# z_kind.py
+import re
+import os
+import asyncio
+import contextlib
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from requests.compat import chardet
+from bs4 import BeautifulSoup
+
+import z_html_fast
+import z_stock_master
+from z_doc_cache import DocCache
+
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+API_URL = "https://kind.krx.co.kr/common/disclsviewer.do"
+
+# 비동기 수집 기본값 (동시 문서 수 / 호스트당 동시 요청 / 호스트당 요청 간격(초))
+FETCH_CONCURRENCY = 8
+PER_HOST_CONCURRENCY = 4
+PER_HOST_INTERVAL = 0.1
+
+# 프레임 디코딩/본문 추출/본문 분류(CPU)를 프로세스 풀에서 돌리는 기준 문서 수 (적으면 그 자리에서)
+PARSE_POOL_MIN = 20
+PARSE_WORKERS = os.cpu_count() or 1
+
+# ---------------------------
+# 시장 구분 + 접두사 제거
+# ---------------------------
+_market_pat = re.compile(r"^\s*\[(유|코)\]")
+
+def parse_market_class(title: str):
+    m = _market_pat.match(title)
+    if not m:
+        return None
+    return "코스피" if m.group(1) == "유" else "코스닥"
+
+def clean_title(title: str) -> str:
+    return re.sub(r"^\s*\[(유|코)\]\s*", "", title).strip()
+
+# ---------------------------
+# 제목 + 종목 마스터로 종목명/코드 (뷰어 페이지 생략용)
+# ---------------------------
+def resolve_stock_from_title(title: str) -> Optional[Tuple[str, str]]:
+    """
+    제목 맨 앞 회사명(1~3토큰)을 종목 마스터(z_stock_master)에서 찾아 (종목명, 코드).
+    [유]/[코] 접두사로 시장을 제한하고, 후보가 정확히 1개일 때만 반환.
+    없거나 애매하면 None → 뷰어 페이지 h1로 확인
+    """
+    market = parse_market_class(title)
+    tokens = clean_title(title).split()
+    if not market or not tokens:
+        return None
+    try:
+        master = z_stock_master.load_master()
+    except Exception as ex:
+        print(f"⚠️ 종목 마스터 로드 실패(뷰어 페이지 사용): {ex}")
+        return None
+
+    found: Dict[str, str] = {}
+    for n in range(1, min(len(tokens), 3) + 1):
+        cand = " ".join(tokens[:n])
+        for code in master.codes_for_name(cand, market) or master.codes_for_normalized(cand, market):
+            found[code] = master.name_of(code)
+    if len(found) != 1:
+        return None
+    code, name = found.popitem()
+    return name, code
+
+# ---------------------------
+# 폴백 유틸
+# ---------------------------
+def guess_name_from_title(title: str) -> str:
+    """
+    제목에서 '회사명 ...' 형태로 첫 토큰을 종목명으로 추정
+    """
+    t = clean_title(title)
+    if not t:
+        return ""
+    # 보통 회사명이 맨 앞
+    return t.split()[0].strip()
+
+def extract_code_from_viewer_html(html: str) -> str:
+    """
+    KIND 뷰어 페이지 소스에서 종목코드 후보를 추출.
+    (repIsuSrtCd / isuSrtCd / isuCd 등)
+    """
+    patterns = [
+        r'(repIsuSrtCd|isuSrtCd|isuCd)\s*=\s*[\'"]([0-9A-Za-z]+)[\'"]',
+        r'name=["\'](repIsuSrtCd|isuSrtCd|isuCd)["\']\s+value=["\']([0-9A-Za-z]+)["\']',
+        r'id=["\'](repIsuSrtCd|isuSrtCd|isuCd)["\']\s+value=["\']([0-9A-Za-z]+)["\']',
+    ]
+    for pat in patterns:
+        m = re.search(pat, html)
+        if m:
+            return (m.group(2) or "").strip()
+    return ""
+
+def extract_name_code_from_h1(soup: BeautifulSoup) -> tuple[str, str]:
+    """
+    뷰어 상단 h1에서 '종목명 (코드)' 형태 파싱.
+    class 매칭은 select_one로 (순서/추가클래스 변화에 강함)
+    """
+    h1 = soup.select_one("h1.ttl.type-99.fleft")
+    if not h1:
+        # 혹시 클래스가 살짝 다르면, ttl만이라도 시도
+        h1 = soup.select_one("h1.ttl")
+    if not h1:
+        return "", ""
+
+    text = h1.get_text(strip=True)
+    m = re.match(r"(.+?)\s+\(([0-9A-Za-z]+)\)", text)
+    if not m:
+        return "", ""
+    return (m.group(1) or "").strip(), (m.group(2) or "").strip()
+
+# ---------------------------
+# 단계별 파싱 (뷰어 → 내부 API → 프레임)
+# ---------------------------
+def parse_viewer(html: str, fallback_title: str = "") -> Tuple[str, str, str]:
+    """뷰어 HTML → (종목명, 종목코드, docNo)"""
+    # (A) 1차: h1에서 종목명/코드 (정규식 fast path → 못 찾으면 BeautifulSoup)
+    fast = z_html_fast.viewer_name_code(html)
+    if fast is not None:
+        stock_name, stock_code = fast
+    else:
+        stock_name, stock_code = extract_name_code_from_h1(BeautifulSoup(html, "html.parser"))
+
+    # (B) 2차: 뷰어 HTML 소스에서 코드 폴백
+    if not stock_code:
+        stock_code = extract_code_from_viewer_html(html)
+
+    # (C) 3차: RSS 제목에서 종목명 폴백
+    if not stock_name and fallback_title:
+        stock_name = guess_name_from_title(fallback_title)
+
+    # (D) 4차: 제목에 '회사명 (CODE)'가 박혀있다면 거기서도 폴백(영숫자)
+    if fallback_title and (not stock_name or not stock_code):
+        t = clean_title(fallback_title)
+        m = re.match(r"(.+?)\s+\(([0-9A-Za-z]+)\)", t)
+        if m:
+            if not stock_name:
+                stock_name = (m.group(1) or "").strip()
+            if not stock_code:
+                stock_code = (m.group(2) or "").strip()
+
+    # docNo 추출
+    m = re.search(r"value=['\"](\d{14})\|[YN]['\"]", html)
+    if not m:
+        raise ValueError("docNo를 찾지 못했어요.")
+    return stock_name, stock_code, m.group(1)
+
+def parse_frame_url(html: str) -> str:
+    """내부 API 응답 → 프레임소스 URL"""
+    m2 = re.search(r'(/external/[^"\']+\.htm)', html)
+    if not m2:
+        raise ValueError("docLocPath를 찾지 못했어요.")
+    return urljoin(API_URL, m2.group(1))
+
+def decode_content(content: bytes, encoding: Optional[str]) -> str:
+    """응답 바이트 → 문자열 (헤더 인코딩이 없거나 기본값이면 내용으로 추정)"""
+    if not encoding or encoding.lower() in ("iso-8859-1", "us-ascii"):
+        encoding = (chardet.detect(content) or {}).get("encoding") or "utf-8"
+    try:
+        return str(content, encoding, errors="replace")
+    except LookupError:
+        return str(content, "utf-8", errors="replace")
+
+def decode_frame(r: requests.Response) -> str:
+    return decode_content(r.content, r.encoding)
+
+def frame_text(html: str) -> str:
+    """프레임소스 HTML → 본문 텍스트 (경량 파서, 실패 시 BeautifulSoup)"""
+    try:
+        return z_html_fast.frame_text(html)
+    except Exception:
+        return frame_text_bs(html)
+
+def frame_text_bs(html: str) -> str:
+    """프레임소스 HTML → 본문 텍스트 (BeautifulSoup 폴백)"""
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style"]):
+        tag.decompose()
+    text = soup.get_text("\n", strip=True)
+    return re.sub(r"\n{3,}", "\n\n", text)
+
+# ---------------------------
+# CPU 단계 (프로세스 풀 워커에서 실행 — 최상위 함수만 넘김)
+# ---------------------------
+def classifier_key(fn: Callable) -> str:
+    return f"{fn.__module__}.{fn.__qualname__}"
+
+def parse_frame(
+    content: bytes,
+    encoding: Optional[str],
+    classifiers: Tuple[Callable[[str], List[str]], ...] = (),
+) -> Tuple[str, Dict[str, List[str]]]:
+    """프레임 응답 바이트 → (본문 텍스트, {classifier_key: 분류})"""
+    text = frame_text(decode_content(content, encoding))
+    return text, {classifier_key(fn): fn(text) for fn in classifiers}
+
+# ---------------------------
+# 본문 + 종목명/코드 추출 (동기, 1건)
+# ---------------------------
+def extract_text_from_rss(rss_url: str, fallback_title: str = "") -> dict:
+    with requests.Session() as s:
+        # 1) 뷰어 페이지 → 종목명/코드 + docNo
+        r = s.get(rss_url, headers=HEADERS, timeout=10)
+        r.raise_for_status()
+        stock_name, stock_code, doc_no = parse_viewer(r.text, fallback_title)
+
+        # 2) 내부 API → 프레임소스 경로
+        r2 = s.get(API_URL, headers=HEADERS,
+                   params={"method": "searchContents", "docNo": doc_no},
+                   timeout=10)
+        r2.raise_for_status()
+        frame_url = parse_frame_url(r2.text)
+
+        # 3) 프레임소스 HTML
+        r3 = s.get(frame_url, headers=HEADERS, timeout=10)
+        r3.raise_for_status()
+
+        return {
+            "doc_no": doc_no,
+            "frame_url": frame_url,
+            "text": frame_text(decode_frame(r3)),
+            "stock_name": stock_name,
+            "stock_code": stock_code,
+        }
+
+# ---------------------------
+# 비동기 수집 엔진 (여러 건 동시, 호스트별 예의)
+# ---------------------------
+class _HostGate:
+    """호스트별 동시 요청 수 제한 + 최소 요청 간격 보장"""
+
+    def __init__(self, per_host: int, interval: float):
+        self.per_host = max(1, per_host)
+        self.interval = max(0.0, interval)
+        self._sems: Dict[str, asyncio.Semaphore] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._last: Dict[str, float] = {}
+
+    @contextlib.asynccontextmanager
+    async def slot(self, host: str):
+        sem = self._sems.setdefault(host, asyncio.Semaphore(self.per_host))
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with sem:
+            async with lock:
+                wait = self._last.get(host, 0.0) + self.interval - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._last[host] = time.monotonic()
+            yield
+
+async def _get(pool, gate: _HostGate, s: requests.Session, url: str, **kwargs) -> requests.Response:
+    loop = asyncio.get_running_loop()
+    async with gate.slot(urlsplit(url).hostname or ""):
+        r = await loop.run_in_executor(
+            pool, lambda: s.get(url, headers=HEADERS, timeout=10, **kwargs)
+        )
+    r.raise_for_status()
+    return r
+
+async def _fetch_one(pool, gate: _HostGate, sem: asyncio.Semaphore, link: str, title: str,
+                     cache: Optional[DocCache], need_text: bool = True,
+                     cpu_pool: Optional[Executor] = None,
+                     classifiers: Tuple[Callable[[str], List[str]], ...] = ()) -> dict:
+    # 0) 캐시: 이미 본 link면 네트워크 요청 없음
+    if cache:
+        hit = cache.get_by_link(link)
+        if hit:
+            return hit
+
+    # 본문이 필요 없으면 제목 + 종목 마스터로 끝 (애매할 때만 뷰어 페이지)
+    if not need_text:
+        resolved = resolve_stock_from_title(title)
+        if resolved:
+            return {"doc_no": "", "frame_url": "", "text": "",
+                    "stock_name": resolved[0], "stock_code": resolved[1]}
+
+    # 1) 네트워크 단계 (I/O 스레드 풀)
+    async with sem:
+        with requests.Session() as s:
+            r = await _get(pool, gate, s, link)
+            stock_name, stock_code, doc_no = parse_viewer(r.text, title)
+            if not need_text:
+                return {"doc_no": doc_no, "frame_url": "", "text": "",
+                        "stock_name": stock_name, "stock_code": stock_code}
+
+            # 뷰어에서 얻은 docNo가 캐시에 있으면 나머지 2단계 생략
+            if cache:
+                hit = cache.get_by_doc_no(doc_no)
+                if hit:
+                    cache.add_link(link, doc_no)
+                    return hit
+
+            r2 = await _get(pool, gate, s, API_URL,
+                            params={"method": "searchContents", "docNo": doc_no})
+            frame_url = parse_frame_url(r2.text)
+
+            r3 = await _get(pool, gate, s, frame_url)
+            content, encoding = r3.content, r3.encoding
+
+    # 2) CPU 단계 (디코딩 + 본문 추출 + 본문 분류): 프로세스 풀이 있으면 거기서
+    if cpu_pool is not None:
+        loop = asyncio.get_running_loop()
+        text, classified = await loop.run_in_executor(cpu_pool, parse_frame, content, encoding, classifiers)
+    else:
+        text, classified = parse_frame(content, encoding, classifiers)
+
+    result = {
+        "doc_no": doc_no,
+        "frame_url": frame_url,
+        "text": text,
+        "stock_name": stock_name,
+        "stock_code": stock_code,
+    }
+    if cache:
+        cache.put(link, result)
+    if classified:
+        result["classified"] = classified
+    return result
+
+async def fetch_documents(
+    items: Iterable[Tuple[str, str]],
+    concurrency: int = FETCH_CONCURRENCY,
+    per_host: int = PER_HOST_CONCURRENCY,
+    interval: float = PER_HOST_INTERVAL,
+    use_cache: bool = True,
+    need_text: bool = True,
+    cpu_pool: Optional[Executor] = None,
+    classifiers: Iterable[Callable[[str], List[str]]] = (),
+) -> Dict[str, Any]:
+    """
+    (link, 제목) 목록의 3단계 요청(뷰어 → 내부 API → 프레임)을 문서별로 동시에 진행.
+    use_cache면 z_doc_cache에 있는 문서는 요청 없이 반환하고, 새 문서는 저장.
+    need_text=False면 종목명/코드만: 제목 + 종목 마스터로 해결되면 요청 없음,
+    애매한 것만 뷰어 페이지 1회 (본문/frame_url은 빈 값, 캐시에 저장 안 함)
+    CPU 단계(디코딩/본문 추출/classifiers 본문 분류)는 cpu_pool에서 실행.
+    cpu_pool이 없고 문서가 PARSE_POOL_MIN건 이상이면 이번 호출용 프로세스 풀을 만듦.
+    classifiers 결과는 result["classified"][classifier_key(fn)] (캐시 적중분에는 없음)
+    반환: link → 결과 dict (실패 시 Exception 객체)
+    """
+    by_link: Dict[str, str] = {}
+    for link, title in items:
+        by_link.setdefault(link, title)
+    items = list(by_link.items())
+    if not items:
+        return {}
+    classifiers = tuple(classifiers)
+    sem = asyncio.Semaphore(max(1, concurrency))
+    gate = _HostGate(per_host, interval)
+    cache = DocCache() if use_cache else None
+    own_pool = None
+    if cpu_pool is None and need_text and len(items) >= PARSE_POOL_MIN and PARSE_WORKERS > 1:
+        cpu_pool = own_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+    try:
+        if cache:
+            cache.evict_expired()
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            results = await asyncio.gather(
+                *(_fetch_one(pool, gate, sem, link, title, cache, need_text, cpu_pool, classifiers)
+                  for link, title in items),
+                return_exceptions=True,
+            )
+    finally:
+        if cache:
+            cache.close()
+        if own_pool is not None:
+            own_pool.shutdown()
+    return {link: res for (link, _), res in zip(items, results)}
+
+def fetch_documents_sync(items: Iterable[Tuple[str, str]], **kwargs) -> Dict[str, Any]:
+    """이벤트 루프가 없는 곳(단독 실행 스크립트)용 래퍼"""
+    return asyncio.run(fetch_documents(items, **kwargs))
@@ -0,0 +1,171 @@
+# z_kind_search.py
+# KIND 상세검색(공시 제목 + 기간)으로 공시 목록 수집 — RSS "오늘의 공시" 대신 쓰는 백엔드
+# - 유형(수집기 SEARCH_TERMS)별로 하루치를 한 번에 조회, 결과 표를 페이지 단위로 파싱
+# - 결과는 RSS 엔트리와 같은 모양(title "[유]회사명 공시제목", link 뷰어 URL)이라
+#   a_*_notices.process_entries()에 그대로 넘기면 기존과 같은 레코드로 저장됨
+# - notice_date(공시일)가 들어 있어 과거 날짜도 같은 결과로 다시 적재 가능
+#
+# 사용: python z_kind_search.py 20260113   (해당 날짜 재적재)
+import re
+import sys
+import asyncio
+import html as _html
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+from z_kind import HEADERS
+from z_notice_collector import load_collectors, dispatch_entries
+
+SEARCH_URL = "https://kind.krx.co.kr/disclosure/details.do"
+VIEWER_URL = "http://kind.krx.co.kr:80/common/disclsviewer.do?method=searchInitInfo&acptNo={acpt_no}&docno="
+SEARCH_PAGE_SIZE = 100
+MAX_SEARCH_PAGES = 50
+
+# 결과 표의 시장 아이콘(alt / 파일명) → RSS 접두사
+_MARKET_PREFIX = {"유가증권": "유", "icn_t_yu": "유", "코스닥": "코", "icn_t_ko": "코"}
+_row_pat = re.compile(r"<tr\b[^>]*>(.*?)</tr\s*>", re.S | re.I)
+_td_pat = re.compile(r"<td\b[^>]*>(.*?)</td\s*>", re.S | re.I)
+_img_pat = re.compile(r"<img\b[^>]*>", re.I)
+_viewer_a_pat = re.compile(r"<a\b([^>]*openDisclsViewer\(\s*'(\d{14})'[^>]*)>(.*?)</a\s*>", re.S | re.I)
+_title_attr_pat = re.compile(r"""title\s*=\s*(?:"([^"]*)"|'([^']*)')""", re.I)
+_tag_pat = re.compile(r"<[^>]+>")
+_datetime_pat = re.compile(r"(\d{4})-(\d{2})-(\d{2})(?:\s+(\d{2}:\d{2}))?")
+
+class SearchEntry(dict):
+    """검색 결과 1건 (feedparser 엔트리처럼 e.title / e.get('id')로 사용)"""
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+def _dashed(ymd: str) -> str:
+    return datetime.strptime(ymd, "%Y%m%d").strftime("%Y-%m-%d")
+
+def _text(fragment: str) -> str:
+    return " ".join(_html.unescape(_tag_pat.sub(" ", fragment)).split())
+
+def _market_prefix(td: str) -> Optional[str]:
+    for img in _img_pat.findall(td):
+        for label, prefix in _MARKET_PREFIX.items():
+            if label in img:
+                return prefix
+    return None
+
+def parse_search_page(page: str) -> List[SearchEntry]:
+    """
+    상세검색 결과 표 → SearchEntry 목록.
+    열: 번호 | 시간 | 회사명(시장 아이콘) | 공시제목(openDisclsViewer) | 제출인
+    시장 구분이 없는 행(코넥스 등)은 RSS와 같이 제외
+    """
+    return parse_search_rows(page)[0]
+
+def parse_search_rows(page: str) -> Tuple[List[SearchEntry], int]:
+    """parse_search_page + 제외 전 결과 행 수 (페이지 끝 판단용 — 코넥스 등을 뺀 건수로 판단하면 안 됨)"""
+    out, raw = [], 0
+    for row in _row_pat.finditer(page):
+        tds = _td_pat.findall(row.group(1))
+        if len(tds) < 4:
+            continue
+        raw += 1
+        a = _viewer_a_pat.search(tds[3])
+        prefix = _market_prefix(tds[2])
+        dm = _datetime_pat.search(_text(tds[1]))
+        if not a or not prefix or not dm:
+            continue
+        tm = _title_attr_pat.search(a.group(1))
+        report = _html.unescape(tm.group(1) or tm.group(2)).strip() if tm else _text(a.group(3))
+        notice_date = f"{dm.group(1)}-{dm.group(2)}-{dm.group(3)}"
+        link = VIEWER_URL.format(acpt_no=a.group(2))
+        out.append(SearchEntry(
+            id=link,
+            link=link,
+            title=f"[{prefix}]{_text(tds[2])} {report}",
+            notice_date=notice_date,
+            published=f"{notice_date} {dm.group(4) or ''}".strip(),
+        ))
+    return out, raw
+
+def search_disclosures(
+    from_ymd: str,
+    to_ymd: str,
+    report_name: str,
+    session: Optional[requests.Session] = None,
+    page_size: int = SEARCH_PAGE_SIZE,
+    max_pages: int = MAX_SEARCH_PAGES,
+) -> List[SearchEntry]:
+    """기간(YYYYMMDD) + 공시 제목 검색어로 전체 페이지 조회"""
+    own = session is None
+    s = session or requests.Session()
+    try:
+        entries: List[SearchEntry] = []
+        for page in range(1, max_pages + 1):
+            r = s.post(SEARCH_URL, headers=HEADERS, timeout=15, data={
+                "method": "searchDetailsSub",
+                "currentPageSize": page_size,
+                "pageIndex": page,
+                "orderMode": "1",
+                "orderStat": "D",
+                "forward": "details_sub",
+                "fromDate": _dashed(from_ymd),
+                "toDate": _dashed(to_ymd),
+                "reportNm": report_name,
+            })
+            r.raise_for_status()
+            rows, raw = parse_search_rows(r.text)
+            entries.extend(rows)
+            if raw < page_size:
+                break
+        else:
+            print(f"⚠️ 공시 검색 {max_pages}페이지 도달 — 이후 결과는 누락됐을 수 있음: {report_name} {from_ymd}~{to_ymd}")
+        return entries
+    finally:
+        if own:
+            s.close()
+
+def search_entries(ymd: str, terms: Iterable[str], session: Optional[requests.Session] = None) -> List[SearchEntry]:
+    """하루치(ymd)를 검색어별로 1회씩 조회해 link 기준 중복 제거"""
+    by_link: Dict[str, SearchEntry] = {}
+    for term in dict.fromkeys(terms):
+        for e in search_disclosures(ymd, ymd, term, session=session):
+            by_link.setdefault(e.link, e)
+    return list(by_link.values())
+
+def collector_terms(modules: Iterable[Any]) -> List[str]:
+    """수집기들의 SEARCH_TERMS 합집합 (순서 유지)"""
+    terms: List[str] = []
+    for mod in modules:
+        terms.extend(getattr(mod, "SEARCH_TERMS", []))
+    return list(dict.fromkeys(terms))
+
+# ---------------------------
+# 날짜 1개 적재
+# ---------------------------
+COLLECTORS = [
+    "a_caution_notices.py",
+    "a_overheating_notices.py",
+    "a_waring_notices.py",
+    "a_danger_notices.py",
+    "a_suspend_notices.py",
+]
+
+async def ingest_day(ymd: str, modules: Optional[List[Any]] = None, **fetch_kwargs) -> Tuple[int, List[Any]]:
+    """
+    ymd 하루치를 검색 백엔드로 받아 각 수집기 분류/저장 경로로 적재.
+    반환: (저장 건수, 실패 엔트리 — 수집기 예외 또는 문서 요청 실패로 저장하지 못한 것)
+    modules: load_collectors() 결과 (없으면 COLLECTORS 전부)
+    """
+    modules = modules if modules is not None else load_collectors(COLLECTORS)
+    entries = await asyncio.to_thread(search_entries, ymd, collector_terms(mod for _, mod in modules))
+    print(f"🔎 {ymd} 공시 검색: {len(entries)}건")
+    return await dispatch_entries(entries, modules, store_failed_fetch=False, **fetch_kwargs)
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("사용법: python z_kind_search.py YYYYMMDD")
+        sys.exit(1)
+    saved, failed = asyncio.run(ingest_day(sys.argv[1]))
+    print(f"✅ 저장 {saved}건" + (f" / 실패 {len(failed)}건" if failed else ""))
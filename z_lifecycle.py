@@ -0,0 +1,516 @@
+# z_lifecycle.py
+# 종목별 지정 단계(라이프사이클) 추적: 공시 DB(z_notice_db)의 새 공시만 읽어 종목별 현재 단계를 갱신
+#   투자주의 → 단기과열 예고/지정 → 투자경고 예고/지정 → 투자위험 예고/지정 → 거래정지 → 해제
+# - 현재 단계(stock_states)는 종목코드 PK + 단계 인덱스 → "지금 투자경고인 종목과 기간"이 바로 조회됨
+# - 단계 전이 이력(stock_transitions)은 공시 id와 함께 기록
+# - 처리한 마지막 공시 id를 커서로 저장 → 매 실행마다 새 공시만 적용 (다섯 개 JSON 재스캔 없음)
+# - 과거 공시(백필)가 늦게 들어오면 그 종목만 처음부터 다시 적용
+#
+# 사용: python z_lifecycle.py                 (단계별 종목 수)
+#       python z_lifecycle.py 투자경고         (해당 단계 종목 + 머문 기간)
+#       python z_lifecycle.py --code=005930    (종목 이력)
+#       python z_lifecycle.py --rebuild        (전체 다시 적용)
+import sys
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import z_notice_db
+import z_trading_calendar
+from z_dates import kst_today, shift_ymd, to_date
+
+RELEASED = "해제"
+
+# 단계 → (순위, 유지 거래일 수). 유지 기간이 있는 단계는 공시일 다음 거래일부터 그만큼 지나면
+# 아래 지정 단계(없으면 해제)로 돌아감 (KRX 기준 거래일, z_trading_calendar)
+STAGES: Dict[str, Tuple[int, Optional[int]]] = {
+    RELEASED:            (0, None),
+    "투자주의":           (1, 1),
+    "단기과열예고":        (2, 10),
+    "단기과열":           (3, 3),     # 3거래일 단일가매매
+    "투자경고예고":        (4, 10),
+    "투자경고재지정예고":   (4, 10),
+    "투자경고":           (5, None),
+    "투자위험예고":        (6, 10),
+    "투자위험":           (7, None),
+    "거래정지예고":        (8, 1),
+    "거래정지":           (9, 1),     # 1일 정지 후 재개
+}
+
+EXPIRY_RULE = "trading_days"  # 저장된 만료일이 이 규칙으로 계산됐는지 (다르면 advance가 전체 다시 적용)
+WEEKDAY_RULE = "weekdays"     # 달력을 못 써서 평일 기준으로 계산한 만료일이 섞였음 (다음 정상 실행 때 다시 적용)
+
+# 예고/정지처럼 지정 위에 잠깐 얹히는 단계가 아닌, 지정 자체 (지정 중에는 아래로 안 내려감)
+DESIGNATIONS = {"단기과열", "투자경고", "투자위험"}
+
+# 해제 공시 → 해제 후 단계 (투자위험 해제는 투자경고로 재지정, 투자경고 해제는 재지정 예고 기간)
+RELEASES = {
+    ("투자경고", "지정해제 및 재지정 예고"): "투자경고재지정예고",
+    ("투자위험", "투위해제"): "투자경고",
+}
+
+# (공시 유형, 분류) → 단계
+CATEGORY_STAGES: Dict[Tuple[str, str], str] = {
+    ("단기과열", "단기과열 지정예고"): "단기과열예고",
+    ("단기과열", "단기과열 지정"): "단기과열",
+    ("투자경고", "초단기예고"): "투자경고예고",
+    ("투자경고", "단기예고"): "투자경고예고",
+    ("투자경고", "단기불건전예고"): "투자경고예고",
+    ("투자경고", "장기예고"): "투자경고예고",
+    ("투자경고", "초장기불건전예고"): "투자경고예고",
+    ("투자경고", "재지정"): "투자경고",
+    ("투자경고", "지정"): "투자경고",
+    ("투자위험", "투위예고"): "투자위험예고",
+    ("투자위험", "투위지정"): "투자위험",
+    ("거래정지", "정지예고"): "거래정지예고",
+    ("거래정지", "투경정지"): "거래정지",
+    ("거래정지", "투위최초정지"): "거래정지",
+    ("거래정지", "투위중정지"): "거래정지",
+}
+
+# 분류가 비어 있을 때(본문 규칙 미적중 등) 제목에 '예고'가 있으면 쓰는 유형별 단계
+TYPE_NOTICE_STAGES = {
+    "투자주의": "투자주의",
+    "단기과열": "단기과열예고",
+    "투자경고": "투자경고예고",
+    "투자위험": "투자위험예고",
+    "거래정지": "거래정지예고",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stock_states (
+    stock_code           TEXT PRIMARY KEY,
+    stock_name           TEXT NOT NULL DEFAULT '',
+    state                TEXT NOT NULL,
+    since_ymd            TEXT NOT NULL,
+    expires_ymd          TEXT NOT NULL DEFAULT '',
+    designation          TEXT NOT NULL DEFAULT '',
+    designation_since    TEXT NOT NULL DEFAULT '',
+    designation_expires  TEXT NOT NULL DEFAULT '',
+    last_ymd             TEXT NOT NULL,
+    last_notice_id       INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_stock_states_state ON stock_states(state, since_ymd);
+CREATE INDEX IF NOT EXISTS idx_stock_states_expires ON stock_states(expires_ymd);
+CREATE INDEX IF NOT EXISTS idx_stock_states_designation_expires ON stock_states(designation_expires);
+CREATE TABLE IF NOT EXISTS stock_transitions (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    stock_code   TEXT NOT NULL,
+    ymd          TEXT NOT NULL,
+    from_state   TEXT NOT NULL,
+    to_state     TEXT NOT NULL,
+    notice_type  TEXT NOT NULL DEFAULT '',
+    category     TEXT NOT NULL DEFAULT '',
+    notice_id    INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_stock_transitions_code ON stock_transitions(stock_code, ymd);
+CREATE TABLE IF NOT EXISTS lifecycle_meta (
+    key    TEXT PRIMARY KEY,
+    value  TEXT NOT NULL
+);
+"""
+
+_STATE_COLUMNS = [
+    "stock_code", "stock_name", "state", "since_ymd", "expires_ymd",
+    "designation", "designation_since", "designation_expires", "last_ymd", "last_notice_id",
+]
+
+def connect(path: Path = z_notice_db.DB_FILE) -> sqlite3.Connection:
+    conn = z_notice_db.connect(path)
+    conn.executescript(_SCHEMA)
+    return conn
+
+# ---------------------------
+# 거래일 (KRX 달력, 못 쓰면 평일 기준)
+# ---------------------------
+_calendar_ok = True
+_weekday_fallback = False  # 이번 적용 중 평일 기준으로 만료일을 계산했는지
+
+def _reset_calendar() -> None:
+    """적용(advance/replay_stocks)마다 달력을 다시 시도"""
+    global _calendar_ok, _weekday_fallback
+    _calendar_ok, _weekday_fallback = True, False
+
+def _calendar(fn, *args):
+    """z_trading_calendar 호출. 한 번 실패하면 이번 적용 동안은 평일 기준으로만 계산"""
+    global _calendar_ok
+    if _calendar_ok:
+        try:
+            return fn(*args)
+        except Exception as e:
+            _calendar_ok = False
+            print(f"⚠️ 영업일 달력 사용 불가 → 평일 기준으로 계산: {e}")
+    return None
+
+def business_days_after(ymd: str, n: int) -> str:
+    """ymd 다음부터 세어 n번째 거래일"""
+    global _weekday_fallback
+    found = _calendar(z_trading_calendar.business_days_ahead, ymd, n)
+    if found:
+        return found
+    _weekday_fallback = True
+    d = ymd
+    while n > 0:
+        d = shift_ymd(d, 1)
+        if to_date(d).weekday() < 5:
+            n -= 1
+    return d
+
+def business_days_since(since: str, today: str) -> int:
+    """since 다음 날부터 today까지 지난 거래일 수 (since 당일 = 0)"""
+    start = shift_ymd(since, 1)
+    counted = _calendar(z_trading_calendar.count_business_days, start, today)
+    if counted is not None:
+        return counted
+    n, d = 0, start
+    while d <= today:
+        n += to_date(d).weekday() < 5
+        d = shift_ymd(d, 1)
+    return n
+
+# ---------------------------
+# 공시 → 단계
+# ---------------------------
+def _rank(stage: str) -> int:
+    return STAGES.get(stage, (0, None))[0]
+
+def _expiry(stage: str, ymd: str) -> str:
+    ttl = STAGES[stage][1]
+    return business_days_after(ymd, ttl) if ttl else ""
+
+def notice_stage(notice_type: str, categories: Iterable[str], title: str = "") -> Optional[Tuple[str, str, bool]]:
+    """공시 1건 → (단계, 근거 분류, 해제 여부). 단계와 무관한 공시면 None"""
+    cats = [str(c).strip() for c in categories or []]
+    for c in cats:
+        if (notice_type, c) in RELEASES:
+            return RELEASES[(notice_type, c)], c, True
+    if notice_type == "투자주의":
+        return "투자주의", (cats[0] if cats else ""), False
+    hits = [(CATEGORY_STAGES[(notice_type, c)], c) for c in cats if (notice_type, c) in CATEGORY_STAGES]
+    if hits:
+        stage, cat = max(hits, key=lambda h: _rank(h[0]))
+        return stage, cat, False
+    if "예고" in title and notice_type in TYPE_NOTICE_STAGES:
+        return TYPE_NOTICE_STAGES[notice_type], "", False
+    return None
+
+# ---------------------------
+# 상태 전이 (종목 레코드 dict를 제자리 수정, 바뀐 전이 목록 반환)
+# ---------------------------
+def _new_record(code: str, name: str) -> Dict[str, Any]:
+    return {
+        "stock_code": code, "stock_name": name, "state": RELEASED, "since_ymd": "", "expires_ymd": "",
+        "designation": "", "designation_since": "", "designation_expires": "",
+        "last_ymd": "", "last_notice_id": 0,
+    }
+
+def _move(rec: Dict[str, Any], to_state: str, since: str, expires: str, out: List[tuple],
+          ymd: str, notice_type: str = "", category: str = "", notice_id: Optional[int] = None) -> None:
+    if rec["state"] != to_state:
+        out.append((rec["stock_code"], ymd, rec["state"], to_state, notice_type, category, notice_id))
+        rec["state"], rec["since_ymd"] = to_state, since
+    rec["expires_ymd"] = expires
+
+def lapse(rec: Dict[str, Any], ymd: str, out: List[tuple]) -> None:
+    """ymd 시점까지 유지 기간이 끝난 단계 정리 (지정 만료 → 해제, 예고/정지 만료 → 지정 단계)"""
+    if rec["designation_expires"] and rec["designation_expires"] < ymd:
+        ended = rec["designation_expires"]
+        rec["designation"], rec["designation_since"], rec["designation_expires"] = "", "", ""
+        if rec["state"] in DESIGNATIONS:
+            _move(rec, RELEASED, shift_ymd(ended, 1), "", out, shift_ymd(ended, 1))
+    if rec["expires_ymd"] and rec["expires_ymd"] < ymd:
+        back = shift_ymd(rec["expires_ymd"], 1)
+        if rec["designation"]:
+            _move(rec, rec["designation"], rec["designation_since"], rec["designation_expires"], out, back)
+        else:
+            _move(rec, RELEASED, back, "", out, back)
+
+def apply_notice(rec: Dict[str, Any], notice: Dict[str, Any], out: List[tuple]) -> None:
+    """공시 1건 적용 (notice: id, notice_type, ymd, title, categories, stock_name)"""
+    ymd = notice["ymd"]
+    lapse(rec, ymd, out)
+    rec["last_ymd"] = max(rec["last_ymd"], ymd)
+    rec["last_notice_id"] = max(rec["last_notice_id"], notice["id"])
+    if notice.get("stock_name"):
+        rec["stock_name"] = notice["stock_name"]
+
+    hit = notice_stage(notice["notice_type"], notice["categories"], notice.get("title", ""))
+    if not hit:
+        return
+    stage, category, release = hit
+    ctx = dict(ymd=ymd, notice_type=notice["notice_type"], category=category, notice_id=notice["id"])
+
+    if release:
+        # 해제 공시: 지정을 바꾸고 현재 단계도 그대로 따라감
+        if stage in DESIGNATIONS:
+            rec["designation"], rec["designation_since"], rec["designation_expires"] = stage, ymd, _expiry(stage, ymd)
+        else:
+            rec["designation"], rec["designation_since"], rec["designation_expires"] = "", "", ""
+        _move(rec, stage, ymd, _expiry(stage, ymd), out, **ctx)
+        return
+
+    if stage in DESIGNATIONS:
+        if _rank(stage) < _rank(rec["designation"]):
+            return
+        if rec["designation"] != stage:
+            rec["designation"], rec["designation_since"] = stage, ymd
+        rec["designation_expires"] = _expiry(stage, ymd)
+        if _rank(stage) >= _rank(rec["state"]) or rec["state"] == stage:
+            _move(rec, stage, rec["designation_since"], rec["designation_expires"], out, **ctx)
+        return
+
+    # 예고/주의/정지: 현재 단계보다 높을 때만 얹음 (같은 단계면 유지 기간만 연장)
+    if rec["state"] == stage:
+        rec["expires_ymd"] = max(rec["expires_ymd"], _expiry(stage, ymd))
+    elif _rank(stage) > _rank(rec["state"]):
+        _move(rec, stage, ymd, _expiry(stage, ymd), out, **ctx)
+
+# ---------------------------
+# 저장소
+# ---------------------------
+def _load_record(conn: sqlite3.Connection, code: str) -> Optional[Dict[str, Any]]:
+    row = conn.execute("SELECT * FROM stock_states WHERE stock_code = ?", (code,)).fetchone()
+    return {k: row[k] for k in _STATE_COLUMNS} if row else None
+
+def _save_record(conn: sqlite3.Connection, rec: Dict[str, Any]) -> None:
+    conn.execute(
+        f"INSERT OR REPLACE INTO stock_states ({', '.join(_STATE_COLUMNS)}) "
+        f"VALUES ({', '.join('?' * len(_STATE_COLUMNS))})",
+        [rec[k] for k in _STATE_COLUMNS],
+    )
+
+def _save_transitions(conn: sqlite3.Connection, out: List[tuple]) -> None:
+    conn.executemany(
+        "INSERT INTO stock_transitions (stock_code, ymd, from_state, to_state, notice_type, category, notice_id) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        out,
+    )
+
+def _notice_rows(conn: sqlite3.Connection, where: str, params: tuple) -> List[Dict[str, Any]]:
+    rows = conn.execute(
+        "SELECT id, notice_type, ymd, title, stock_name, stock_code, categories FROM notices "
+        f"WHERE stock_code != '' AND {where} ORDER BY ymd, id",
+        params,
+    ).fetchall()
+    return [
+        {**{k: r[k] for k in ("id", "notice_type", "ymd", "title", "stock_name", "stock_code")},
+         "categories": json.loads(r["categories"] or "[]")}
+        for r in rows
+    ]
+
+def _cursor(conn: sqlite3.Connection) -> int:
+    row = conn.execute("SELECT value FROM lifecycle_meta WHERE key = 'last_notice_id'").fetchone()
+    if row and not _expiry_rule_current(conn):
+        # 만료일 계산 규칙이 바뀐 뒤 첫 실행 → 저장된 단계를 비우고 처음부터 다시 적용
+        print("🔁 단계 유지 기간 규칙 변경 → 전체 다시 적용")
+        conn.execute("DELETE FROM stock_states")
+        conn.execute("DELETE FROM stock_transitions")
+        conn.execute("DELETE FROM lifecycle_meta")
+        return 0
+    return int(row["value"]) if row else 0
+
+def _expiry_rule_current(conn: sqlite3.Connection) -> bool:
+    row = conn.execute("SELECT value FROM lifecycle_meta WHERE key = 'expiry_rule'").fetchone()
+    return bool(row) and row["value"] == EXPIRY_RULE
+
+def _save_expiry_rule(conn: sqlite3.Connection, rule: str) -> None:
+    conn.execute("INSERT OR REPLACE INTO lifecycle_meta (key, value) VALUES ('expiry_rule', ?)", (rule,))
+
+def _replay(conn: sqlite3.Connection, code: str, today: str) -> int:
+    """종목 하나를 공시 처음부터 다시 적용"""
+    conn.execute("DELETE FROM stock_transitions WHERE stock_code = ?", (code,))
+    conn.execute("DELETE FROM stock_states WHERE stock_code = ?", (code,))
+    notices = _notice_rows(conn, "stock_code = ?", (code,))
+    if not notices:
+        return 0
+    rec, out = _new_record(code, ""), []
+    for n in notices:
+        apply_notice(rec, n, out)
+    lapse(rec, today, out)
+    _save_record(conn, rec)
+    _save_transitions(conn, out)
+    return len(out)
+
+def _settle(conn: sqlite3.Connection, today: str) -> int:
+    """유지 기간이 끝난 종목만 (만료일 인덱스로) 골라 정리"""
+    rows = conn.execute(
+        "SELECT stock_code FROM stock_states WHERE (expires_ymd != '' AND expires_ymd < ?) "
+        "UNION SELECT stock_code FROM stock_states WHERE (designation_expires != '' AND designation_expires < ?)",
+        (today, today),
+    ).fetchall()
+    out: List[tuple] = []
+    for r in rows:
+        rec = _load_record(conn, r["stock_code"])
+        lapse(rec, today, out)
+        _save_record(conn, rec)
+    _save_transitions(conn, out)
+    return len(out)
+
+def advance(path: Path = z_notice_db.DB_FILE, today: Optional[str] = None) -> int:
+    """
+    커서 이후 새 공시만 적용 + 만료 정리. 기록한 전이 건수 반환.
+    이미 더 최근 공시가 적용된 종목에 과거 공시가 들어오면 그 종목만 다시 적용.
+    """
+    today = today or kst_today()
+    _reset_calendar()
+    conn = connect(path)
+    try:
+        with conn:
+            cursor = _cursor(conn)
+            notices = _notice_rows(conn, "id > ?", (cursor,))
+            records: Dict[str, Dict[str, Any]] = {}
+            replay: set = set()
+            out: List[tuple] = []
+            for n in notices:
+                code = n["stock_code"]
+                if code in replay:
+                    continue
+                rec = records.get(code) or _load_record(conn, code)
+                if rec and n["ymd"] < rec["last_ymd"]:
+                    replay.add(code)
+                    records.pop(code, None)
+                    continue
+                rec = rec or _new_record(code, n["stock_name"])
+                apply_notice(rec, n, out)
+                records[code] = rec
+            for rec in records.values():
+                _save_record(conn, rec)
+            _save_transitions(conn, out)
+            changed = len(out)
+            for code in replay:
+                changed += _replay(conn, code, today)
+            changed += _settle(conn, today)
+            max_id = conn.execute("SELECT MAX(id) FROM notices").fetchone()[0] or 0
+            conn.execute(
+                "INSERT OR REPLACE INTO lifecycle_meta (key, value) VALUES ('last_notice_id', ?)",
+                (str(max(cursor, max_id)),),
+            )
+            # 평일 기준으로 계산한 만료일이 섞였으면 다른 규칙으로 기록 → 다음 실행 때 전체 다시 적용
+            _save_expiry_rule(conn, WEEKDAY_RULE if _weekday_fallback else EXPIRY_RULE)
+        return changed
+    finally:
+        conn.close()
+
+def advance_after_run(path: Path = z_notice_db.DB_FILE) -> int:
+    """수집 실행(디스패치/감시 틱/백필)이 끝난 뒤 한 번: advance() + 실패는 경고만"""
+    try:
+        changed = advance(path)
+    except Exception as ex:
+        print(f"⚠️ 종목 단계 갱신 실패(공시는 저장됨): {ex}")
+        return 0
+    if changed:
+        print(f"📌 종목 단계 전이 {changed}건")
+    return changed
+
+def replay_stocks(codes: Iterable[str], path: Path = z_notice_db.DB_FILE, today: Optional[str] = None) -> int:
+    """종목코드가 나중에 채워진 공시(보강) 등 → 해당 종목만 다시 적용"""
+    today = today or kst_today()
+    codes = {str(c).strip() for c in codes if str(c or "").strip()}
+    if not codes:
+        return 0
+    _reset_calendar()
+    conn = connect(path)
+    try:
+        with conn:
+            changed = sum(_replay(conn, code, today) for code in codes)
+            if _weekday_fallback:
+                _save_expiry_rule(conn, WEEKDAY_RULE)
+            return changed
+    finally:
+        conn.close()
+
+def rebuild(path: Path = z_notice_db.DB_FILE, today: Optional[str] = None) -> int:
+    conn = connect(path)
+    try:
+        with conn:
+            conn.execute("DELETE FROM stock_states")
+            conn.execute("DELETE FROM stock_transitions")
+            conn.execute("DELETE FROM lifecycle_meta")
+    finally:
+        conn.close()
+    return advance(path, today)
+
+# ---------------------------
+# 조회
+# ---------------------------
+def _with_days(rec: Dict[str, Any], today: str) -> Dict[str, Any]:
+    rec["days"] = business_days_since(rec["since_ymd"], today) if rec["since_ymd"] else None
+    return rec
+
+def current(stock_code: str, path: Path = z_notice_db.DB_FILE) -> Optional[Dict[str, Any]]:
+    """종목 현재 단계 (since_ymd, days: 머문 거래일 수). 기록 없으면 None"""
+    today = kst_today()
+    conn = connect(path)
+    try:
+        with conn:
+            _settle(conn, today)
+        rec = _load_record(conn, stock_code)
+        return _with_days(rec, today) if rec else None
+    finally:
+        conn.close()
+
+def stocks_in(state: str, path: Path = z_notice_db.DB_FILE) -> List[Dict[str, Any]]:
+    """지금 해당 단계인 종목들 (오래 머문 순)"""
+    today = kst_today()
+    conn = connect(path)
+    try:
+        with conn:
+            _settle(conn, today)
+        rows = conn.execute(
+            "SELECT * FROM stock_states WHERE state = ? ORDER BY since_ymd", (state,)
+        ).fetchall()
+        return [_with_days({k: r[k] for k in _STATE_COLUMNS}, today) for r in rows]
+    finally:
+        conn.close()
+
+def state_counts(path: Path = z_notice_db.DB_FILE) -> Dict[str, int]:
+    conn = connect(path)
+    try:
+        with conn:
+            _settle(conn, kst_today())
+        rows = conn.execute("SELECT state, COUNT(*) AS n FROM stock_states GROUP BY state").fetchall()
+        return {r["state"]: r["n"] for r in rows}
+    finally:
+        conn.close()
+
+def history(stock_code: str, path: Path = z_notice_db.DB_FILE) -> List[Dict[str, Any]]:
+    conn = connect(path)
+    try:
+        rows = conn.execute(
+            "SELECT ymd, from_state, to_state, notice_type, category, notice_id FROM stock_transitions "
+            "WHERE stock_code = ? ORDER BY ymd, id",
+            (stock_code,),
+        ).fetchall()
+        return [dict(r) for r in rows]
+    finally:
+        conn.close()
+
+def _cli() -> None:
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    opts = dict(a[2:].split("=", 1) for a in sys.argv[1:] if a.startswith("--") and "=" in a)
+    if "--rebuild" in sys.argv:
+        print(f"🔁 전체 다시 적용: 전이 {rebuild()}건")
+    else:
+        print(f"➕ 새 공시 적용: 전이 {advance()}건")
+
+    if "code" in opts:
+        rec = current(opts["code"])
+        if not rec:
+            print("기록 없음")
+            return
+        print(f"{rec['stock_name']}({rec['stock_code']}) 현재 {rec['state']} ({rec['since_ymd']}~, {rec['days']}거래일)")
+        for h in history(opts["code"]):
+            print(f"  {h['ymd']} {h['from_state']} → {h['to_state']} ({h['notice_type']} {h['category']})".rstrip())
+        return
+    if args:
+        rows = stocks_in(args[0])
+        for r in rows:
+            print(f"{r['stock_name']}({r['stock_code']}) {r['since_ymd']}~ {r['days']}거래일")
+        print(f"📌 {args[0]}: {len(rows)}종목")
+        return
+    for state, n in sorted(state_counts().items(), key=lambda kv: -_rank(kv[0])):
+        print(f"{state}: {n}종목")
+
+if __name__ == "__main__":
+    _cli()
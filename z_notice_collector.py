@@ -0,0 +1,387 @@
+# z_notice_collector.py
+import json
+import os
+import time
+import hashlib
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Callable, Collection, Dict, Iterable, List, Optional, Tuple
+
+import feedparser
+import requests
+
+from z_kind import parse_market_class, clean_title, fetch_documents, fetch_documents_sync
+from z_notice_matcher import title_filter
+
+# KIND 오늘의 공시 RSS (모든 a_*_notices.py 수집기가 같은 피드를 봄)
+RSS_URL = (
+    "http://kind.krx.co.kr:80/disclosure/rsstodaydistribute.do?"
+    "method=searchRssTodayDistribute&repIsuSrtCd=&mktTpCd=0&"
+    "searchCorpName=&currentPageSize=50"
+)
+
+RSS_PAGE_SIZE = 50          # RSS_URL의 currentPageSize
+RSS_PAGE_PARAM = "pageIndex"
+MAX_FEED_PAGES = 10         # 한 번에 거슬러 올라갈 최대 페이지
+FEED_PAGE_CONCURRENCY = 4   # 동시에 받을 페이지 수
+
+BASE_DIR = Path(__file__).resolve().parent
+FEED_STATE_FILE = BASE_DIR / "a_feed_state.json"  # 감시 모드 상태 (ETag/Last-Modified/digest/처리한 GUID)
+SEEN_LIMIT = 1000  # 보관할 최근 GUID 수 (MAX_FEED_PAGES * RSS_PAGE_SIZE 이상)
+
+# ---------------------------
+# RSS 피드
+# ---------------------------
+def fetch_feed_entries(url: str = RSS_URL) -> List[Any]:
+    """RSS를 한 번 받아 엔트리 리스트로 반환 (디스패처/단독 실행 공용)"""
+    feed = feedparser.parse(url)
+    return list(feed.entries)
+
+# 인코딩 선언 불일치 등 엔트리는 정상으로 읽힌 bozo (실패로 보지 않음)
+_BENIGN_BOZO = (feedparser.CharacterEncodingOverride, feedparser.NonXMLContentType)
+
+def feed_entries_checked(feed: Any, url: str) -> List[Any]:
+    """파싱한 피드의 엔트리. 다운로드/파싱 실패(HTTP 오류, bozo)는 예외 — 빈 페이지(피드 끝)와 구분"""
+    status = feed.get("status", 200)
+    if status >= 400:
+        raise IOError(f"RSS HTTP {status}: {url}")
+    if feed.get("bozo") and not isinstance(feed.get("bozo_exception"), _BENIGN_BOZO):
+        raise IOError(f"RSS 파싱 실패: {feed.get('bozo_exception')}")
+    return list(feed.entries)
+
+def fetch_feed_page(url: str) -> List[Any]:
+    """RSS 한 페이지 (실패는 예외)"""
+    return feed_entries_checked(feedparser.parse(url), url)
+
+def entry_key(e: Any) -> str:
+    """엔트리 고유 키 (GUID 우선, 없으면 link)"""
+    return str(e.get("id") or e.get("link") or "")
+
+def page_url(page: int, url: str = RSS_URL) -> str:
+    return f"{url}&{RSS_PAGE_PARAM}={page}"
+
+def walk_feed_pages(
+    seen: Collection[str],
+    url: str = RSS_URL,
+    first: Optional[List[Any]] = None,
+    max_pages: int = MAX_FEED_PAGES,
+    concurrency: int = FEED_PAGE_CONCURRENCY,
+) -> Tuple[List[Any], int, bool]:
+    """
+    RSS를 1페이지부터 여러 페이지씩 동시에 받아, 이미 처리한 GUID(seen)가
+    나오는 페이지(워터마크)까지 거슬러 올라감. 반환: (엔트리, 사용한 페이지 수, 완료 여부)
+    - first: 이미 받아 둔 1페이지 엔트리 (감시 모드의 조건부 GET 결과)
+    - seen이 비어 있으면(첫 실행) 1페이지만
+    - 정상으로 받은 페이지가 덜 찼거나, 앞 페이지와 같으면(페이지 파라미터 무시) 거기서 멈춤
+    - 페이지 다운로드/파싱이 실패하면 받은 데까지만 반환하고 완료=False
+      → 호출 측은 워터마크를 올리지 않음 (빠진 페이지를 다음에 다시 받도록)
+    """
+    pages: List[List[Any]] = []
+
+    def reached_end(page: List[Any]) -> bool:
+        if not seen or len(page) < RSS_PAGE_SIZE:
+            return True
+        if any(entry_key(e) in seen for e in page):
+            return True
+        if len(pages) >= 2 and [entry_key(e) for e in pages[-2]] == [entry_key(e) for e in page]:
+            pages.pop()  # 같은 페이지가 반복됨
+            return True
+        return False
+
+    done, complete = False, True
+    if first is not None:
+        pages.append(list(first))
+        done = reached_end(pages[0])
+    if not done:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            next_page = len(pages) + 1
+            while not done and next_page <= max_pages:
+                width = concurrency if seen else 1
+                batch = range(next_page, min(next_page + width, max_pages + 1))
+                try:
+                    for page in pool.map(lambda n: fetch_feed_page(page_url(n, url)), batch):
+                        pages.append(page)
+                        if reached_end(page):
+                            done = True
+                            break
+                except Exception as ex:
+                    print(f"⚠️ RSS {len(pages) + 1}페이지 수집 실패 — 워터마크 유지: {ex}")
+                    done, complete = True, False
+                next_page += len(batch)
+        if not done:
+            print(f"⚠️ RSS {max_pages}페이지까지 워터마크 미도달 — 그 이전 공시는 누락됐을 수 있음")
+
+    entries, keys = [], set()
+    for page in pages:
+        for e in page:
+            k = entry_key(e)
+            if k not in keys:
+                keys.add(k)
+                entries.append(e)
+    if len(pages) > 1:
+        print(f"📄 RSS {len(pages)}페이지 수집: {len(entries)}건")
+    return entries, len(pages), complete
+
+class FeedWatcher:
+    """
+    RSS 감시 (조건부 GET + 본문 digest + 처리한 GUID 워터마크).
+    - 304 또는 본문 digest 동일 → 파싱 없이 빈 리스트
+    - 바뀐 경우 → 아직 처리하지 않은 엔트리만 반환
+    처리가 끝나면 mark_seen()으로 워터마크 갱신 (파일에 저장, 재시작해도 유지)
+    — 단 last_complete가 False(중간 페이지 수집 실패)면 갱신하지 않음
+    """
+
+    def __init__(self, url: str = RSS_URL, state_file: Path = FEED_STATE_FILE):
+        self.url = url
+        self.state_file = Path(state_file)
+        self.session = requests.Session()
+        self.etag = ""
+        self.modified = ""
+        self.digest = ""
+        self.seen: List[str] = []
+        self.last_pages = 0  # 직전 poll에서 받은 페이지 수
+        self.last_complete = True  # 직전 poll이 워터마크(또는 피드 끝)까지 다 받았는지
+        self._load()
+        self._seen_set = set(self.seen)
+
+    def _load(self) -> None:
+        if not self.state_file.exists():
+            return
+        try:
+            with self.state_file.open("r", encoding="utf-8") as f:
+                st = json.load(f)
+            self.etag = st.get("etag", "")
+            self.modified = st.get("modified", "")
+            self.digest = st.get("digest", "")
+            self.seen = list(st.get("seen", []))
+        except Exception as ex:
+            print(f"⚠️ 감시 상태 로드 실패(초기화): {ex}")
+
+    def _save(self) -> None:
+        st = {"etag": self.etag, "modified": self.modified, "digest": self.digest, "seen": self.seen}
+        tmp = self.state_file.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(st, f, ensure_ascii=False)
+        os.replace(tmp, self.state_file)
+
+    def poll(self) -> List[Any]:
+        headers = {"User-Agent": "Mozilla/5.0"}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.modified:
+            headers["If-Modified-Since"] = self.modified
+        r = self.session.get(self.url, headers=headers, timeout=10)
+        if r.status_code == 304:
+            return []
+        r.raise_for_status()
+
+        digest = hashlib.sha256(r.content).hexdigest()
+        if digest == self.digest:
+            return []
+
+        # 1페이지가 전부 새 공시면 워터마크까지 다음 페이지들도 받음
+        first = feed_entries_checked(feedparser.parse(r.content), self.url)
+        entries, self.last_pages, self.last_complete = walk_feed_pages(self._seen_set, self.url, first=first)
+        # 다 못 받았으면 조건부 GET 값을 갱신하지 않음 → 다음 poll에서 다시 받음
+        if self.last_complete:
+            self.etag = r.headers.get("ETag", "")
+            self.modified = r.headers.get("Last-Modified", "")
+            self.digest = digest
+        return [e for e in entries if entry_key(e) not in self._seen_set]
+
+    def seen_keys(self) -> Collection[str]:
+        return self._seen_set
+
+    def mark_seen(self, entries: Iterable[Any]) -> None:
+        for e in entries:
+            k = entry_key(e)
+            if k and k not in self._seen_set:
+                self._seen_set.add(k)
+                self.seen.append(k)
+        if len(self.seen) > SEEN_LIMIT:
+            self.seen = self.seen[-SEEN_LIMIT:]
+            self._seen_set = set(self.seen)
+        self._save()
+
+# ---------------------------
+# 제목 필터
+# ---------------------------
+def select_entries(
+    entries: Iterable[Any],
+    keywords: List[str],
+    skip_terms_upper: Iterable[str] = (),
+    skip_terms_ko: Iterable[str] = (),
+) -> List[Any]:
+    """
+    키워드가 제목에 포함된 엔트리만 선택.
+    스킵 단어가 하나라도 포함되면 제외 (영문 약어는 대문자 기준 비교)
+    """
+    flt = title_filter(tuple(keywords), tuple(skip_terms_upper), tuple(skip_terms_ko))
+    return [e for e in entries if flt.accepts(e.title or "")]
+
+def entry_date(e: Any) -> str:
+    """공시 날짜 YYYY-MM-DD (공시 검색 엔트리는 공시일, RSS 엔트리는 오늘)"""
+    return e.get("notice_date") or datetime.now().strftime("%Y-%m-%d")
+
+def unstored_entries(entries: Iterable[Any], index: Any) -> List[Any]:
+    """
+    저장소(z_notice_store.StoredIndex)에 아직 없는 엔트리만.
+    link 또는 (접두사 뗀 제목, 공시 날짜)가 이미 있으면 제외 → 본문 요청 자체를 안 함
+    """
+    return [e for e in entries if not index.contains(e.link, clean_title(e.title), entry_date(e))]
+
+def fetch_targets(entries: Iterable[Any]) -> List[Any]:
+    """본문을 받아야 하는 엔트리 (시장 접두사가 있는 것만)"""
+    return [e for e in entries if parse_market_class(e.title)]
+
+# ---------------------------
+# 공통 수집 루프
+# ---------------------------
+def collect_entries(
+    entries: Iterable[Any],
+    *,
+    keywords: List[str],
+    categorize: Callable[[str, Dict[str, Any]], List[str]],
+    add_notices: Callable[[List[Dict[str, Any]]], int],
+    skip_terms_upper: Iterable[str] = (),
+    skip_terms_ko: Iterable[str] = (),
+    documents: Optional[Dict[str, Any]] = None,
+    need_text: bool = True,
+    stored_index: Optional[Callable[[], Any]] = None,
+) -> int:
+    """
+    이미 받아 둔 RSS 엔트리에서 해당 수집기 공시만 골라
+    본문 추출 → 분류 → 모아서 한 번에 저장. 새로 저장된 건수를 반환.
+    - categorize(title, result): 분류 리스트
+    - documents: link → z_kind.fetch_documents 결과 (디스패처가 미리 받아 둔 것).
+      없으면 여기서 대상 문서만 동시 수집.
+    - need_text=False: 본문 없이 종목명/코드만 (제목 + 종목 마스터, 애매할 때만 뷰어 페이지)
+    - stored_index(): 이미 저장된 공시 인덱스. 주면 저장된 엔트리는 요청 전에 건너뜀
+    """
+    filtered = select_entries(entries, keywords, skip_terms_upper, skip_terms_ko)
+    if stored_index is not None:
+        fresh = unstored_entries(filtered, stored_index())
+        if len(fresh) < len(filtered):
+            print(f"⏭️ 이미 저장됨(요청 생략): {len(filtered) - len(fresh)}건")
+        filtered = fresh
+
+    if documents is None:
+        documents = fetch_documents_sync(
+            ((e.link, e.title) for e in fetch_targets(filtered)), need_text=need_text
+        )
+
+    batch: List[Dict[str, Any]] = []
+    for e in filtered:
+        # 접두사 확인 (없으면 스킵)
+        market_class = parse_market_class(e.title)
+        if not market_class:
+            print(f"⏭️ 접두사 없음(저장 스킵): {e.title}")
+            continue
+
+        print(f"\n▶ {e.title} ({market_class})")
+
+        try:
+            result = documents.get(e.link)
+            if result is None:
+                raise ValueError("본문 수집 결과 없음")
+            if isinstance(result, Exception):
+                raise result
+            stock_name = result["stock_name"]
+            stock_code = result["stock_code"]
+            frame_url = result["frame_url"]
+            doc_no = result.get("doc_no", "")
+            text = result.get("text", "")
+            categories = categorize(e.title, result)
+
+            print("프레임소스:", frame_url)
+            print("종목:", stock_name or "(없음)", stock_code or "(없음)")
+            print("분류:", ", ".join(categories) if categories else "분류 없음")
+
+        except Exception as ex:
+            print("본문 추출 실패:", ex)
+            stock_name, stock_code, frame_url, doc_no, text, categories = "", "", "", "", "", []
+
+        notice_data = {
+            "title": clean_title(e.title),      # 접두사 제거
+            "class": market_class,              # 코스피/코스닥
+            "stock_name": stock_name,
+            "stock_code": stock_code,
+            "link": e.link,
+            "frame_url": frame_url,
+            "doc_no": doc_no,
+            "categories": categories,
+            "date": entry_date(e),
+        }
+        if text:
+            notice_data["text"] = text  # 공시 DB 전문검색 색인용 (JSON에는 안 남김)
+
+        batch.append(notice_data)
+
+    saved = add_notices(batch) if batch else 0
+    if batch:
+        print(f"저장 완료 ✅ (신규 {saved}건 / 대상 {len(batch)}건)")
+    return saved
+
+# ---------------------------
+# 여러 수집기에 한 번에 넘기기 (디스패처 / 검색 / 백필 공용)
+# ---------------------------
+def load_collectors(scripts: Iterable[str]) -> List[Tuple[str, Any]]:
+    """수집기 스크립트 이름(a_*_notices.py) → (이름, 모듈). 로드 실패는 경고 후 제외"""
+    modules = []
+    for s in scripts:
+        try:
+            modules.append((s, importlib.import_module(Path(s).stem)))
+        except Exception as ex:
+            print(f"⚠️ 경고: {s} 로드 실패: {ex} — 계속 진행")
+    return modules
+
+async def dispatch_entries(
+    entries: List[Any], modules: List[Tuple[str, Any]], store_failed_fetch: bool = True, **fetch_kwargs
+) -> Tuple[int, List[Any]]:
+    """
+    받아 둔 엔트리를 수집기들 분류기에 넘김. 반환: (저장 건수 합계, 실패 엔트리)
+    실패 엔트리 = 예외로 끝난 수집기가 고른 엔트리 (호출 측은 이것을 처리 완료로 표시하지 않음).
+    store_failed_fetch=False면 문서 요청이 실패한 엔트리는 빈 값으로 저장하지 않고 실패 엔트리로 반환
+    (백필처럼 나중에 다시 받을 수 있는 경우 — 저장해 버리면 재시도 때 이미 저장됨으로 건너뜀).
+    본문 3단계 요청은 본문이 필요한 수집기(TITLE_ONLY가 아닌 것) 대상만 모아 한 번에 동시 수집.
+    TITLE_ONLY 수집기는 제목 + 종목 마스터로 바로 저장 (KIND 문서 서버를 기다리지 않음).
+    이미 저장된 공시는 요청 대상에서 제외. fetch_kwargs(cpu_pool 등)는 z_kind.fetch_documents로 전달
+    """
+    full_targets, title_targets = [], []
+    for s, mod in modules:
+        targets = fetch_targets(unstored_entries(mod.select(entries), mod.stored_index()))
+        (title_targets if getattr(mod, "TITLE_ONLY", False) else full_targets).extend(targets)
+    # 본문 분류 함수(TEXT_CLASSIFIER)는 본문 추출과 같은 CPU 단계에서 실행
+    classifiers = [mod.TEXT_CLASSIFIER for _, mod in modules if getattr(mod, "TEXT_CLASSIFIER", None)]
+    t0 = time.time()
+    documents = await fetch_documents(
+        ((e.link, e.title) for e in full_targets), classifiers=classifiers, **fetch_kwargs
+    )
+    names = await fetch_documents(((e.link, e.title) for e in title_targets), need_text=False, **fetch_kwargs)
+    print(f"📥 본문 동시 수집: {len(documents)}건 / 제목만: {len(names)}건 ({time.time() - t0:.1f}s)")
+
+    total = 0
+    failed: Dict[str, Any] = {}
+    if not store_failed_fetch:
+        bad = {link for docs in (documents, names) for link, res in docs.items() if isinstance(res, Exception)}
+        for e in entries:
+            if e.link in bad:
+                failed.setdefault(entry_key(e), e)
+        if bad:
+            print(f"⚠️ 문서 요청 실패 {len(bad)}건 — 저장하지 않음")
+            entries = [e for e in entries if e.link not in bad]
+    for s, mod in modules:
+        print(f"▶ 분류: {s}")
+        try:
+            docs = names if getattr(mod, "TITLE_ONLY", False) else documents
+            saved = mod.process_entries(entries, documents=docs)
+        except Exception as ex:
+            print(f"⚠️ 경고: {s} 실패: {ex} — 계속 진행")
+            for e in mod.select(entries):
+                failed.setdefault(entry_key(e), e)
+            continue
+        total += saved
+        print(f"✔ 저장 {saved}건: {s}\n")
+    return total, list(failed.values())
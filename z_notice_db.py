@@ -0,0 +1,479 @@
+# z_notice_db.py
+# 공시 이력 DB (SQLite): 유형/날짜/종목/분류 인덱스 + 본문 전문검색(FTS5 trigram)
+#
+# 사용: python z_notice_db.py search 소수계좌 [--type=투자경고] [--category=단기불건전예고] [--code=005930] [--days=90]
+#       python z_notice_db.py reindex   (본문 없는 공시를 KIND 문서 캐시로 채움)
+import sys
+import json
+import time
+import sqlite3
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from z_dates import kst_today, shift_ymd
+
+BASE_DIR = Path(__file__).resolve().parent
+DB_FILE = BASE_DIR / "a_notices.sqlite3"
+DB_RETENTION_DAYS = 365  # JSON(10일)과 별개로 이력 보관 기간
+
+# 공시 유형 → 기존 JSON (DB 최초 생성 시 이 파일들로 채움)
+NOTICE_SOURCES: Dict[str, str] = {
+    "투자주의": "a_caution_notices.json",
+    "단기과열": "a_overheating_notices.json",
+    "투자경고": "a_waring_notices.json",
+    "투자위험": "a_danger_notices.json",
+    "거래정지": "a_suspend_notices.json",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notices (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    doc_no       TEXT,
+    notice_type  TEXT NOT NULL,
+    ymd          TEXT NOT NULL,
+    date         TEXT NOT NULL,
+    title        TEXT NOT NULL,
+    class        TEXT,
+    stock_name   TEXT,
+    stock_code   TEXT,
+    link         TEXT,
+    frame_url    TEXT,
+    categories   TEXT NOT NULL DEFAULT '[]',
+    UNIQUE (notice_type, doc_no),
+    UNIQUE (notice_type, title, date)
+);
+CREATE INDEX IF NOT EXISTS idx_notices_type_ymd ON notices(notice_type, ymd);
+CREATE INDEX IF NOT EXISTS idx_notices_ymd ON notices(ymd);
+CREATE INDEX IF NOT EXISTS idx_notices_stock_code ON notices(stock_code, ymd);
+CREATE TABLE IF NOT EXISTS notice_categories (
+    notice_id  INTEGER NOT NULL REFERENCES notices(id) ON DELETE CASCADE,
+    category   TEXT NOT NULL,
+    PRIMARY KEY (notice_id, category)
+);
+CREATE INDEX IF NOT EXISTS idx_notice_categories_category ON notice_categories(category);
+CREATE TABLE IF NOT EXISTS json_sync (
+    notice_type  TEXT PRIMARY KEY,
+    json_sig     TEXT NOT NULL
+);
+"""
+
+# 본문 전문검색: rowid = notices.id, 한국어는 띄어쓰기로 안 끊기므로 trigram(부분 문자열) 토크나이저
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS notice_texts USING fts5(body, tokenize = 'trigram');
+CREATE TRIGGER IF NOT EXISTS notices_delete_text AFTER DELETE ON notices BEGIN
+    DELETE FROM notice_texts WHERE rowid = old.id;
+END;
+"""
+_fts_available = True  # SQLite에 FTS5/trigram이 없으면 본문 색인 없이 동작
+
+_COLUMNS = ["doc_no", "title", "class", "stock_name", "stock_code", "link", "frame_url", "date"]
+
+def _ymd(date_str: str) -> str:
+    """'YYYY-MM-DD' 등 → 'YYYYMMDD' (숫자 8자리 앞부분)"""
+    digits = "".join(ch for ch in str(date_str or "") if ch.isdigit())
+    return digits[:8] if len(digits) >= 8 else ""
+
+def connect(path: Path = DB_FILE) -> sqlite3.Connection:
+    """DB 연결 (없으면 스키마 생성 + 기존 JSON으로 최초 적재)"""
+    path = Path(path)
+    is_new = not path.exists()
+    conn = sqlite3.connect(str(path))
+    conn.row_factory = sqlite3.Row
+    _migrate_doc_no_key(conn)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(_SCHEMA)
+    _ensure_fts(conn)
+    if is_new:
+        _seed_from_json(conn, path.parent)
+    return conn
+
+def _migrate_doc_no_key(conn: sqlite3.Connection) -> None:
+    """
+    예전 스키마(doc_no 전체 UNIQUE) → (유형, doc_no) UNIQUE.
+    같은 공시가 두 유형에 걸릴 수 있음 (예: 투자위험 '투자위험종목 지정' ⊂ 거래정지 '(투자위험종목 지정중)').
+    id는 그대로 옮김 (분류/본문 색인/단계 이력이 id를 참조). 예전 스키마에서 빠진 행은
+    동기화 표시를 지워 다음 적재 때 JSON으로 따라잡음
+    """
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'notices'").fetchone()
+    if not row or "UNIQUE (notice_type, doc_no)" in row[0]:
+        return
+    cols = ", ".join(["id", "doc_no", "notice_type", "ymd", "date", "title", "class",
+                      "stock_name", "stock_code", "link", "frame_url", "categories"])
+    conn.execute("PRAGMA foreign_keys = OFF")  # 옛 테이블 DROP 때 notice_categories가 지워지지 않도록
+    new_schema = _SCHEMA.split(";", 1)[0].replace("IF NOT EXISTS notices", "notices_new", 1)
+    conn.executescript(
+        "BEGIN;"
+        f"{new_schema};"
+        f"INSERT INTO notices_new ({cols}) SELECT {cols} FROM notices;"
+        "DROP TABLE notices;"
+        "ALTER TABLE notices_new RENAME TO notices;"
+        "DROP TABLE IF EXISTS json_sync;"
+        "COMMIT;"
+    )
+    print("🔧 공시 DB: doc_no 고유키를 (유형, doc_no)로 변경")
+
+def _ensure_fts(conn: sqlite3.Connection) -> None:
+    global _fts_available
+    if not _fts_available:
+        return
+    try:
+        conn.executescript(_FTS_SCHEMA)
+    except sqlite3.OperationalError as ex:
+        _fts_available = False
+        print(f"⚠️ SQLite FTS5(trigram) 사용 불가 → 본문 색인 없이 저장: {ex}")
+
+def _seed_from_json(conn: sqlite3.Connection, base_dir: Path) -> None:
+    for notice_type, filename in NOTICE_SOURCES.items():
+        p = base_dir / filename
+        if not p.exists() or p.stat().st_size == 0:
+            continue
+        try:
+            with p.open("r", encoding="utf-8") as f:
+                rows = json.load(f)
+        except Exception:
+            continue
+        if isinstance(rows, list):
+            insert_notices(conn, notice_type, rows)
+            mark_synced(conn, notice_type, p)
+
+# ---------------------------
+# JSON 동기화 표시
+# JSON을 먼저 저장하고 DB 적재가 실패할 수 있으므로, 유형별로 "DB가 이 상태의 JSON까지 담고 있음"을
+# JSON 파일 서명(수정시각:크기)으로 기록. 조회 시 서명이 다르면 DB가 뒤처진 것 → 호출 측이 JSON으로 폴백
+# ---------------------------
+def json_signature(json_path) -> str:
+    """JSON 파일 서명 (없으면 빈 문자열)"""
+    try:
+        st = Path(json_path).stat()
+    except FileNotFoundError:
+        return ""
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+def json_path_for(notice_type: str, path: Path = DB_FILE) -> Optional[Path]:
+    filename = NOTICE_SOURCES.get(notice_type)
+    return Path(path).parent / filename if filename else None
+
+def synced_signature(conn: sqlite3.Connection, notice_type: str) -> Optional[str]:
+    row = conn.execute("SELECT json_sig FROM json_sync WHERE notice_type = ?", (notice_type,)).fetchone()
+    return row["json_sig"] if row else None
+
+def mark_synced(conn: sqlite3.Connection, notice_type: str, json_path) -> None:
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO json_sync (notice_type, json_sig) VALUES (?, ?)",
+            (notice_type, json_signature(json_path)),
+        )
+
+def _catch_up(
+    conn: sqlite3.Connection,
+    notice_type: str,
+    json_path,
+    json_rows: Iterable[Dict[str, Any]],
+    json_sig: Optional[str],
+) -> None:
+    """
+    적재 직후 동기화 표시 갱신. 이번 저장 전 JSON 서명(json_sig)이 마지막 표시와 다르면
+    (직전 DB 적재 실패 등) JSON 전체(json_rows)를 다시 넣어 따라잡은 뒤 표시
+    """
+    if json_sig != synced_signature(conn, notice_type):
+        insert_notices(conn, notice_type, json_rows)
+    mark_synced(conn, notice_type, json_path)
+
+def insert_notices(conn: sqlite3.Connection, notice_type: str, notices: Iterable[Dict[str, Any]]) -> int:
+    """
+    docNo / (유형, 제목, 날짜) 중복은 무시. 추가 건수 반환.
+    레코드에 text(공시 본문)가 있으면 전문검색 색인에도 넣음
+    """
+    added = 0
+    with conn:
+        for n in notices:
+            ymd = _ymd(n.get("date"))
+            if not ymd or not n.get("title"):
+                continue
+            cats = n.get("categories") or []
+            if isinstance(cats, str):
+                cats = [cats]
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO notices "
+                "(doc_no, notice_type, ymd, date, title, class, stock_name, stock_code, link, frame_url, categories) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    n.get("doc_no") or None,
+                    notice_type,
+                    ymd,
+                    n.get("date"),
+                    n.get("title"),
+                    n.get("class"),
+                    n.get("stock_name") or "",
+                    str(n.get("stock_code") or "").strip(),
+                    n.get("link") or "",
+                    n.get("frame_url") or "",
+                    json.dumps(cats, ensure_ascii=False),
+                ),
+            )
+            if cur.rowcount:
+                added += 1
+                conn.executemany(
+                    "INSERT OR IGNORE INTO notice_categories (notice_id, category) VALUES (?, ?)",
+                    [(cur.lastrowid, str(c).strip()) for c in cats if str(c).strip()],
+                )
+                if _fts_available and n.get("text"):
+                    conn.execute(
+                        "INSERT INTO notice_texts (rowid, body) VALUES (?, ?)", (cur.lastrowid, n["text"])
+                    )
+    return added
+
+def retain(conn: sqlite3.Connection, days: int = DB_RETENTION_DAYS) -> int:
+    """보관기간 지난 공시 삭제 (ymd 인덱스 사용)"""
+    cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y%m%d")
+    with conn:
+        return conn.execute("DELETE FROM notices WHERE ymd < ?", (cutoff,)).rowcount
+
+def ingest(
+    notice_type: str,
+    notices: Iterable[Dict[str, Any]],
+    path: Path = DB_FILE,
+    json_path=None,
+    json_rows: Iterable[Dict[str, Any]] = (),
+    json_sig: Optional[str] = None,
+) -> int:
+    """
+    수집기 배치 저장용: 적재 + 보관기간 정리를 한 번에.
+    json_path를 주면 JSON 동기화 표시도 갱신 (json_rows: 저장한 JSON 전체, json_sig: 저장 전 서명)
+    """
+    conn = connect(path)
+    try:
+        added = insert_notices(conn, notice_type, notices)
+        if json_path is not None:
+            _catch_up(conn, notice_type, json_path, json_rows, json_sig)
+        retain(conn)
+        return added
+    finally:
+        conn.close()
+
+def enrich(
+    notice_type: str,
+    notices: Iterable[Dict[str, Any]],
+    path: Path = DB_FILE,
+    json_path=None,
+    json_rows: Iterable[Dict[str, Any]] = (),
+    json_sig: Optional[str] = None,
+) -> int:
+    """
+    link 기준으로 나중에 받은 doc_no/frame_url/종목 정보를 빈 칸에만 채움.
+    레코드에 text(공시 본문)가 있으면 아직 색인 안 된 공시의 전문검색 색인에도 넣음 (같은 트랜잭션)
+    json_path / json_rows / json_sig는 ingest와 같음
+    """
+    conn = connect(path)
+    try:
+        updated = 0
+        with conn:
+            for n in notices:
+                if not n.get("link"):
+                    continue
+                # 같은 유형에 이미 그 doc_no가 있으면 doc_no만 비워 둠 (나머지 칸은 채움)
+                cur = conn.execute(
+                    "UPDATE notices SET "
+                    "doc_no = COALESCE(doc_no, (SELECT NULLIF(?1, '') WHERE NOT EXISTS "
+                    "(SELECT 1 FROM notices d WHERE d.notice_type = ?5 AND d.doc_no = ?1))), "
+                    "frame_url = COALESCE(NULLIF(frame_url, ''), ?2), "
+                    "stock_name = COALESCE(NULLIF(stock_name, ''), ?3), "
+                    "stock_code = COALESCE(NULLIF(stock_code, ''), ?4) "
+                    "WHERE notice_type = ?5 AND link = ?6",
+                    (
+                        n.get("doc_no") or "",
+                        n.get("frame_url") or "",
+                        n.get("stock_name") or "",
+                        str(n.get("stock_code") or "").strip(),
+                        notice_type,
+                        n["link"],
+                    ),
+                )
+                updated += cur.rowcount
+                if _fts_available and n.get("text"):
+                    conn.execute(
+                        "INSERT INTO notice_texts (rowid, body) "
+                        "SELECT id, ? FROM notices WHERE notice_type = ? AND link = ? "
+                        "AND id NOT IN (SELECT rowid FROM notice_texts)",
+                        (n["text"], notice_type, n["link"]),
+                    )
+        if json_path is not None:
+            _catch_up(conn, notice_type, json_path, json_rows, json_sig)
+        return updated
+    finally:
+        conn.close()
+
+def _row_to_notice(row: sqlite3.Row) -> Dict[str, Any]:
+    d = {k: row[k] for k in _COLUMNS}
+    d["categories"] = json.loads(row["categories"] or "[]")
+    d["ymd"] = row["ymd"]
+    return d
+
+def query_day(
+    notice_type: str,
+    ymd: str,
+    category: Optional[str] = None,
+    path: Path = DB_FILE,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    해당 유형의 ymd(YYYYMMDD) 공시를 저장 순서대로 반환.
+    category를 주면 해당 분류가 붙은 공시만.
+    DB 파일이 없거나, DB가 유형별 JSON보다 뒤처졌으면(동기화 표시 ≠ JSON 서명) None
+    (호출 측에서 JSON으로 폴백)
+    """
+    if not Path(path).exists():
+        return None
+    conn = connect(path)
+    try:
+        json_path = json_path_for(notice_type, path)
+        if json_path is not None and json_path.exists():
+            if synced_signature(conn, notice_type) != json_signature(json_path):
+                print(f"⚠️ 공시 DB가 {json_path.name}보다 뒤처짐 → JSON으로 조회")
+                return None
+        if category:
+            rows = conn.execute(
+                "SELECT n.* FROM notices n JOIN notice_categories c ON c.notice_id = n.id "
+                "WHERE n.notice_type = ? AND n.ymd = ? AND c.category = ? ORDER BY n.id",
+                (notice_type, ymd, category),
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT * FROM notices WHERE notice_type = ? AND ymd = ? ORDER BY id",
+                (notice_type, ymd),
+            ).fetchall()
+        return [_row_to_notice(r) for r in rows]
+    finally:
+        conn.close()
+
+# ---------------------------
+# 본문 전문검색
+# ---------------------------
+def _snippet(body: str, terms: List[str], width: int = 40) -> str:
+    pos = min((i for i in (body.find(t) for t in terms) if i >= 0), default=0)
+    start = max(0, pos - width)
+    return ("…" if start else "") + " ".join(body[start:pos + width * 2].split()) + "…"
+
+def search_texts(
+    query: str,
+    notice_type: Optional[str] = None,
+    category: Optional[str] = None,
+    stock_code: Optional[str] = None,
+    days: Optional[int] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: int = 100,
+    path: Path = DB_FILE,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    공시 본문 검색. query는 공백으로 나눈 검색어를 모두 포함하는 공시 (AND).
+    - 3글자 이상은 FTS 색인(MATCH), 2글자 이하는 색인 결과/필터 안에서 부분 문자열 비교
+    - notice_type / category / stock_code / 기간(days: 오늘 포함 최근 N일, since~until: YYYYMMDD) 필터
+    최신순, 각 레코드에 snippet(검색어 주변 본문) 포함. DB가 없거나 FTS 사용 불가면 None
+    """
+    terms = query.split()
+    if not terms or not Path(path).exists():
+        return None
+    conn = connect(path)
+    try:
+        if not _fts_available:
+            return None
+        where: List[str] = []
+        params: List[Any] = []
+        long_terms = [t for t in terms if len(t) >= 3]
+        if long_terms:
+            where.append("notice_texts MATCH ?")
+            params.append(" AND ".join('"' + t.replace('"', '""') + '"' for t in long_terms))
+        for t in terms:
+            if len(t) < 3:
+                where.append("instr(t.body, ?) > 0")
+                params.append(t)
+        if notice_type:
+            where.append("n.notice_type = ?")
+            params.append(notice_type)
+        if stock_code:
+            where.append("n.stock_code = ?")
+            params.append(stock_code)
+        if category:
+            where.append("EXISTS (SELECT 1 FROM notice_categories c WHERE c.notice_id = n.id AND c.category = ?)")
+            params.append(category)
+        if days:
+            since = max(since or "", shift_ymd(kst_today(), -(days - 1)))
+        if since:
+            where.append("n.ymd >= ?")
+            params.append(since)
+        if until:
+            where.append("n.ymd <= ?")
+            params.append(until)
+        # 색인 검색어가 있으면 FTS 결과에서 출발 (CROSS JOIN = 조인 순서 고정), 없으면 notices 인덱스에서 출발
+        join = "CROSS JOIN" if long_terms else "JOIN"
+        rows = conn.execute(
+            f"SELECT n.*, t.body AS body FROM notice_texts t {join} notices n ON n.id = t.rowid "
+            f"WHERE {' AND '.join(where)} ORDER BY n.ymd DESC, n.id DESC LIMIT ?",
+            (*params, limit),
+        ).fetchall()
+        out = []
+        for r in rows:
+            d = _row_to_notice(r)
+            d["notice_type"] = r["notice_type"]
+            d["snippet"] = _snippet(r["body"], terms)
+            out.append(d)
+        return out
+    finally:
+        conn.close()
+
+def reindex_from_cache(path: Path = DB_FILE) -> int:
+    """본문 색인이 없는 공시를 KIND 문서 캐시(z_doc_cache, link/docNo 기준)로 채움. 색인 건수 반환"""
+    from z_doc_cache import DocCache
+
+    conn = connect(path)
+    try:
+        if not _fts_available:
+            return 0
+        rows = conn.execute(
+            "SELECT id, doc_no, link FROM notices WHERE id NOT IN (SELECT rowid FROM notice_texts)"
+        ).fetchall()
+        added = 0
+        with DocCache() as cache, conn:
+            for r in rows:
+                hit = (r["link"] and cache.get_by_link(r["link"])) or (r["doc_no"] and cache.get_by_doc_no(r["doc_no"]))
+                if hit and hit.get("text"):
+                    conn.execute("INSERT INTO notice_texts (rowid, body) VALUES (?, ?)", (r["id"], hit["text"]))
+                    added += 1
+        return added
+    finally:
+        conn.close()
+
+def _cli() -> None:
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    opts = dict(a[2:].split("=", 1) for a in sys.argv[1:] if a.startswith("--") and "=" in a)
+    if args[:1] == ["reindex"]:
+        print(f"✅ 본문 색인 {reindex_from_cache()}건 추가")
+        return
+    if args[:1] != ["search"] or len(args) < 2:
+        print("사용법: python z_notice_db.py search 검색어 [--type=] [--category=] [--code=] [--days=] [--since=] [--until=] [--limit=]")
+        print("        python z_notice_db.py reindex")
+        sys.exit(1)
+
+    t0 = time.perf_counter()
+    rows = search_texts(
+        " ".join(args[1:]),
+        notice_type=opts.get("type"),
+        category=opts.get("category"),
+        stock_code=opts.get("code"),
+        days=int(opts["days"]) if "days" in opts else None,
+        since=opts.get("since"),
+        until=opts.get("until"),
+        limit=int(opts.get("limit", 100)),
+    )
+    ms = (time.perf_counter() - t0) * 1000
+    if rows is None:
+        print("⚠️ 공시 DB 없음 또는 FTS5 사용 불가")
+        sys.exit(1)
+    for r in rows:
+        print(f"{r['date']} [{r['notice_type']}] {r['stock_name']}({r['stock_code']}) {r['title']} {r['categories']}")
+        print(f"    {r['snippet']}")
+    print(f"🔎 {len(rows)}건 ({ms:.1f} ms)")
+
+if __name__ == "__main__":
+    _cli()
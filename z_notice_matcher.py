@@ -0,0 +1,115 @@
+# z_notice_matcher.py
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# ---------------------------
+# 다중 문자열 매처 (정규식 1개, 텍스트 1회 스캔)
+# ---------------------------
+class MultiMatcher:
+    """
+    여러 키워드를 하나의 정규식으로 합쳐 텍스트를 한 번만 훑고,
+    포함된 키워드를 (서로 겹치는 것까지) 모두 반환.
+    - 매치 시작 위치 +1부터 다시 search → 부분적으로 겹치는 키워드도 놓치지 않음
+    - 같은 위치에서 시작하는 키워드는 긴 것만 잡히므로,
+      긴 키워드 안에 들어 있는 짧은 키워드를 미리 계산해 함께 돌려줌
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = list(dict.fromkeys(p for p in patterns if p))
+        alts = sorted(self.patterns, key=len, reverse=True)
+        self._re = re.compile("|".join(map(re.escape, alts))) if alts else None
+        self._implied: Dict[str, Set[str]] = {
+            p: {q for q in self.patterns if q in p} for p in self.patterns
+        }
+
+    def find(self, text: str) -> Set[str]:
+        if self._re is None or not text:
+            return set()
+        found: Set[str] = set()
+        pos = 0
+        while True:
+            m = self._re.search(text, pos)
+            if not m:
+                break
+            found.add(m.group())
+            pos = m.start() + 1
+        hits: Set[str] = set()
+        for p in found:
+            hits |= self._implied[p]
+        return hits
+
+@lru_cache(maxsize=None)
+def compile_keywords(keywords: Tuple[str, ...]) -> MultiMatcher:
+    return MultiMatcher(keywords)
+
+def first_hit(text: str, keywords: Iterable[str]) -> Optional[str]:
+    """keywords 순서상 처음으로 text에 포함된 키워드 (if/elif 체인 대체)"""
+    keywords = tuple(keywords)
+    hits = compile_keywords(keywords).find(text)
+    return next((k for k in keywords if k in hits), None)
+
+# ---------------------------
+# 제목 필터 (키워드 + 스킵 단어)
+# ---------------------------
+class TitleFilter:
+    """제목 키워드 + 스킵 단어를 합쳐 한 번에 판정"""
+
+    def __init__(self, keywords: Iterable[str], skip_terms_upper: Iterable[str] = (), skip_terms_ko: Iterable[str] = ()):
+        self.keywords = set(k for k in keywords if k)
+        self.skip_ko = set(t for t in skip_terms_ko if t)
+        self._main = MultiMatcher(list(self.keywords) + list(self.skip_ko))
+        skip_upper = [t for t in skip_terms_upper if t]
+        self._upper = MultiMatcher(skip_upper) if skip_upper else None
+
+    def accepts(self, title: str) -> bool:
+        hits = self._main.find(title)
+        if not hits & self.keywords:
+            return False
+        if hits & self.skip_ko:
+            return False
+        # 영문 약어는 대문자 기준 비교
+        if self._upper is not None and self._upper.find(title.upper()):
+            return False
+        return True
+
+@lru_cache(maxsize=None)
+def title_filter(keywords: Tuple[str, ...], skip_terms_upper: Tuple[str, ...] = (), skip_terms_ko: Tuple[str, ...] = ()) -> TitleFilter:
+    return TitleFilter(keywords, skip_terms_upper, skip_terms_ko)
+
+# ---------------------------
+# 본문 규칙 매처
+# ---------------------------
+class RuleMatcher:
+    """
+    RULES {규칙명: [필요 문구...]} 의 모든 문구를 MultiMatcher 하나로 합쳐 한 번에 검사.
+    specials {토큰: 정규식} 은 문구가 아니라 정규식 조건 (예: __INVEST_FLAG__).
+    특수 조건은 해당 규칙의 나머지 문구가 모두 있을 때만, 텍스트당 최대 1번 검사.
+    반환 규칙 순서는 RULES 순서 그대로.
+    """
+
+    def __init__(self, rules: Dict[str, List[str]], specials: Optional[Dict[str, str]] = None):
+        self.rules = dict(rules)
+        self.specials = {k: re.compile(v) for k, v in (specials or {}).items()}
+        literals = [kw for kws in self.rules.values() for kw in kws if kw not in self.specials]
+        self._literals = MultiMatcher(literals)
+
+    def match(self, text: str) -> List[str]:
+        hits = self._literals.find(text)
+        special_hits: Dict[str, bool] = {}
+        matched = []
+        for rule_name, keywords in self.rules.items():
+            literals = [kw for kw in keywords if kw not in self.specials]
+            if not all(kw in hits for kw in literals):
+                continue
+            ok = True
+            for kw in keywords:
+                if kw in self.specials:
+                    if kw not in special_hits:
+                        special_hits[kw] = bool(self.specials[kw].search(text))
+                    if not special_hits[kw]:
+                        ok = False
+                        break
+            if ok:
+                matched.append(rule_name)
+        return matched
@@ -0,0 +1,215 @@
+# z_notice_store.py
+import json
+import os
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import z_notice_db
+import z_lifecycle
+
+# 저장 레코드 스키마 버전 (2: ymd(YYYYMMDD) 필드를 쓸 때 미리 계산)
+NOTICE_SCHEMA_VERSION = 2
+
+# ---------------------------
+# 레코드 정규화
+# ---------------------------
+def normalize_notice(n: Dict[str, Any]) -> Dict[str, Any]:
+    """date('YYYY-MM-DD') → ymd('YYYYMMDD') + schema_version 기록 (제자리 수정)"""
+    if n.get("schema_version", 0) >= NOTICE_SCHEMA_VERSION and n.get("ymd"):
+        return n
+    digits = "".join(ch for ch in str(n.get("date") or "") if ch.isdigit())
+    if len(digits) >= 8:
+        n["ymd"] = digits[:8]
+        n["schema_version"] = NOTICE_SCHEMA_VERSION
+    return n
+
+def notice_ymd(n: Dict[str, Any]) -> Optional[str]:
+    """정규화된 레코드면 ymd, 아니면 None (→ 읽는 쪽에서 레거시 날짜 추정)"""
+    if n.get("schema_version", 0) >= NOTICE_SCHEMA_VERSION:
+        return n.get("ymd") or None
+    return None
+
+# ---------------------------
+# JSON 저장/불러오기 (a_*_notices.json 공용)
+# ---------------------------
+def load_notices(path) -> List[Dict[str, Any]]:
+    path = Path(path)
+    if path.exists():
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+                return data if isinstance(data, list) else []
+        except Exception:
+            return []
+    return []
+
+class StoredIndex:
+    """이미 저장된 공시 키 (link / (title, date)) — 네트워크 요청 전에 중복을 거르는 용도"""
+
+    def __init__(self, rows: Iterable[Dict[str, Any]] = ()):
+        self.links: Set[str] = set()
+        self.keys: Set[Tuple[str, str]] = set()
+        for n in rows:
+            if n.get("link"):
+                self.links.add(n["link"])
+            if n.get("title") and n.get("date"):
+                self.keys.add((n["title"], n["date"]))
+
+    def contains(self, link: str = "", title: str = "", date: str = "") -> bool:
+        return bool(link and link in self.links) or (title, date) in self.keys
+
+_index_cache: Dict[str, Tuple[Tuple[int, int], StoredIndex]] = {}
+
+def stored_index(path) -> StoredIndex:
+    """파일의 StoredIndex (수정시각/크기가 같으면 다시 읽지 않음)"""
+    path = Path(path)
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return StoredIndex()
+    sig = (st.st_mtime_ns, st.st_size)
+    hit = _index_cache.get(str(path))
+    if hit and hit[0] == sig:
+        return hit[1]
+    index = StoredIndex(load_notices(path))
+    _index_cache[str(path)] = (sig, index)
+    return index
+
+def save_notices(path, all_data: List[Dict[str, Any]]) -> None:
+    """임시파일에 쓴 뒤 rename → 중간에 죽어도 기존 파일은 온전"""
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(prefix=path.name + ".", suffix=".tmp", dir=str(path.parent.resolve()))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(all_data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+def _is_expired(notice: Dict[str, Any], cutoff_date: datetime) -> bool:
+    try:
+        return datetime.strptime(notice["date"], "%Y-%m-%d") < cutoff_date
+    except Exception:
+        return False
+
+def _json_record(n: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in n.items() if k != "text"} if "text" in n else n
+
+def ingest_notices(
+    path,
+    notices: Iterable[Dict[str, Any]],
+    max_days: int = 10,
+    notice_type: Optional[str] = None,
+) -> int:
+    """
+    한 번 읽고 → 보관기간(max_days) 필터 + (title, date) 중복 제거 →
+    이번 실행분을 메모리에서 합친 뒤 → 한 번만 저장.
+    저장하는 레코드는 모두 normalize_notice (ymd + schema_version)로 정규화.
+    notice_type을 주면 SQLite 공시 DB(z_notice_db)에도 같은 배치를 적재
+    (text(공시 본문)는 DB 전문검색 색인에만 넣고 JSON에서는 뺌).
+    보관기간 밖의 과거 공시는 DB에만 넣음.
+    새로 추가된 건수를 반환 (과거 공시는 DB에 새로 들어간 건수).
+    """
+    notices = list(notices)
+    if not notices:
+        return 0
+
+    all_data = load_notices(path)
+    cutoff_date = datetime.now() - timedelta(days=max_days)
+
+    filtered = []
+    seen = set()  # (title, date) 중복 체크
+    for n in all_data:
+        try:
+            n_date = datetime.strptime(n["date"], "%Y-%m-%d")
+            if n_date >= cutoff_date:
+                key = (n["title"], n["date"])
+                if key not in seen:
+                    filtered.append(normalize_notice(n))
+                    seen.add(key)
+        except Exception:
+            # date 파싱 실패 데이터는 그냥 보관
+            filtered.append(n)
+
+    # 과거 공시(검색/백필)가 보관기간 밖이면 JSON엔 안 넣고 DB에만 적재
+    expired = [n for n in notices if _is_expired(n, cutoff_date)]
+    recent = [n for n in notices if not _is_expired(n, cutoff_date)]
+
+    added = 0
+    for notice in recent:
+        key_new = (notice["title"], notice["date"])
+        if key_new not in seen:
+            filtered.append(normalize_notice(_json_record(notice)))
+            seen.add(key_new)
+            added += 1
+
+    json_sig = z_notice_db.json_signature(path)
+    if recent:
+        save_notices(path, filtered)
+
+    if notice_type:
+        # 실패해도 JSON은 저장됨: DB의 동기화 표시가 JSON과 어긋나 읽는 쪽이 JSON으로 폴백하고,
+        # 다음 적재 때 JSON 전체로 따라잡음
+        try:
+            if recent:
+                z_notice_db.ingest(notice_type, recent, json_path=path, json_rows=filtered, json_sig=json_sig)
+            if expired:
+                added += z_notice_db.ingest(notice_type, expired)
+        except Exception as ex:
+            print(f"⚠️ 공시 DB 저장 실패(JSON은 저장됨): {ex}")
+    return added
+
+def enrich_notices(
+    path,
+    documents: Dict[str, Any],
+    notice_type: Optional[str] = None,
+) -> int:
+    """
+    제목만으로 먼저 저장한 공시를 나중에 받은 문서 정보로 보강.
+    documents: link → z_kind.fetch_documents 결과 (실패한 Exception은 무시).
+    빈 칸(doc_no / frame_url / 종목명 / 코드)만 채우고, 보강한 건수를 반환.
+    문서의 text(공시 본문)는 JSON에는 안 넣고 DB 전문검색 색인에만 넣음.
+    """
+    docs = {k: v for k, v in documents.items() if isinstance(v, dict)}
+    if not docs:
+        return 0
+
+    all_data = load_notices(path)
+    updated = []
+    db_rows = []  # DB 보강 대상 (본문 포함)
+    for n in all_data:
+        res = docs.get(n.get("link"))
+        if not res:
+            continue
+        changed = False
+        for key in ("doc_no", "frame_url", "stock_name", "stock_code"):
+            if not n.get(key) and res.get(key):
+                n[key] = res[key]
+                changed = True
+        if changed:
+            updated.append(n)
+        if changed or res.get("text"):
+            db_rows.append({**n, "text": res["text"]} if res.get("text") else n)
+
+    if not db_rows:
+        return 0
+    json_sig = z_notice_db.json_signature(path)
+    if updated:
+        save_notices(path, all_data)
+
+    if notice_type:
+        try:
+            z_notice_db.enrich(notice_type, db_rows, json_path=path, json_rows=all_data, json_sig=json_sig)
+        except Exception as ex:
+            print(f"⚠️ 공시 DB 보강 실패(JSON은 저장됨): {ex}")
+            return len(updated)
+        if updated:
+            try:
+                z_lifecycle.replay_stocks(n.get("stock_code") for n in updated)
+            except Exception as ex:
+                print(f"⚠️ 종목 단계 재적용 실패: {ex}")
+    return len(updated)
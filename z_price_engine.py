@@ -0,0 +1,221 @@
+# z_price_engine.py
+# 일봉 열(column) 배열 엔진 — 대상 종목 전체의 기준가/보조 필드를 한 번에 계산
+# - KIS 행(dict, 최신→과거)을 종목 묶음 단위로 한 번만 정수 배열로 변환
+#   dates int32 / close·high·volume int64, 모양 (종목 수, 깊이), 빈 칸 0
+# - N일 전 종가, 최근 n일 최고 종가(+날짜), CAT_RULES 배수 적용을 종목 축으로 벡터 연산
+# - 결과는 b_waring_price_cal / b_waring_upadte의 행 단위 함수와 완전히 같아야 함 (동점 처리 포함)
+# - numpy가 없으면 AVAILABLE=False → 스크립트는 기존 행 단위 함수로 계산
+#
+# 패리티 검사: python z_price_engine.py [종목수]
+import sys
+import random
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+AVAILABLE = np is not None
+
+def _to_int(v) -> int:
+    try:
+        return int(v)  # 대부분 쉼표 없는 숫자 문자열
+    except (TypeError, ValueError):
+        pass
+    try:
+        return int(str(v).replace(",", "").strip())
+    except Exception:
+        return 0
+
+def ymd_str(d: int) -> str:
+    """배열 날짜(int) → 'YYYYMMDD' (빈 칸이면 '-')"""
+    return str(int(d)) if d else "-"
+
+def _column(rows_list: Sequence[List[Dict[str, Any]]], key: str, depth: int) -> List[int]:
+    """rows_list의 key 열을 (종목 수 × depth) 평탄 리스트로 (모자란 칸 0)"""
+    out: List[int] = []
+    for rows in rows_list:
+        head = rows[:depth]
+        out.extend(_to_int(r.get(key)) for r in head)
+        out.extend([0] * (depth - len(head)))
+    return out
+
+class PriceBatch:
+    """
+    종목 묶음의 일봉 배열 (rows_list[i] = i번째 종목의 KIS 행, 최신→과거).
+    depth: 앞에서부터 몇 행까지 변환할지 (필요한 만큼만 주면 변환 비용이 그만큼 줄어듦).
+    dates/close는 바로, high/volume은 처음 쓸 때 변환.
+    """
+
+    def __init__(self, rows_list: Sequence[List[Dict[str, Any]]], depth: Optional[int] = None):
+        longest = max((len(r) for r in rows_list), default=0)
+        self.depth = max(1, min(depth, longest) if depth is not None else longest)
+        self._rows_list = rows_list
+        n = len(rows_list)
+        self.dates = np.array(_column(rows_list, "stck_bsop_date", self.depth), dtype=np.int32).reshape(n, self.depth)
+        self.close = np.array(_column(rows_list, "stck_clpr", self.depth), dtype=np.int64).reshape(n, self.depth)
+        self.length = np.array([min(len(r), self.depth) for r in rows_list], dtype=np.int64)
+        self._rows = np.arange(n)
+        self._high = None
+        self._volume = None
+
+    @property
+    def high(self) -> "np.ndarray":
+        if self._high is None:
+            self._high = np.array(_column(self._rows_list, "stck_hgpr", self.depth), dtype=np.int64).reshape(len(self), self.depth)
+        return self._high
+
+    @property
+    def volume(self) -> "np.ndarray":
+        if self._volume is None:
+            self._volume = np.array(_column(self._rows_list, "acml_vol", self.depth), dtype=np.int64).reshape(len(self), self.depth)
+        return self._volume
+
+    def __len__(self) -> int:
+        return len(self.length)
+
+    def close_at(self, idx) -> Tuple["np.ndarray", "np.ndarray"]:
+        """종목별 idx번째 행(0=최신)의 (날짜, 종가). 행이 없으면 (0, 0). idx는 정수 또는 종목별 배열"""
+        idx = np.broadcast_to(np.asarray(idx, dtype=np.int64), self.length.shape)
+        ok = (idx >= 0) & (idx < self.length) & (idx < self.close.shape[1])
+        safe = np.where(ok, idx, 0)
+        return (
+            np.where(ok, self.dates[self._rows, safe], 0),
+            np.where(ok, self.close[self._rows, safe], 0),
+        )
+
+    def high_with_date(self, n: int) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        최근 n행 종가 최고와 그 날짜. 행 단위 함수와 같이 0에서 시작해 '>='로 갱신하므로
+        같은 값이면 더 과거 날짜, 음수 종가는 무시, 해당 행이 없으면 (0, 0)
+        """
+        w = max(0, min(n, self.close.shape[1]))
+        if w == 0:
+            zeros = np.zeros(len(self), dtype=np.int64)
+            return zeros, zeros
+        cols = np.arange(w)
+        vals = self.close[:, :w]
+        eligible = (cols[None, :] < np.minimum(self.length, n)[:, None]) & (vals >= 0)
+        best = np.where(eligible, vals, -1).max(axis=1)
+        hit = eligible & (vals == best[:, None])
+        last = (w - 1) - np.argmax(hit[:, ::-1], axis=1)
+        found = eligible.any(axis=1)
+        return np.where(found, best, 0), np.where(found, self.dates[self._rows, last], 0)
+
+def warning_fields_batch(
+    rows_list: Sequence[List[Dict[str, Any]]],
+    labels: Sequence[str],
+    rules: Dict[str, Dict[str, Any]],
+    extra_offsets: Dict[str, List[Tuple[str, int]]],
+    high_days: int = 15,
+    extra_high_days: int = 14,
+) -> List[Dict[str, Any]]:
+    """
+    b_waring_price_cal.warning_fields()의 배열판 (종목별 같은 dict 목록).
+    - 지정가: max(내일 기준 days_ago일 전 종가 × mult, 최근 high_days일 최고 종가), 규칙 없는 분류는 최고 종가만
+    - 보조 필드: extra_offsets[분류]의 (키, 당일 기준 offset) 종가 + high_price(최근 extra_high_days일 최고)
+    """
+    offsets = sorted({off for pairs in extra_offsets.values() for _, off in pairs})
+    depth = max([high_days, extra_high_days] + [off + 1 for off in offsets] + [r["days_ago"] for r in rules.values()])
+    batch = PriceBatch(rows_list, depth=depth)
+    high, high_date = batch.high_with_date(high_days)
+
+    days = np.array([rules[l]["days_ago"] if l in rules else 1 for l in labels], dtype=np.int64)
+    mult = np.array([float(rules[l]["mult"]) if l in rules else 0.0 for l in labels], dtype=np.float64)
+    has_rule = np.array([l in rules and l != "초장기불건전예고" for l in labels], dtype=bool)
+
+    base_date, base_close = batch.close_at(np.maximum(0, days - 1))
+    rule_price = np.where(base_close > 0, (base_close.astype(np.float64) * mult).astype(np.int64), 0)
+    use_rule = has_rule & (rule_price >= high)
+    designated = np.where(use_rule, rule_price, high)
+    picked_date = np.where(use_rule, base_date, high_date)
+    picked_close = np.where(use_rule, base_close, high)
+
+    latest_date, latest_close = batch.close_at(0)
+    high14, _ = batch.high_with_date(extra_high_days)
+    closes = {off: batch.close_at(off)[1] for off in offsets}
+
+    designated, picked_date, picked_close = designated.tolist(), picked_date.tolist(), picked_close.tolist()
+    latest_date, latest_close, high14 = latest_date.tolist(), latest_close.tolist(), high14.tolist()
+    closes = {off: col.tolist() for off, col in closes.items()}
+
+    out = []
+    for i, label in enumerate(labels):
+        extra: Dict[str, Any] = {}
+        if label in extra_offsets:
+            for key, off in extra_offsets[label]:
+                extra[key] = closes[off][i]
+            extra["high_price"] = high14[i]
+        out.append({
+            "designated": designated[i],
+            "base_date": ymd_str(picked_date[i]),
+            "base_close": picked_close[i],
+            "latest_date": ymd_str(latest_date[i]),
+            "latest_close": latest_close[i],
+            "extra": extra,
+        })
+    return out
+
+def offset_closes_batch(
+    rows_list: Sequence[List[Dict[str, Any]]],
+    offsets: Sequence[int],
+    high_days: int = 14,
+) -> List[Tuple[Dict[int, int], int]]:
+    """종목별 ({offset: 당일 기준 offset행 종가}, 최근 high_days행 최고 종가) — b_waring_upadte용"""
+    batch = PriceBatch(rows_list, depth=max([high_days] + [off + 1 for off in offsets]))
+    closes = {off: batch.close_at(off)[1].tolist() for off in offsets}
+    high = batch.high_with_date(high_days)[0].tolist()
+    return [({off: closes[off][i] for off in offsets}, high[i]) for i in range(len(batch))]
+
+# ---------------------------
+# 패리티 검사 (행 단위 함수와 결과 비교)
+# ---------------------------
+def _random_rows(rng: random.Random) -> List[Dict[str, Any]]:
+    n = rng.choice([0, 1, 2, 3, 5, 14, 15, 16, 30, 40])
+    base = rng.choice([500, 9_990, 123_456, 1_000_000])
+    rows = []
+    for j in range(n):
+        close = rng.choice([base, base + rng.randint(-50, 50), base * 2, 0]) if rng.random() < 0.3 else base + rng.randint(-500, 500)
+        text = f"{close:,}" if rng.random() < 0.2 else str(close)
+        if rng.random() < 0.03:
+            text = rng.choice(["", "-", None])
+        rows.append({"stck_bsop_date": str(20260130 - j), "stck_clpr": text,
+                     "stck_hgpr": str(close + 10), "acml_vol": str(rng.randint(0, 10**7))})
+    return rows
+
+def parity_check(n_stocks: int = 2000, seed: int = 7) -> bool:
+    import b_waring_price_cal as w
+    import b_waring_upadte as u
+
+    rng = random.Random(seed)
+    labels_pool = list(w.CAT_RULES) + ["초장기불건전예고"]
+    rows_list = [_random_rows(rng) for _ in range(n_stocks)]
+    labels = [rng.choice(labels_pool) for _ in range(n_stocks)]
+
+    ok = True
+    got = warning_fields_batch(rows_list, labels, w.CAT_RULES, w.EXTRA_OFFSETS)
+    for rows, label, g in zip(rows_list, labels, got):
+        want = w.warning_fields(rows, "20260130", label)
+        if g != want:
+            ok = False
+            print("❌ warning_fields 불일치", label, want, g)
+            break
+
+    offs = [1, 2, 4, 14]
+    for rows, (closes, hi) in zip(rows_list, offset_closes_batch(rows_list, offs)):
+        want = ({off: u.price_at_offset_today(rows, off) for off in offs}, u.high_n_today(rows, 14))
+        if (closes, hi) != want:
+            ok = False
+            print("❌ b_waring_upadte 불일치", want, (closes, hi))
+            break
+    return ok
+
+if __name__ == "__main__":
+    if not AVAILABLE:
+        print("⚠️ numpy 없음 → 배열 엔진 비활성 (행 단위 계산 사용)")
+        sys.exit(1)
+    n = int(sys.argv[1]) if len(sys.argv) >= 2 else 2000
+    passed = parity_check(n)
+    print(f"{'✅' if passed else '❌'} 패리티 {n}종목: {'일치' if passed else '불일치'}")
+    sys.exit(0 if passed else 1)
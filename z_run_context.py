@@ -0,0 +1,85 @@
+# z_run_context.py
+# b_* 가격 스크립트를 한 프로세스에서 이어 돌릴 때 같이 쓰는 실행 컨텍스트
+# - token: KIS 접근 토큰 (처음 쓸 때 한 번만 로드/검증)
+# - session: KIS 일봉 조회용 HTTP 세션 (연결 재사용)
+# - daily_prices: (종목, count, 기준일)별 일봉 메모 → 같은 실행 안에서는 캐시 DB도 다시 안 읽음
+# - load_json / save_json: 앞 단계가 저장한 JSON을 다음 단계가 다시 파싱하지 않도록 메모리에 보관
+# 스레드 여러 개(투자경고 / 단기과열 파이프라인)가 같이 써도 됨
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from z_token_manager import get_access_token
+from z_daily_bars import KIS_FETCH_WORKERS, get_daily_prices_many
+
+class RunContext:
+    def __init__(self, token: Optional[str] = None):
+        self._token = token
+        self._token_lock = threading.Lock()
+        self.session = requests.Session()
+        # 파이프라인 2개 × 조회 워커 수만큼 연결 유지
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=KIS_FETCH_WORKERS * 2))
+        self._prices: Dict[Tuple[str, int, Optional[str]], List[Dict[str, Any]]] = {}
+        self._prices_lock = threading.Lock()
+        self._records: Dict[Path, List[Dict[str, Any]]] = {}
+        self._records_lock = threading.Lock()
+
+    @property
+    def token(self) -> str:
+        with self._token_lock:
+            if self._token is None:
+                self._token = get_access_token()
+            return self._token
+
+    # ---------------------------
+    # 일봉
+    # ---------------------------
+    def daily_prices(
+        self,
+        stock_codes: Iterable[str],
+        count: int = 40,
+        base_ymd: Optional[str] = None,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """종목별 최근 일봉 (z_daily_bars.get_daily_prices_many와 같은 값, 이번 실행에서 받은 건 재사용)"""
+        codes = list(dict.fromkeys(stock_codes))
+        with self._prices_lock:
+            missing = [c for c in codes if (c, count, base_ymd) not in self._prices]
+        if missing:
+            fetched = get_daily_prices_many(self.token, missing, count=count, base_ymd=base_ymd, session=self.session)
+            with self._prices_lock:
+                for code, rows in zip(missing, fetched):
+                    self._prices[(code, count, base_ymd)] = rows
+        with self._prices_lock:
+            return {c: self._prices[(c, count, base_ymd)] for c in codes}
+
+    # ---------------------------
+    # 결과 JSON
+    # ---------------------------
+    def load_json(self, path: Path) -> List[Dict[str, Any]]:
+        """JSON 리스트 로드 (없거나 비었거나 깨졌으면 []). 이번 실행에서 저장/로드한 파일은 메모리 값"""
+        with self._records_lock:
+            if path in self._records:
+                return self._records[path]
+        rows: List[Dict[str, Any]] = []
+        if path.exists() and path.stat().st_size > 0:
+            try:
+                with path.open("r", encoding="utf-8") as f:
+                    data = json.load(f)
+                rows = data if isinstance(data, list) else []
+            except Exception:
+                rows = []
+        with self._records_lock:
+            return self._records.setdefault(path, rows)
+
+    def save_json(self, path: Path, rows: List[Dict[str, Any]]) -> None:
+        with path.open("w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+        with self._records_lock:
+            self._records[path] = rows
+
+    def close(self) -> None:
+        self.session.close()
@@ -0,0 +1,273 @@
+# z_stock_master.py
+# KIS 종목 마스터(kospi_code.mst / kosdaq_code.mst) 인덱스
+# - .mst(cp949 고정폭)를 한 번만 파싱해서 바이너리 캐시(stock_master.idx)로 저장
+# - 이후에는 mmap으로 바로 열어서 이진탐색 (재파싱 없음)
+# - .mst 크기/수정시각이 바뀌면 자동 재생성
+#
+# 사용: python z_stock_master.py 005930 / python z_stock_master.py 삼성전자
+import os
+import sys
+import mmap
+import threading
+import struct
+import unicodedata
+from bisect import bisect_left
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+BASE_DIR = Path(__file__).resolve().parent
+MST_FILES = [
+    # (파일, 시장, 뒤쪽 고정폭 길이 — 줄바꿈 제외)
+    (BASE_DIR / "kospi_code.mst", "코스피", 227),
+    (BASE_DIR / "kosdaq_code.mst", "코스닥", 221),
+]
+INDEX_FILE = BASE_DIR / "stock_master.idx"
+
+_MAGIC = b"ZSMI"
+_VERSION = 1
+_HEADER = struct.Struct("<4sII" + "QQ" * len(MST_FILES) + "II")  # magic, ver, n, (size, mtime_ns)*, name_len, norm_len
+_CODE_W = 9
+_MARKETS = [m for _, m, _ in MST_FILES]
+
+# 그룹코드 (마스터 파일 기준)
+SECURITY_GROUPS = {
+    "ST": "주권", "EF": "ETF", "EN": "ETN", "BC": "수익증권", "RT": "리츠",
+    "SW": "워런트", "SR": "신주인수권", "IF": "인프라펀드", "MF": "뮤추얼펀드",
+    "DR": "DR", "FS": "외국주권",
+}
+
+# ---------------------------
+# 이름 정규화
+# ---------------------------
+def normalize_name(name: str) -> str:
+    """전각/㈜/공백/대소문자 차이를 무시한 비교용 이름"""
+    s = unicodedata.normalize("NFKC", name or "").upper()
+    for w in ("(주)", "주식회사"):
+        s = s.replace(w, "")
+    return "".join(s.split())
+
+# ---------------------------
+# .mst 파싱 → 인덱스 파일 생성
+# ---------------------------
+def _signature() -> Tuple[int, ...]:
+    sig: List[int] = []
+    for path, _, _ in MST_FILES:
+        st = path.stat()
+        sig.extend([st.st_size, st.st_mtime_ns])
+    return tuple(sig)
+
+def parse_mst() -> List[Tuple[str, str, int, str]]:
+    """[(단축코드, 종목명, 시장번호, 그룹코드)]"""
+    rows = []
+    for market_no, (path, _, tail_w) in enumerate(MST_FILES):
+        with path.open("rb") as f:
+            for raw in f:
+                line = raw.rstrip(b"\r\n").decode("cp949", "replace")
+                if len(line) <= tail_w + 21:
+                    continue
+                head, tail = line[:-tail_w], line[-tail_w:]
+                code = head[0:9].rstrip()
+                name = head[21:].strip()
+                if code and name:
+                    rows.append((code, name, market_no, tail[0:2]))
+    rows.sort(key=lambda r: r[0])
+    return rows
+
+def _blob(strings: List[str]) -> Tuple[bytes, List[int]]:
+    offs = [0]
+    parts = []
+    for s in strings:
+        b = s.encode("utf-8")
+        parts.append(b)
+        offs.append(offs[-1] + len(b))
+    return b"".join(parts), offs
+
+def build_index(path: Path = INDEX_FILE) -> None:
+    rows = parse_mst()
+    n = len(rows)
+    names = [r[1] for r in rows]
+    norms = [normalize_name(r[1]) for r in rows]
+    name_blob, name_offs = _blob(names)
+    norm_blob, norm_offs = _blob(norms)
+    by_name = sorted(range(n), key=lambda i: names[i].encode("utf-8"))
+    by_norm = sorted(range(n), key=lambda i: norms[i].encode("utf-8"))
+
+    header = _HEADER.pack(_MAGIC, _VERSION, n, *_signature(), len(name_blob), len(norm_blob))
+    body = b"".join([
+        b"".join(r[0].encode("ascii", "replace").ljust(_CODE_W, b" ")[:_CODE_W] for r in rows),
+        bytes(r[2] for r in rows),
+        b"".join(r[3].encode("ascii", "replace").ljust(2, b" ")[:2] for r in rows),
+        struct.pack(f"<{n + 1}I", *name_offs),
+        struct.pack(f"<{n + 1}I", *norm_offs),
+        struct.pack(f"<{n}I", *by_name),
+        struct.pack(f"<{n}I", *by_norm),
+        name_blob,
+        norm_blob,
+    ])
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("wb") as f:
+        f.write(header)
+        f.write(body)
+    os.replace(tmp, path)
+
+# ---------------------------
+# 인덱스 조회 (mmap)
+# ---------------------------
+class _U32:
+    """mmap 안의 리틀엔디언 uint32 배열"""
+
+    def __init__(self, mm, offset: int, count: int):
+        self.mm, self.offset, self.count = mm, offset, count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i: int) -> int:
+        return struct.unpack_from("<I", self.mm, self.offset + 4 * i)[0]
+
+class _KeyView:
+    """정렬 순열(perm)을 통해 본 문자열 키 시퀀스 (bisect용)"""
+
+    def __init__(self, master: "StockMaster", perm: _U32, norm: bool):
+        self.master, self.perm, self.norm = master, perm, norm
+
+    def __len__(self):
+        return len(self.perm)
+
+    def __getitem__(self, i: int) -> bytes:
+        return self.master._str_bytes(self.perm[i], self.norm)
+
+class StockMaster:
+    def __init__(self, path: Path = INDEX_FILE):
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, ver, n, *rest = _HEADER.unpack_from(self.mm, 0)
+            if magic != _MAGIC or ver != _VERSION:
+                raise ValueError("stock_master.idx 형식이 다름")
+        except Exception:
+            self.mm.close()
+            raise
+        self.n = n
+        self.signature = tuple(rest[:-2])
+        name_len, norm_len = rest[-2:]
+
+        pos = _HEADER.size
+        self._codes = pos; pos += _CODE_W * n
+        self._market = pos; pos += n
+        self._group = pos; pos += 2 * n
+        self._name_offs = _U32(self.mm, pos, n + 1); pos += 4 * (n + 1)
+        self._norm_offs = _U32(self.mm, pos, n + 1); pos += 4 * (n + 1)
+        self._by_name = _U32(self.mm, pos, n); pos += 4 * n
+        self._by_norm = _U32(self.mm, pos, n); pos += 4 * n
+        self._name_blob = pos; pos += name_len
+        self._norm_blob = pos
+
+    def close(self) -> None:
+        """매핑 해제 (Windows에서는 매핑된 파일을 os.replace로 덮어쓸 수 없음)"""
+        self.mm.close()
+
+    # --- 레코드 접근 ---
+    def _code(self, i: int) -> str:
+        a = self._codes + _CODE_W * i
+        return self.mm[a:a + _CODE_W].decode("ascii").rstrip()
+
+    def _str_bytes(self, i: int, norm: bool = False) -> bytes:
+        offs, base = (self._norm_offs, self._norm_blob) if norm else (self._name_offs, self._name_blob)
+        return self.mm[base + offs[i]:base + offs[i + 1]]
+
+    def _name(self, i: int) -> str:
+        return self._str_bytes(i).decode("utf-8")
+
+    def _market_name(self, i: int) -> str:
+        return _MARKETS[self.mm[self._market + i]]
+
+    def _group_code(self, i: int) -> str:
+        a = self._group + 2 * i
+        return self.mm[a:a + 2].decode("ascii").strip()
+
+    def _find_code(self, code: str) -> int:
+        code = (code or "").strip()
+        lo, hi = 0, self.n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._code(mid) < code:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < self.n and self._code(lo) == code else -1
+
+    # --- 공개 API ---
+    def name_of(self, code: str) -> Optional[str]:
+        i = self._find_code(code)
+        return self._name(i) if i >= 0 else None
+
+    def market_of(self, code: str) -> Optional[str]:
+        """'코스피' / '코스닥' (a_*_notices의 class 값과 동일)"""
+        i = self._find_code(code)
+        return self._market_name(i) if i >= 0 else None
+
+    def group_of(self, code: str) -> Optional[str]:
+        """그룹코드 (ST=주권, EF=ETF, ... SECURITY_GROUPS 참고)"""
+        i = self._find_code(code)
+        return self._group_code(i) if i >= 0 else None
+
+    def _codes_for(self, key: str, norm: bool, market: Optional[str]) -> List[str]:
+        perm = self._by_norm if norm else self._by_name
+        view = _KeyView(self, perm, norm)
+        kb = key.encode("utf-8")
+        j = bisect_left(view, kb)
+        out = []
+        while j < self.n and view[j] == kb:
+            i = perm[j]
+            if market is None or self._market_name(i) == market:
+                out.append(self._code(i))
+            j += 1
+        return out
+
+    def codes_for_name(self, name: str, market: Optional[str] = None) -> List[str]:
+        """종목명 완전일치 → 코드 목록 (market: '코스피'/'코스닥'으로 제한)"""
+        return self._codes_for((name or "").strip(), False, market)
+
+    def codes_for_normalized(self, name: str, market: Optional[str] = None) -> List[str]:
+        """정규화 이름 일치 (공백/㈜/전각/대소문자 무시)"""
+        return self._codes_for(normalize_name(name), True, market)
+
+_master: Optional[StockMaster] = None
+_master_guard = threading.Lock()
+
+def load_master() -> StockMaster:
+    """
+    인덱스를 열어 반환 (없거나 .mst가 바뀌었으면 재생성).
+    호출마다 .mst 서명(stat 2회)만 비교 → 감시 모드처럼 오래 도는 프로세스도 새 .mst를 반영
+    """
+    global _master
+    sig = _signature()
+    with _master_guard:
+        if _master is not None:
+            if _master.signature == sig:
+                return _master
+            _master.close()  # 재생성 전에 매핑 해제
+            _master = None
+        m = None
+        if INDEX_FILE.exists():
+            try:
+                m = StockMaster(INDEX_FILE)
+                if m.signature != sig:
+                    m.close()
+                    m = None
+            except Exception:
+                m = None
+        if m is None:
+            build_index(INDEX_FILE)
+            m = StockMaster(INDEX_FILE)
+        _master = m
+        return m
+
+if __name__ == "__main__":
+    master = load_master()
+    for q in sys.argv[1:]:
+        if q.isdigit() or master.name_of(q):
+            print(q, master.name_of(q), master.market_of(q), master.group_of(q))
+        else:
+            print(q, master.codes_for_name(q) or master.codes_for_normalized(q))
@@ -0,0 +1,301 @@
+# z_trading_calendar.py
+# KRX 영업일 달력 — KIS 국내휴장일조회(chk-holiday)를 월 단위로 한 번 받아 로컬 SQLite에 보관
+# - 메모리에는 영업일 정렬 배열 + (날짜 → 위치) 사전 → 영업일 여부/이전·다음 영업일/N영업일 전이 조회 한 번
+# - 지난 달은 다시 안 받음, 이번 달 이후는 MONTH_TTL_DAYS마다 다시 받음 (임시 휴장일 반영)
+# - 영업일 판단은 기존 z_holiday_checker와 같이 bzdy_yn 기준
+#
+# 사용: python z_trading_calendar.py [YYYYMMDD] [N]
+import sys
+import json
+import bisect
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from z_config import APP_KEY, APP_SECRET
+from z_dates import kst_today, shift_ymd, to_yyyymmdd
+
+BASE_DIR = Path(__file__).resolve().parent
+CACHE_FILE = BASE_DIR / "kis_trading_calendar.sqlite3"
+
+KIS_HOLIDAY_URL = "https://openapi.koreainvestment.com:9443/uapi/domestic-stock/v1/quotations/chk-holiday"
+KIS_HOLIDAY_TR_ID = "CTCA0903R"
+
+MONTH_TTL_DAYS = 7          # 이번 달/미래 달 재조회 주기
+MAX_CALLS_PER_MONTH = 6     # 한 번 응답이 달 끝까지 안 오면 이어서 조회하는 최대 횟수
+LOOKBACK_SLACK_DAYS = 20    # N영업일 전 계산 시 한 번에 확보하는 여유 달력일
+MAX_SCAN_MONTHS = 24        # 영업일을 찾아 앞뒤로 넘겨보는 최대 개월 수
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS days (
+    ymd         TEXT PRIMARY KEY,
+    business    INTEGER NOT NULL,
+    row         TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS months (
+    ym          TEXT PRIMARY KEY,
+    loaded_at   REAL NOT NULL
+);
+"""
+
+def connect(path: Path = CACHE_FILE) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(path), timeout=30)
+    conn.executescript(_SCHEMA)
+    return conn
+
+# ---------------------------
+# KIS 조회
+# ---------------------------
+def _month_end(ym: str) -> str:
+    y, m = int(ym[:4]), int(ym[4:6])
+    nxt = f"{y + 1}0101" if m == 12 else f"{y}{m + 1:02d}01"
+    return shift_ymd(nxt, -1)
+
+def _prev_ym(ym: str) -> str:
+    return shift_ymd(ym + "01", -1)[:6]
+
+def _next_ym(ym: str) -> str:
+    return shift_ymd(_month_end(ym), 1)[:6]
+
+def fetch_holiday_rows(token: str, base_date: str) -> List[Dict[str, Any]]:
+    """chk-holiday 1회 조회 (base_date부터 이후 며칠치). 실패 시 예외"""
+    headers = {
+        "Content-Type": "application/json; charset=utf-8",
+        "Authorization": f"Bearer {token}",
+        "appkey": APP_KEY,
+        "appsecret": APP_SECRET,
+        "tr_id": KIS_HOLIDAY_TR_ID,
+        "custtype": "P",
+    }
+    params = {"BASS_DT": base_date, "CTX_AREA_NK": "", "CTX_AREA_FK": ""}
+    res = requests.get(KIS_HOLIDAY_URL, headers=headers, params=params, timeout=10)
+    res.raise_for_status()
+    output = res.json().get("output", [])
+    if isinstance(output, dict):
+        output = [output]
+    return [r for r in output if isinstance(r, dict) and r.get("bass_dt")]
+
+def fetch_month(token: str, ym: str) -> Dict[str, Dict[str, Any]]:
+    """ym(YYYYMM) 한 달 전체 {YYYYMMDD: 행}. 빠진 날이 있으면 ValueError"""
+    start, end = ym + "01", _month_end(ym)
+    got: Dict[str, Dict[str, Any]] = {}
+    bass = start
+    for _ in range(MAX_CALLS_PER_MONTH):
+        rows = fetch_holiday_rows(token, bass)
+        for r in rows:
+            d = str(r["bass_dt"])
+            if start <= d <= end:
+                got[d] = r
+        last = max((str(r["bass_dt"]) for r in rows), default="")
+        if not last or last >= end or last < bass:
+            break
+        bass = shift_ymd(last, 1)
+    days = int(end[6:8])
+    if len(got) < days:
+        raise ValueError(f"휴장일 응답 부족: {ym} ({len(got)}/{days}일)")
+    return got
+
+# ---------------------------
+# 달력
+# ---------------------------
+class TradingCalendar:
+    """영업일 달력 (스레드 공용). 필요한 달만 로컬 캐시 → 없으면 KIS에서 받아 채움"""
+
+    def __init__(self, path: Path = CACHE_FILE):
+        self.path = path
+        self._lock = threading.RLock()
+        self._months: Dict[str, float] = {}     # YYYYMM → loaded_at
+        self._business: Dict[str, bool] = {}    # YYYYMMDD → 영업일 여부
+        self._bdays: List[str] = []             # 영업일 정렬 배열
+        self._index: Dict[str, int] = {}        # 영업일 → _bdays 위치
+        self._token: Optional[str] = None
+        self._load_local()
+
+    def _load_local(self) -> None:
+        try:
+            conn = connect(self.path)
+            try:
+                self._months = dict(conn.execute("SELECT ym, loaded_at FROM months").fetchall())
+                self._business = {d: bool(b) for d, b in conn.execute("SELECT ymd, business FROM days")}
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"⚠️ 영업일 캐시 로드 실패(새로 조회): {e}")
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        self._bdays = sorted(d for d, b in self._business.items() if b)
+        self._index = {d: i for i, d in enumerate(self._bdays)}
+
+    def use_token(self, token: Optional[str]) -> None:
+        """이미 받은 토큰이 있으면 달 로드에 재사용 (없으면 처음 필요할 때 get_access_token)"""
+        if token:
+            self._token = token
+
+    def _get_token(self) -> str:
+        if self._token is None:
+            from z_token_manager import get_access_token
+            self._token = get_access_token()
+        return self._token
+
+    def _stale(self, ym: str) -> bool:
+        loaded_at = self._months.get(ym)
+        if loaded_at is None:
+            return True
+        if ym < kst_today()[:6]:
+            return False
+        return time.time() - loaded_at > MONTH_TTL_DAYS * 86400
+
+    def ensure_month(self, ym: str) -> None:
+        with self._lock:
+            if not self._stale(ym):
+                return
+            got = fetch_month(self._get_token(), ym)
+            now = time.time()
+            conn = connect(self.path)
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO days VALUES (?, ?, ?)",
+                        [(d, int(r.get("bzdy_yn") == "Y"), json.dumps(r, ensure_ascii=False)) for d, r in got.items()],
+                    )
+                    conn.execute("INSERT OR REPLACE INTO months VALUES (?, ?)", (ym, now))
+            finally:
+                conn.close()
+            self._months[ym] = now
+            for d, r in got.items():
+                self._business[d] = r.get("bzdy_yn") == "Y"
+            self._rebuild()
+            print(f"📅 영업일 달력 로드: {ym}")
+
+    def ensure_range(self, from_ymd: str, to_ymd: str) -> None:
+        ym, last = from_ymd[:6], to_ymd[:6]
+        while ym <= last:
+            self.ensure_month(ym)
+            ym = _next_ym(ym)
+
+    # ---------------------------
+    # 조회
+    # ---------------------------
+    def is_business_day(self, ymd: str) -> bool:
+        ymd = to_yyyymmdd(ymd)
+        if self._stale(ymd[:6]):
+            self.ensure_month(ymd[:6])
+        return self._business.get(ymd, False)
+
+    def prev_business_day(self, ymd: str, inclusive: bool = True) -> str:
+        """ymd 이전(inclusive면 같거나 이전)의 가장 가까운 영업일"""
+        ymd = to_yyyymmdd(ymd)
+        ym = ymd[:6]
+        for _ in range(MAX_SCAN_MONTHS):
+            self.ensure_month(ym)
+            with self._lock:
+                pos = (bisect.bisect_right if inclusive else bisect.bisect_left)(self._bdays, ymd)
+                if pos > 0 and self._bdays[pos - 1] >= ym + "01":
+                    return self._bdays[pos - 1]
+            ym = _prev_ym(ym)
+        raise ValueError(f"{MAX_SCAN_MONTHS}개월 안에 영업일 없음: {ymd}")
+
+    def next_business_day(self, ymd: str, inclusive: bool = False) -> str:
+        """ymd 이후(inclusive면 같거나 이후)의 가장 가까운 영업일"""
+        ymd = to_yyyymmdd(ymd)
+        ym = ymd[:6]
+        for _ in range(MAX_SCAN_MONTHS):
+            self.ensure_month(ym)
+            with self._lock:
+                pos = (bisect.bisect_left if inclusive else bisect.bisect_right)(self._bdays, ymd)
+                if pos < len(self._bdays) and self._bdays[pos] <= _month_end(ym):
+                    return self._bdays[pos]
+            ym = _next_ym(ym)
+        raise ValueError(f"{MAX_SCAN_MONTHS}개월 안에 영업일 없음: {ymd}")
+
+    def business_days_back(self, ymd: str, n: int) -> str:
+        """ymd와 같거나 이전인 가장 가까운 영업일에서 n영업일 전 (n=0이면 그 영업일)"""
+        anchor = self.prev_business_day(ymd)
+        start = shift_ymd(anchor, -(n * 7 // 5 + LOOKBACK_SLACK_DAYS))
+        for _ in range(MAX_SCAN_MONTHS):
+            self.ensure_range(start, anchor)
+            with self._lock:
+                pos = self._index[anchor] - n
+                if pos >= 0 and self._bdays[pos] >= start[:6] + "01":
+                    return self._bdays[pos]
+            start = _prev_ym(start[:6]) + "01"
+        raise ValueError(f"영업일 달력 범위 부족: {anchor} - {n}영업일")
+
+    def business_days_ahead(self, ymd: str, n: int) -> str:
+        """ymd 다음부터 세어 n번째 영업일 (n >= 1, ymd 자신은 세지 않음)"""
+        first = self.next_business_day(ymd)
+        end = shift_ymd(first, (n - 1) * 7 // 5 + LOOKBACK_SLACK_DAYS)
+        for _ in range(MAX_SCAN_MONTHS):
+            self.ensure_range(first, end)
+            with self._lock:
+                pos = self._index[first] + n - 1
+                if pos < len(self._bdays) and self._bdays[pos] <= _month_end(end[:6]):
+                    return self._bdays[pos]
+            end = shift_ymd(_month_end(end[:6]), 1)
+        raise ValueError(f"영업일 달력 범위 부족: {ymd} + {n}영업일")
+
+    def count_business_days(self, from_ymd: str, to_ymd: str) -> int:
+        """from_ymd~to_ymd(양끝 포함) 영업일 수"""
+        from_ymd, to_ymd = to_yyyymmdd(from_ymd), to_yyyymmdd(to_ymd)
+        if from_ymd > to_ymd:
+            return 0
+        self.ensure_range(from_ymd, to_ymd)
+        with self._lock:
+            return bisect.bisect_right(self._bdays, to_ymd) - bisect.bisect_left(self._bdays, from_ymd)
+
+    def business_day_cutoff(self, base_ymd: str, n_days: int = 10) -> Tuple[str, str]:
+        """최근 n_days 영업일 범위 (cutoff, anchor) — anchor는 base_ymd와 같거나 이전의 영업일"""
+        anchor = self.prev_business_day(base_ymd)
+        return self.business_days_back(anchor, n_days - 1), anchor
+
+_calendar: Optional[TradingCalendar] = None
+_calendar_guard = threading.Lock()
+
+def calendar() -> TradingCalendar:
+    """프로세스 공용 달력 (처음 호출 때 로컬 캐시 로드)"""
+    global _calendar
+    with _calendar_guard:
+        if _calendar is None:
+            _calendar = TradingCalendar()
+        return _calendar
+
+def is_business_day(ymd: str) -> bool:
+    return calendar().is_business_day(ymd)
+
+def prev_business_day(ymd: str, inclusive: bool = True) -> str:
+    return calendar().prev_business_day(ymd, inclusive)
+
+def next_business_day(ymd: str, inclusive: bool = False) -> str:
+    return calendar().next_business_day(ymd, inclusive)
+
+def business_days_back(ymd: str, n: int) -> str:
+    return calendar().business_days_back(ymd, n)
+
+def business_day_cutoff(base_ymd: str, n_days: int = 10) -> Tuple[str, str]:
+    return calendar().business_day_cutoff(base_ymd, n_days)
+
+def business_days_ahead(ymd: str, n: int) -> str:
+    return calendar().business_days_ahead(ymd, n)
+
+def count_business_days(from_ymd: str, to_ymd: str) -> int:
+    return calendar().count_business_days(from_ymd, to_ymd)
+
+def _cli() -> None:
+    ymd = to_yyyymmdd(sys.argv[1]) if len(sys.argv) >= 2 else kst_today()
+    n = int(sys.argv[2]) if len(sys.argv) >= 3 else 10
+    cal = calendar()
+    t0 = time.perf_counter()
+    print(f"{ymd} ({'영업일' if cal.is_business_day(ymd) else '휴장일'})")
+    print(f"  이전 영업일: {cal.prev_business_day(ymd, inclusive=False)}")
+    print(f"  다음 영업일: {cal.next_business_day(ymd)}")
+    cutoff, anchor = cal.business_day_cutoff(ymd, n)
+    print(f"  최근 {n}영업일: {cutoff} ~ {anchor}")
+    print(f"  ({(time.perf_counter() - t0) * 1000:.1f}ms, 캐시 {len(cal._months)}개월)")
+
+if __name__ == "__main__":
+    _cli()